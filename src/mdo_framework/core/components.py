@@ -4,7 +4,9 @@ License, v. 2.0. If a copy of the MPL was not distributed with this
 file, You can obtain one at http://mozilla.org/MPL/2.0/.
 """
 
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from typing import Any
 
 import numpy as np
 from gemseo.core.discipline import Discipline
@@ -20,6 +22,9 @@ class ToolComponent(Discipline):
         inputs: list[str],
         outputs: list[str],
         derivatives: bool = False,
+        cache_size: int = 0,
+        vectorized: bool = False,
+        jacobian: Callable | None = None,
     ):
         """Initializes the generic GEMSEO tool component.
 
@@ -28,22 +33,64 @@ class ToolComponent(Discipline):
             func: The Python callable executing the tool logic.
             inputs: List of input variable names.
             outputs: List of output variable names.
-            derivatives: Whether the function provides analytical derivatives (default False).
+            derivatives: Whether the function provides analytical derivatives
+                (default False). Implied by ``jacobian``; without it, the
+                function must carry one registered with ``with_jacobian``.
+            cache_size: The number of distinct input slices whose outputs are
+                memoized, least recently used first out (default 0, disabled).
+                Only enable it for deterministic functions.
+            vectorized: Whether the function takes and returns NumPy arrays
+                whose first axis is the design point (default False), so that
+                ``compute_batch`` evaluates many points in a single call.
+            jacobian: A callable taking the same arguments as ``func`` and
+                returning the partial derivatives of the outputs, as a mapping
+                ``{output_name: {input_name: value}}``. Single-output tools may
+                return ``{input_name: value}``. Missing entries are zero.
+                Defaults to the Jacobian registered on ``func``, if any.
+
+        Raises:
+            ValueError: If ``derivatives`` is set and no Jacobian is available.
         """
         super().__init__(name=name)
         self.func = func
         self._inputs_list = inputs
         self._outputs_list = outputs
-        self._derivatives = derivatives
+        self.jacobian = jacobian or getattr(func, "jacobian", None)
+        if derivatives and self.jacobian is None:
+            raise ValueError(f"Tool '{name}' declares derivatives but has no Jacobian.")
+        self.cache_size = cache_size
+        self.vectorized = vectorized
+        self._memo: OrderedDict[tuple, dict[str, np.ndarray]] = OrderedDict()
 
         # GEMSEO Grammars require us to define input/output names
         self.input_grammar.update_from_names(self._inputs_list)
         self.output_grammar.update_from_names(self._outputs_list)
 
-        # GEMSEO expects default values to be set in default_inputs if they exist
-        self.default_inputs = {
-            in_name: np.array([0.0]) for in_name in self._inputs_list
-        }
+        # Unset inputs default to zero, so that MDA solvers linearizing the
+        # tool on its own (e.g. Newton) find every input.
+        self.default_input_data.update(
+            {in_name: np.array([0.0]) for in_name in self._inputs_list}
+        )
+
+        # Tools without analytical derivatives are linearized (e.g. by Newton
+        # MDAs or gradient-based drivers) with finite differences.
+        if self.jacobian is None:
+            self.set_jacobian_approximation()
+
+    @property
+    def derivatives(self) -> bool:
+        """Whether the tool provides analytical derivatives."""
+        return self.jacobian is not None
+
+    @property
+    def input_names(self) -> list[str]:
+        """The names of the tool inputs."""
+        return self._inputs_list
+
+    @property
+    def output_names(self) -> list[str]:
+        """The names of the tool outputs."""
+        return self._outputs_list
 
     def _run(self, **kwargs) -> None:
         """Executes the wrapped function using data from self.local_data and stores results.
@@ -51,39 +98,244 @@ class ToolComponent(Discipline):
         Expects the wrapped function to return a dictionary mapping output names
         to their computed values, or a single value for single outputs, or a tuple.
         """
+        self.local_data.update(self.compute_outputs(self.local_data))
+
+    def compute_outputs(self, data: Mapping[str, Any]) -> dict[str, np.ndarray]:
+        """Runs the wrapped function on the tool's inputs read from ``data``.
+
+        This bypasses GEMSEO's grammar checks and data copies, so that
+        compiled execution plans can call tools directly.
+
+        Args:
+            data: A mapping holding at least the tool's input values.
+
+        Returns:
+            The tool outputs as 1-D arrays, keyed by output name.
+        """
+        input_vals = self._input_values(data)
+
+        memo_key = None
+        if self.cache_size > 0:
+            memo_key = tuple(_hashable(input_vals[name]) for name in self._inputs_list)
+            cached = self._memo.get(memo_key)
+            if cached is not None:
+                self._memo.move_to_end(memo_key)
+                return {name: val.copy() for name, val in cached.items()}
+
+        # Always use keyword arguments to guarantee correct mapping
+        # regardless of the order in _inputs_list.
+        outputs = self._map_outputs(self.func(**input_vals))
+
+        if memo_key is not None:
+            self._memo[memo_key] = {name: val.copy() for name, val in outputs.items()}
+            if len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+        return outputs
+
+    def _input_values(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        """Reads the function arguments from ``data``."""
         # Prepare inputs as scalars: GEMSEO stores np.ndarray([v]) in local_data,
-        # but wrapped functions typically expect plain floats.
+        # but wrapped functions typically expect plain floats. Vectorized
+        # functions get the arrays, holding a single point.
         input_vals = {}
         for name in self._inputs_list:
-            val = self.local_data[name]
+            val = data[name]
             input_vals[name] = (
-                val.item() if isinstance(val, np.ndarray) and val.size == 1 else val
+                val.item()
+                if not self.vectorized and isinstance(val, np.ndarray) and val.size == 1
+                else val
             )
+        return input_vals
 
-        # Always use keyword arguments to guarantee correct mapping
-        # regardless of the order in _inputs_list.
-        result = self.func(**input_vals)
-
-        # Map results to outputs inside self.local_data
+    def _map_outputs(self, result: Any) -> dict[str, np.ndarray]:
+        """Maps a function result to the output names, as 1-D arrays."""
         if len(self._outputs_list) == 1:
-            output_name = self._outputs_list[0]
-            self.local_data[output_name] = np.atleast_1d(result)
-        elif isinstance(result, dict):
-            for name in self._outputs_list:
-                self.local_data[name] = np.atleast_1d(result[name])
-        else:
-            # If result is a tuple/list, assume order matches outputs
-            for i, name in enumerate(self._outputs_list):
-                self.local_data[name] = np.atleast_1d(result[i])
+            return {self._outputs_list[0]: np.atleast_1d(result)}
+        if isinstance(result, dict):
+            return {name: np.atleast_1d(result[name]) for name in self._outputs_list}
+        # If result is a tuple/list, assume order matches outputs
+        return {
+            name: np.atleast_1d(result[i]) for i, name in enumerate(self._outputs_list)
+        }
+
+    def compute_batch(
+        self, data: Mapping[str, Any], n_points: int
+    ) -> dict[str, np.ndarray]:
+        """Runs the tool on ``n_points`` design points at once.
+
+        Args:
+            data: A mapping holding at least the tool's input values, stacked
+                along a first axis of length ``n_points``.
+            n_points: The number of design points.
+
+        Returns:
+            The tool outputs, stacked the same way.
+
+        Raises:
+            ValueError: If a vectorized function returns a number of values
+                that matches neither ``n_points`` nor a single value.
+        """
+        if not self.vectorized:
+            return compute_point_by_point(self, data, n_points)
+
+        outputs = self._map_outputs(
+            self.func(**{name: data[name] for name in self._inputs_list})
+        )
+        for name, val in outputs.items():
+            if len(val) == n_points:
+                continue
+            if val.size != 1:
+                raise ValueError(
+                    f"Vectorized tool '{self.name}' returned {len(val)} values "
+                    f"of '{name}' for {n_points} points."
+                )
+            # A constant output applies to every point.
+            outputs[name] = np.full(n_points, val.item())
+        return outputs
 
     def _compute_jacobian(
-        self, inputs: list[str] = None, outputs: list[str] = None
+        self,
+        input_names: Iterable[str] = (),
+        output_names: Iterable[str] = (),
     ) -> None:
-        """Computes the analytical derivatives if provided."""
-        if self._derivatives:
-            # Placeholder for exact jacobian
-            pass
-        else:
-            # GEMSEO handles finite differences automatically if we call self.set_jacobian_approximation()
-            # which is typically done outside or at initialization.
-            pass
+        """Computes the analytical derivatives at the current local data."""
+        input_names, output_names = self._init_jacobian(
+            input_names, output_names, fill_missing_keys=True
+        )
+        partials = self.compute_jacobian(self.io.data)
+        for out_name in output_names:
+            for in_name, value in partials.get(out_name, {}).items():
+                if in_name in input_names:
+                    self.jac[out_name][in_name] = value
+
+    def compute_jacobian(
+        self, data: Mapping[str, Any]
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """Computes the partial derivatives of the tool at the inputs read from ``data``.
+
+        The registered Jacobian function gives them in a single call; other
+        tools are linearized by GEMSEO with finite differences.
+
+        Args:
+            data: A mapping holding at least the tool's input values.
+
+        Returns:
+            The partial derivatives as 2-D arrays of shape (output size,
+            input size), keyed by output then input name. Pairs missing from
+            an analytical Jacobian are omitted. Output sizes are read from
+            ``data`` when it holds the outputs, and inferred otherwise.
+
+        Raises:
+            ValueError: If the Jacobian function returns an entry for an
+                unknown output or input, or a block of the wrong size.
+        """
+        if self.jacobian is None:
+            return self.linearize(
+                {name: np.atleast_1d(data[name]) for name in self._inputs_list},
+                compute_all_jacobians=True,
+            )
+
+        result = self.jacobian(**self._input_values(data))
+        if len(self._outputs_list) == 1 and self._outputs_list[0] not in result:
+            result = {self._outputs_list[0]: result}
+
+        partials = {}
+        for out_name, row in result.items():
+            if out_name not in self._outputs_list:
+                raise ValueError(
+                    f"Jacobian of tool '{self.name}' has unknown output '{out_name}'."
+                )
+            partials[out_name] = {}
+            for in_name, value in row.items():
+                if in_name not in self._inputs_list:
+                    raise ValueError(
+                        f"Jacobian of tool '{self.name}' has unknown input '{in_name}'."
+                    )
+                block = np.asarray(value, dtype=float)
+                in_size = np.size(data[in_name])
+                out_size = (
+                    np.size(data[out_name])
+                    if out_name in data
+                    else block.size // max(in_size, 1)
+                )
+                if block.size != out_size * in_size:
+                    raise ValueError(
+                        f"Jacobian of tool '{self.name}' has {block.size} values "
+                        f"for d{out_name}/d{in_name}, expected "
+                        f"{out_size}x{in_size}."
+                    )
+                partials[out_name][in_name] = block.reshape(out_size, in_size)
+        return partials
+
+
+def with_jacobian(jacobian: Callable) -> Callable[[Callable], Callable]:
+    """Registers the analytical Jacobian of a tool function.
+
+    Tool components built from the decorated function, e.g. through a tool
+    registry, then provide exact derivatives.
+
+    Args:
+        jacobian: The Jacobian function, see ``ToolComponent``.
+
+    Example:
+        ```python
+        @with_jacobian(lambda x: {"x": 2.0 * x})
+        def square(x):
+            return x**2
+        ```
+
+    """
+
+    def decorate(func: Callable) -> Callable:
+        func.jacobian = jacobian
+        return func
+
+    return decorate
+
+
+def compute_point_by_point(
+    entry: Any, data: Mapping[str, Any], n_points: int
+) -> dict[str, np.ndarray]:
+    """Runs ``entry.compute_outputs`` once per design point and stacks the outputs.
+
+    Args:
+        entry: An object with ``input_names`` and ``compute_outputs``, e.g. a
+            tool component.
+        data: The input values, stacked along a first axis of length
+            ``n_points``.
+        n_points: The number of design points.
+
+    Returns:
+        The outputs, stacked along a first axis; values holding one element
+        per point are flattened to one dimension.
+    """
+    point_outputs = [
+        entry.compute_outputs(
+            {name: np.atleast_1d(data[name][i]) for name in entry.input_names}
+        )
+        for i in range(n_points)
+    ]
+    return {
+        name: stack_points([outputs[name] for outputs in point_outputs])
+        for name in entry.output_names
+    }
+
+
+def stack_points(values: list[Any]) -> np.ndarray:
+    """Stacks per-point values along a first axis.
+
+    Values holding a single element give a 1-D array with one entry per point.
+    """
+    stacked = np.stack([np.atleast_1d(val) for val in values])
+    if stacked.ndim == 2 and stacked.shape[1] == 1:
+        return stacked[:, 0]
+    return stacked
+
+
+def _hashable(value: Any) -> Hashable:
+    """Returns a hashable, value-based stand-in for a tool input."""
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, list):
+        return tuple(_hashable(v) for v in value)
+    return value
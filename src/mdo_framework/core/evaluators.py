@@ -4,20 +4,27 @@ License, v. 2.0. If a copy of the MPL was not distributed with this
 file, You can obtain one at http://mozilla.org/MPL/2.0/.
 """
 
+import logging
 from typing import Any
 
 import numpy as np
 from gemseo.core.discipline import Discipline
 
+from mdo_framework.core.plan import ExecutionPlan
+
+logger = logging.getLogger(__name__)
+
 
 class LocalEvaluator:
-    """Evaluates the design parameters locally using a GEMSEO MDA instance.
+    """Evaluates the design parameters locally on a built problem.
 
     Args:
-        problem: An instantiated GEMSEO MDA (or Discipline) object.
+        problem: The problem returned by `GraphProblemBuilder.build_problem`:
+            an ``ExecutionPlan`` by default, or a GEMSEO MDA (or any
+            ``Discipline``).
     """
 
-    def __init__(self, problem: Discipline):
+    def __init__(self, problem: ExecutionPlan | Discipline):
         self.problem = problem
 
     def evaluate(
@@ -28,7 +35,7 @@ class LocalEvaluator:
         # GEMSEO uses a dictionary with string keys and numpy array values for local_data
         input_data = {name: np.atleast_1d(val) for name, val in parameters.items()}
 
-        # We need to provide all required inputs for the MDA, not just parameters.
+        # We need to provide all required inputs for the problem, not just parameters.
         # This will be passed and merged internally by execute.
         output_data = self.problem.execute(input_data)
 
@@ -43,3 +50,92 @@ class LocalEvaluator:
                 else float(val)
             )
         return results
+
+    def evaluate_gradient(
+        self,
+        parameters: dict[str, Any],
+        objectives: list[str],
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """Evaluates the gradients of the objectives with respect to the parameters.
+
+        Tools registering an analytical Jacobian contribute exact derivatives
+        in a single call; the others are approximated by finite differences.
+
+        Args:
+            parameters: The design point, whose names are the differentiated
+                inputs.
+            objectives: The outputs to differentiate.
+
+        Returns:
+            The gradients as 1-D arrays, keyed by objective then parameter.
+        """
+        input_data = {name: np.atleast_1d(val) for name, val in parameters.items()}
+        names = list(input_data)
+        if isinstance(self.problem, Discipline):
+            self.problem.add_differentiated_inputs(names)
+            self.problem.add_differentiated_outputs(objectives)
+            jac = self.problem.linearize(input_data)
+        else:
+            jac = self.problem.linearize(input_data, names, objectives)
+        return {
+            obj: {name: np.ravel(np.asarray(jac[obj][name])) for name in names}
+            for obj in objectives
+        }
+
+    def evaluate_many(
+        self,
+        parameters_list: list[dict[str, Any]],
+        objectives: list[str],
+        return_exceptions: bool = False,
+    ) -> list[dict[str, float] | Exception]:
+        """Evaluates many design points, in a single batch when possible.
+
+        Problems exposing ``execute_batch`` (compiled execution plans) run
+        every point in one pass, so that vectorized tools are called once for
+        the whole batch. If the batch fails, or the problem cannot run
+        batches, the points are evaluated one by one so that each failure is
+        attributed to its point.
+
+        Args:
+            parameters_list: The design points to evaluate.
+            objectives: The outputs requested for every point.
+            return_exceptions: Whether failed points are returned in place as
+                exception instances instead of raising the first failure.
+
+        Returns:
+            The results, in the order of ``parameters_list``.
+        """
+        if not parameters_list:
+            return []
+
+        execute_batch = getattr(self.problem, "execute_batch", None)
+        if execute_batch is not None:
+            try:
+                output_data = execute_batch(
+                    [
+                        {name: np.atleast_1d(val) for name, val in params.items()}
+                        for params in parameters_list
+                    ]
+                )
+                missing = [obj for obj in objectives if obj not in output_data]
+                if missing:
+                    raise KeyError(
+                        f"Missing objective or constraint output: {missing[0]}"
+                    )
+                return [
+                    {obj: float(np.ravel(output_data[obj][i])[0]) for obj in objectives}
+                    for i in range(len(parameters_list))
+                ]
+            except Exception:  # noqa: BLE001
+                # Retried point by point below, to report the failing points.
+                logger.debug("Batch evaluation failed, retrying point by point.")
+
+        outcomes: list[dict[str, float] | Exception] = []
+        for params in parameters_list:
+            try:
+                outcomes.append(self.evaluate(params, objectives))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                outcomes.append(e)
+        return outcomes
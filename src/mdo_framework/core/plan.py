@@ -0,0 +1,407 @@
+"""
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this
+file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+from gemseo.mda.factory import MDAFactory
+
+from mdo_framework.core.components import (
+    ToolComponent,
+    compute_point_by_point,
+    stack_points,
+)
+
+logger = logging.getLogger(__name__)
+
+# Inner MDA algorithms of coupled clusters, by the name used in tool metadata.
+MDA_SOLVERS = {
+    "gauss_seidel": "MDAGaussSeidel",
+    "jacobi": "MDAJacobi",
+    "newton": "MDANewtonRaphson",
+    "quasi_newton": "MDAQuasiNewton",
+}
+
+
+class CoupledCluster:
+    """Solves a cluster of mutually dependent tools with an inner MDA.
+
+    The cluster exposes the ``compute_outputs`` interface of a tool
+    component, so that an ``ExecutionPlan`` level can hold it next to plain
+    tools and only the coupled tools iterate. After every run,
+    ``convergence`` holds the statistics of the solve.
+
+    Args:
+        disciplines: The tool components of the cluster, in schema order.
+        default_input_data: Default values of the cluster inputs; values of
+            coupling variables are the initial guesses of the MDA.
+        solver: The inner MDA algorithm, a key of ``MDA_SOLVERS``.
+        tolerance: The normed residual below which the MDA has converged.
+        max_iter: The maximum number of MDA iterations.
+        warm_start: Whether each run starts from the coupling values the
+            previous run converged to instead of the initial guesses. A warm
+            run that fails or does not converge is restarted from them.
+
+    Raises:
+        ValueError: If the solver is unknown or a setting is invalid.
+    """
+
+    def __init__(
+        self,
+        disciplines: list[ToolComponent],
+        default_input_data: dict[str, np.ndarray] | None = None,
+        solver: str = "gauss_seidel",
+        tolerance: float = 1e-6,
+        max_iter: int = 20,
+        warm_start: bool = False,
+    ):
+        if solver not in MDA_SOLVERS:
+            raise ValueError(
+                f"Unknown MDA solver '{solver}', expected one of: "
+                f"{', '.join(MDA_SOLVERS)}."
+            )
+        if tolerance <= 0 or max_iter <= 0:
+            raise ValueError("MDA tolerance and max_iter must be positive.")
+
+        self.disciplines = disciplines
+        self.name = "+".join(comp.name for comp in disciplines)
+        self.solver = solver
+        self.warm_start = warm_start
+        self.convergence: dict[str, Any] = {}
+        # The coupling values of the last converged run, for warm starts
+        self._warm_state: dict[str, np.ndarray] = {}
+
+        self.output_names = [name for comp in disciplines for name in comp.output_names]
+        produced = set(self.output_names)
+        input_names: list[str] = []
+        for comp in disciplines:
+            for name in comp.input_names:
+                if name not in produced and name not in input_names:
+                    input_names.append(name)
+        self.input_names = input_names
+
+        self.mda = MDAFactory().create(
+            MDA_SOLVERS[solver],
+            disciplines=disciplines,
+            tolerance=tolerance,
+            max_mda_iter=max_iter,
+        )
+        # Unset inputs, including coupling variables, start from zero.
+        self._mda_input_names = list(self.mda.input_grammar.names)
+        self._coupling_names = [
+            name for name in self._mda_input_names if name in produced
+        ]
+        for name in self._mda_input_names:
+            self.mda.default_input_data[name] = np.array([0.0])
+        for name, val in (default_input_data or {}).items():
+            if name in self.mda.input_grammar:
+                self.mda.default_input_data[name] = np.atleast_1d(val)
+
+    def compute_outputs(self, data: dict[str, Any]) -> dict[str, np.ndarray]:
+        """Runs the MDA on the cluster inputs read from ``data``.
+
+        Coupling variables present in ``data`` override the initial guesses
+        and the warm start state.
+
+        Returns:
+            The outputs of every tool of the cluster at the last iteration.
+        """
+        input_data = {
+            name: data[name] for name in self._mda_input_names if name in data
+        }
+        n_residuals = len(self.mda.residual_history)
+
+        warm_state = {
+            name: val for name, val in self._warm_state.items() if name not in data
+        }
+        result = None
+        if warm_state:
+            try:
+                result = self.mda.execute({**input_data, **warm_state})
+            except Exception:
+                logger.debug("Warm-started MDA of %s failed.", self.name, exc_info=True)
+            if result is None or not self._converged(result):
+                # Diverged from the previous solution: solve from the defaults.
+                self._warm_state = {}
+                result = None
+        restarted = bool(warm_state) and result is None
+        # Iterations spent on a discarded warm attempt are reported apart.
+        warm_iterations = 0
+        if restarted:
+            warm_iterations = len(self.mda.residual_history) - n_residuals
+            n_residuals = len(self.mda.residual_history)
+        if result is None:
+            result = self.mda.execute(input_data)
+
+        converged = self._converged(result)
+        if self.warm_start:
+            self._warm_state = (
+                {name: np.array(result[name]) for name in self._coupling_names}
+                if converged
+                else {}
+            )
+        self.convergence = {
+            "solver": self.solver,
+            "iterations": len(self.mda.residual_history) - n_residuals,
+            "residual": float(self.mda.normed_residual),
+            "converged": converged,
+            "warm_started": bool(warm_state) and not restarted,
+            "restarted": restarted,
+            "warm_iterations": warm_iterations,
+        }
+        return {name: np.array(result[name]) for name in self.output_names}
+
+    def compute_batch(
+        self, data: Mapping[str, Any], n_points: int
+    ) -> dict[str, np.ndarray]:
+        """Runs the MDA once per design point, see ``ToolComponent.compute_batch``.
+
+        With warm starting, each point starts from the solution of the
+        previous one.
+        """
+        return compute_point_by_point(self, data, n_points)
+
+    def compute_jacobian(
+        self, data: Mapping[str, Any]
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """Computes the coupled derivatives of the cluster outputs.
+
+        The MDA linearizes every tool, with the analytical Jacobians of the
+        tools providing one, and solves the coupled system for the total
+        derivatives with respect to the cluster inputs.
+
+        Args:
+            data: A mapping holding at least the cluster input values.
+
+        Returns:
+            The derivatives as 2-D arrays, keyed by output then input name.
+        """
+        input_data = {
+            name: np.atleast_1d(data[name])
+            for name in self._mda_input_names
+            if name in data
+        }
+        self.mda.add_differentiated_inputs(self.input_names)
+        self.mda.add_differentiated_outputs(self.output_names)
+        jac = self.mda.linearize(input_data)
+        return {
+            out_name: {in_name: np.asarray(block) for in_name, block in row.items()}
+            for out_name, row in jac.items()
+        }
+
+    def _converged(self, result: Mapping[str, Any]) -> bool:
+        if not self.mda.normed_residual <= self.mda.settings.tolerance:
+            return False
+        return all(np.all(np.isfinite(result[name])) for name in self.output_names)
+
+
+class ExecutionPlan:
+    """Runs an acyclic chain of tools as plain Python calls.
+
+    The plan is compiled once from topologically ordered tool levels and then
+    evaluates every call on a flat dictionary of arrays, without the grammar
+    validation and data copies of a GEMSEO ``MDAChain``. It exposes the same
+    ``execute(input_data)`` interface so that evaluators and the execution
+    service can use either object.
+
+    Coupled tools are contracted into ``CoupledCluster`` entries beforehand,
+    so only they iterate on an MDA while the rest of the graph is called once.
+
+    Tools within a level share no data dependency. With ``max_workers`` above
+    one, levels holding several tools run them concurrently on a thread pool,
+    which pays off for tools that release the GIL (NumPy, external codes).
+
+    Args:
+        levels: The tool components and coupled clusters grouped by level, in
+            execution order.
+        default_input_data: Default values of the plan inputs.
+        max_workers: The number of threads running a level (default 1,
+            sequential execution).
+    """
+
+    name = "ExecutionPlan"
+
+    def __init__(
+        self,
+        levels: list[list[ToolComponent | CoupledCluster]],
+        default_input_data: dict[str, np.ndarray] | None = None,
+        max_workers: int = 1,
+    ):
+        self.levels = levels
+        self.disciplines = [comp for level in levels for comp in level]
+        self.clusters = [c for c in self.disciplines if isinstance(c, CoupledCluster)]
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_pid: int | None = None
+        self._executor_lock = threading.Lock()
+
+        produced: set[str] = set()
+        input_names: list[str] = []
+        for comp in self.disciplines:
+            for name in comp.input_names:
+                if name not in produced and name not in input_names:
+                    input_names.append(name)
+            produced.update(comp.output_names)
+        self.input_names = input_names
+        self.output_names = [
+            name for comp in self.disciplines for name in comp.output_names
+        ]
+
+        # Mirror GEMSEO: unset inputs default to zero.
+        self.default_input_data = {name: np.array([0.0]) for name in input_names}
+        for name, val in (default_input_data or {}).items():
+            if name in self.default_input_data:
+                self.default_input_data[name] = np.atleast_1d(val)
+
+    @property
+    def convergence(self) -> dict[str, dict[str, Any]]:
+        """The MDA statistics of the last run, by coupled cluster name."""
+        return {c.name: c.convergence for c in self.clusters if c.convergence}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            # Threads do not survive a fork, so forked workers get their own pool.
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="execution-plan",
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def execute(self, input_data: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Runs every tool once, level by level.
+
+        Args:
+            input_data: Input values overriding the defaults.
+
+        Returns:
+            The input values merged with every tool output.
+        """
+        data = dict(self.default_input_data)
+        if input_data:
+            data.update(input_data)
+        for cluster in self.clusters:
+            cluster.convergence = {}
+        for level in self.levels:
+            if self.max_workers <= 1 or len(level) == 1:
+                for comp in level:
+                    data.update(comp.compute_outputs(data))
+                continue
+
+            # Tools of a level only read data produced by earlier levels, so
+            # they can share the snapshot; outputs are merged in level order.
+            executor = self._get_executor()
+            futures = [executor.submit(comp.compute_outputs, data) for comp in level]
+            results = [future.result() for future in futures]
+            for outputs in results:
+                data.update(outputs)
+        return data
+
+    def execute_batch(self, points: list[dict[str, Any]]) -> dict[str, np.ndarray]:
+        """Runs every tool once per level on many design points.
+
+        Vectorized tools get every point in a single call; other tools and
+        coupled clusters are called point by point. Levels run sequentially.
+
+        Args:
+            points: The input values of every design point, overriding the
+                defaults.
+
+        Returns:
+            The input values merged with every tool output, stacked along a
+            first axis holding one entry per point.
+        """
+        n_points = len(points)
+        if not n_points:
+            return {}
+        # Values that are not plan inputs (e.g. coupling guesses) are only
+        # kept when every point sets them.
+        names = list(self.default_input_data)
+        names.extend(
+            name
+            for name in points[0]
+            if name not in self.default_input_data
+            and all(name in point for point in points)
+        )
+        data = {
+            name: stack_points(
+                [point.get(name, self.default_input_data.get(name)) for point in points]
+            )
+            for name in names
+        }
+        for cluster in self.clusters:
+            cluster.convergence = {}
+        for level in self.levels:
+            for comp in level:
+                data.update(comp.compute_batch(data, n_points))
+        return data
+
+    def linearize(
+        self,
+        input_data: dict[str, Any] | None = None,
+        input_names: list[str] | None = None,
+        output_names: list[str] | None = None,
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """Computes the total derivatives of outputs with respect to plan inputs.
+
+        The plan is executed, then the partial derivatives of every tool and
+        coupled cluster depending on the differentiated inputs are chained in
+        execution order (forward mode). Tools registering a Jacobian cost a
+        single call; the others are approximated by finite differences.
+
+        Args:
+            input_data: Input values overriding the defaults.
+            input_names: The inputs to differentiate with respect to
+                (defaults to every plan input).
+            output_names: The outputs to differentiate (defaults to every
+                plan output).
+
+        Returns:
+            The derivatives as 2-D arrays of shape (output size, input size),
+            keyed by output then input name.
+        """
+        data = self.execute(input_data)
+        input_names = list(input_names or self.input_names)
+        output_names = list(output_names or self.output_names)
+
+        # The derivatives of every variable computed so far, by input name
+        totals: dict[str, dict[str, np.ndarray]] = {
+            name: {name: np.eye(np.size(data[name]))} for name in input_names
+        }
+        for comp in self.disciplines:
+            if not any(name in totals for name in comp.input_names):
+                continue
+            partials = comp.compute_jacobian(data)
+            for out_name in comp.output_names:
+                chained: dict[str, np.ndarray] = {}
+                for in_name, block in partials.get(out_name, {}).items():
+                    for wrt, total in totals.get(in_name, {}).items():
+                        term = np.asarray(block) @ total
+                        chained[wrt] = chained[wrt] + term if wrt in chained else term
+                totals[out_name] = chained
+
+        return {
+            out_name: {
+                wrt: totals.get(out_name, {}).get(
+                    wrt, np.zeros((np.size(data[out_name]), np.size(data[wrt])))
+                )
+                for wrt in input_names
+            }
+            for out_name in output_names
+        }
+
+    def cleanup(self) -> None:
+        """Shuts down the thread pool, if one was started."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -0,0 +1,110 @@
+"""
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this
+file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+from typing import Any
+
+COMPACT_SCHEMA_FORMAT = "graphmdo.columnar"
+COMPACT_SCHEMA_VERSION = 1
+COMPACT_SCHEMA_MEDIA_TYPE = "application/vnd.graphmdo.schema.columnar+json"
+
+
+def _columns(rows: list[dict[str, Any]], skip: set[str]) -> dict[str, list[Any]]:
+    keys: list[str] = []
+    for row in rows:
+        keys.extend(k for k in row if k not in skip and k not in keys)
+    return {key: [row.get(key) for row in rows] for key in keys}
+
+
+def encode_compact_schema(schema: dict[str, Any]) -> dict[str, Any]:
+    """Encodes a schema as property columns with integer edge lists.
+
+    Every property is stored once per table as a column instead of once per
+    row as a key, and tool inputs and outputs are indices into a shared name
+    table, which starts with the variable names. Missing properties are
+    stored as None, so properties holding None do not round-trip.
+
+    Args:
+        schema: A schema with 'tools' and 'variables' lists.
+
+    Returns:
+        The compact, versioned representation.
+    """
+    variables = schema.get("variables", [])
+    tools = schema.get("tools", [])
+
+    names = [var["name"] for var in variables]
+    index = {name: i for i, name in enumerate(names)}
+
+    def _refs(var_names: list[str]) -> list[int]:
+        refs = []
+        for name in var_names:
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+            refs.append(index[name])
+        return refs
+
+    return {
+        "format": COMPACT_SCHEMA_FORMAT,
+        "version": COMPACT_SCHEMA_VERSION,
+        "names": names,
+        "variables": {
+            "count": len(variables),
+            "columns": _columns(variables, {"name"}),
+        },
+        "tools": {
+            "name": [tool["name"] for tool in tools],
+            "columns": _columns(tools, {"name", "inputs", "outputs"}),
+            "inputs": [_refs(tool.get("inputs", [])) for tool in tools],
+            "outputs": [_refs(tool.get("outputs", [])) for tool in tools],
+        },
+    }
+
+
+def is_compact_schema(data: Any) -> bool:
+    """Tells whether ``data`` is a compact schema."""
+    return isinstance(data, dict) and data.get("format") == COMPACT_SCHEMA_FORMAT
+
+
+def decode_schema(data: dict[str, Any]) -> dict[str, Any]:
+    """Returns ``data`` as a plain schema, decoding the compact encoding if needed.
+
+    Args:
+        data: A plain or compact schema.
+
+    Raises:
+        ValueError: If the compact schema version is not supported or its
+            tables are malformed.
+    """
+    if not is_compact_schema(data):
+        return data
+    if data.get("version") != COMPACT_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported compact schema version: {data.get('version')}")
+
+    try:
+        names = data["names"]
+        var_table = data["variables"]
+        tool_table = data["tools"]
+
+        var_columns = var_table["columns"].items()
+        variables = []
+        for i in range(var_table["count"]):
+            var = {"name": names[i]}
+            var.update((k, col[i]) for k, col in var_columns if col[i] is not None)
+            variables.append(var)
+
+        tool_columns = tool_table["columns"].items()
+        tools = []
+        for i, name in enumerate(tool_table["name"]):
+            tool = {"name": name}
+            tool.update((k, col[i]) for k, col in tool_columns if col[i] is not None)
+            tool["inputs"] = [names[j] for j in tool_table["inputs"][i]]
+            tool["outputs"] = [names[j] for j in tool_table["outputs"][i]]
+            tools.append(tool)
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        raise ValueError("Compact schema is malformed.") from e
+
+    return {"tools": tools, "variables": variables}
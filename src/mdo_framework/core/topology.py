@@ -4,77 +4,384 @@ License, v. 2.0. If a copy of the MPL was not distributed with this
 file, You can obtain one at http://mozilla.org/MPL/2.0/.
 """
 
+import bisect
+from collections.abc import Iterable, Iterator
 from typing import Any
 
+from mdo_framework.core.schema_codec import decode_schema
+
 
 class TopologicalAnalyzer:
-    """Analyzes a KADMOS/CMDOWS-style graph schema recursively to extract
-    the independent design variables and sub-graph components required
-    to evaluate a specific target output.
+    """Analyzes a KADMOS/CMDOWS-style graph schema to extract the independent
+    design variables and sub-graph components required to evaluate a specific
+    target output.
+
+    The variable-to-tool edges are indexed once, traversals use an explicit
+    stack (so arbitrarily deep tool chains are supported) and the upstream
+    closure of every resolved target is memoized. Nodes and edges can be
+    added in place; only the closures they reach are dropped.
     """
 
     def __init__(self, schema: dict[str, Any]):
         """Initializes the analyzer with the provided graph schema.
 
         Args:
-            schema: Dictionary representing the full graph tools and variables.
+            schema: Dictionary representing the full graph tools and variables,
+                plain or in the compact encoding.
 
         """
+        schema = decode_schema(schema)
         self.schema = schema
         self.tools = {t["name"]: t for t in schema.get("tools", [])}
         self.variables = {v["name"]: v for v in schema.get("variables", [])}
+        self._tool_position = {name: i for i, name in enumerate(self.tools)}
 
         # Build reverse lookup: variable name -> list of tools that output it
-        self.var_sources = {}
+        self.var_sources: dict[str, list[str]] = {}
+        # And forward lookup: variable name -> list of tools that consume it
+        self.var_consumers: dict[str, list[str]] = {}
         for tool_name, tool_data in self.tools.items():
             for out_var in tool_data.get("outputs", []):
-                if out_var not in self.var_sources:
-                    self.var_sources[out_var] = []
-                self.var_sources[out_var].append(tool_name)
+                self.var_sources.setdefault(out_var, []).append(tool_name)
+            for in_var in tool_data.get("inputs", []):
+                self.var_consumers.setdefault(in_var, []).append(tool_name)
+
+        # Single target -> (tools, inputs) in traversal order, with the
+        # variables the traversal went through, for invalidation.
+        self._closures: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+        self._closure_vars: dict[str, frozenset[str]] = {}
+        self._closure_tools: dict[str, frozenset[str]] = {}
+
+    def _check_target(self, var_name: str):
+        if var_name not in self.variables and var_name not in self.var_sources:
+            raise ValueError(f"Target output '{var_name}' is not defined in the graph.")
+
+    def _walk(
+        self,
+        target_outputs: Iterable[str],
+        visited_tools: list[str],
+        visited_tool_names: set[str],
+        required_inputs: list[str],
+        required_input_names: set[str],
+        seen_vars: set[str] | None = None,
+    ):
+        # Depth-first, pre-order: the stack replays the recursive traversal,
+        # a tool being marked when it is reached, not when it is pushed.
+        stack: list[tuple[bool, str]] = [(False, out) for out in target_outputs]
+        stack.reverse()
+        while stack:
+            is_tool, name = stack.pop()
+            if is_tool:
+                if name in visited_tool_names:
+                    continue
+                visited_tool_names.add(name)
+                visited_tools.append(name)
+                inputs = self.tools[name].get("inputs", [])
+                stack.extend((False, var) for var in reversed(inputs))
+                continue
+
+            if seen_vars is not None:
+                seen_vars.add(name)
+            sources = self.var_sources.get(name)
+            # If there are no sources, this is an independent input (design variable)
+            if not sources:
+                if name not in required_input_names:
+                    required_input_names.add(name)
+                    required_inputs.append(name)
+                continue
+            # Traverse upstream through tools producing this variable
+            stack.extend((True, tool) for tool in reversed(sources))
+
+    def upstream_closure(
+        self, var_name: str
+    ) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        """Returns everything ``var_name`` depends on, memoized.
+
+        Args:
+            var_name: A variable of the graph.
+
+        Returns:
+            The names of the tools needed to compute the variable and of the
+            independent inputs they need, in traversal order.
+
+        Raises:
+            ValueError: If the variable is not defined in the graph.
+        """
+        closure = self._closures.get(var_name)
+        if closure is not None:
+            return closure
+
+        self._check_target(var_name)
+        tools: list[str] = []
+        inputs: list[str] = []
+        seen_vars: set[str] = set()
+        self._walk([var_name], tools, set(), inputs, set(), seen_vars)
+
+        closure = (tuple(tools), tuple(inputs))
+        self._closures[var_name] = closure
+        self._closure_vars[var_name] = frozenset(seen_vars)
+        self._closure_tools[var_name] = frozenset(tools)
+        return closure
 
     def resolve_dependencies(
         self,
         target_outputs: list[str],
     ) -> tuple[list[str], list[dict[str, Any]]]:
-        """Recursively resolve all dependencies needed to compute target_outputs.
+        """Resolve all dependencies needed to compute target_outputs.
+
+        Targets whose closure is memoized are merged without walking the
+        graph again; otherwise the targets share a single traversal, so the
+        cost stays linear in the size of the graph however many targets are
+        requested.
+
         Returns a tuple containing:
             1. A list of independent design variables (inputs without any tool source).
             2. A list of tool configurations required for execution.
         """
+        for out in target_outputs:
+            self._check_target(out)
+
         visited_tool_names: set[str] = set()
         visited_tools: list[str] = []
         required_input_names: set[str] = set()
         required_inputs: list[str] = []
 
-        def _traverse(var_name: str):
-            sources = self.var_sources.get(var_name, [])
-
-            # If there are no sources, this is an independent input (design variable)
-            if not sources:
-                if var_name not in required_input_names:
-                    required_input_names.add(var_name)
-                    required_inputs.append(var_name)
-                return
-
-            # Traverse upstream through tools producing this variable
-            for source_tool in sources:
-                if source_tool not in visited_tool_names:
-                    visited_tool_names.add(source_tool)
-                    visited_tools.append(source_tool)
-                    tool_data = self.tools[source_tool]
-                    for input_var in tool_data.get("inputs", []):
-                        _traverse(input_var)
-
-        for out in target_outputs:
-            if out not in self.variables:
-                raise ValueError(f"Target output '{out}' is not defined in the graph.")
-            _traverse(out)
+        if len(target_outputs) == 1 or all(
+            out in self._closures for out in target_outputs
+        ):
+            # After each target, the visited tools are closed upstream, so
+            # skipping them in the next closure equals a shared traversal.
+            for out in target_outputs:
+                tools, inputs = self.upstream_closure(out)
+                for tool in tools:
+                    if tool not in visited_tool_names:
+                        visited_tool_names.add(tool)
+                        visited_tools.append(tool)
+                for var in inputs:
+                    if var not in required_input_names:
+                        required_input_names.add(var)
+                        required_inputs.append(var)
+        else:
+            self._walk(
+                target_outputs,
+                visited_tools,
+                visited_tool_names,
+                required_inputs,
+                required_input_names,
+            )
 
         # Map variable names back to definitions to maintain schema structure format
         req_tools = [self.tools[t] for t in visited_tools]
 
         return required_inputs, req_tools
 
+    def _invalidate(self, tool_name: str | None = None, var_name: str | None = None):
+        stale = [
+            target
+            for target in self._closures
+            if tool_name in self._closure_tools[target]
+            or var_name in self._closure_vars[target]
+        ]
+        for target in stale:
+            del self._closures[target]
+            del self._closure_vars[target]
+            del self._closure_tools[target]
+
+    def _insert(self, tool_names: list[str], tool_name: str):
+        # Keep the schema order, as if the analyzer was built from scratch.
+        position = self._tool_position
+        bisect.insort(tool_names, tool_name, key=position.__getitem__)
+
+    def _edit_tool(self, tool_name: str, key: str, var_name: str) -> bool:
+        tool = self.tools.get(tool_name)
+        if tool is None:
+            raise ValueError(f"Tool '{tool_name}' is not defined in the graph.")
+        if var_name in tool.get(key, []):
+            return False
+        # Copy on write, the schema passed to the constructor is left alone.
+        self.tools[tool_name] = {**tool, key: [*tool.get(key, []), var_name]}
+        return True
+
+    def add_variable(self, variable: dict[str, Any]):
+        """Adds or replaces a variable definition.
+
+        Args:
+            variable: The variable, as listed in the schema.
+        """
+        self.variables[variable["name"]] = variable
+
+    def add_tool(self, tool: dict[str, Any]):
+        """Adds a tool and connects its inputs and outputs.
+
+        Args:
+            tool: The tool, as listed in the schema.
+
+        Raises:
+            ValueError: If a tool with the same name already exists.
+        """
+        if tool["name"] in self.tools:
+            raise ValueError(f"Tool '{tool['name']}' is already defined in the graph.")
+        self.tools[tool["name"]] = {**tool, "inputs": [], "outputs": []}
+        self._tool_position[tool["name"]] = len(self._tool_position)
+        for var_name in tool.get("inputs", []):
+            self.connect_input(var_name, tool["name"])
+        for var_name in tool.get("outputs", []):
+            self.connect_output(tool["name"], var_name)
+
+    def connect_input(self, var_name: str, tool_name: str):
+        """Adds the edge ``var_name -> tool_name`` (the tool consumes the variable).
+
+        Raises:
+            ValueError: If the tool does not exist.
+        """
+        if self._edit_tool(tool_name, "inputs", var_name):
+            self._insert(self.var_consumers.setdefault(var_name, []), tool_name)
+            self._invalidate(tool_name=tool_name)
+
+    def connect_output(self, tool_name: str, var_name: str):
+        """Adds the edge ``tool_name -> var_name`` (the tool computes the variable).
+
+        Raises:
+            ValueError: If the tool does not exist.
+        """
+        if self._edit_tool(tool_name, "outputs", var_name):
+            self._insert(self.var_sources.setdefault(var_name, []), tool_name)
+            self._invalidate(var_name=var_name)
+
+    def _dependents(self) -> dict[str, list[str]]:
+        # Tool -> tools consuming one of its outputs, in schema order.
+        dependents: dict[str, list[str]] = {name: [] for name in self.tools}
+        for tool_name, tool_data in self.tools.items():
+            upstream = {
+                source
+                for input_var in tool_data.get("inputs", [])
+                for source in self.var_sources.get(input_var, [])
+            }
+            for source in upstream:
+                dependents[source].append(tool_name)
+        return dependents
+
+    def _components(self, dependents: dict[str, list[str]]) -> list[list[str]]:
+        # Tarjan's algorithm with an explicit stack; components come out in
+        # reverse topological order.
+        position = self._tool_position
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        components = []
+
+        def _visit(tool_name: str):
+            index[tool_name] = low[tool_name] = len(index)
+            stack.append(tool_name)
+            on_stack.add(tool_name)
+            work.append((tool_name, iter(dependents[tool_name])))
+
+        for root in self.tools:
+            if root in index:
+                continue
+            work: list[tuple[str, Iterator[str]]] = []
+            _visit(root)
+            while work:
+                tool_name, pending = work[-1]
+                for dependent in pending:
+                    if dependent not in index:
+                        _visit(dependent)
+                        break
+                    if dependent in on_stack:
+                        low[tool_name] = min(low[tool_name], index[dependent])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[tool_name])
+                    if low[tool_name] == index[tool_name]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == tool_name:
+                                break
+                        components.append(sorted(component, key=position.__getitem__))
+        return components
+
+    def condensation(self) -> list[list[list[str]]]:
+        """Partitions the tools into strongly connected components and levels them.
+
+        A strongly connected component holds tools that depend on each other
+        through a cycle (a coupled cluster needing an MDA) or a single tool.
+        Contracting every component gives an acyclic graph, whose nodes are
+        grouped into levels that only consume outputs of earlier levels.
+        Ties keep the schema order, so the result is deterministic.
+
+        Returns:
+            The components level by level, each as a list of tool names in
+            schema order.
+        """
+        dependents = self._dependents()
+        components = self._components(dependents)
+        component_of = {
+            tool_name: i
+            for i, component in enumerate(components)
+            for tool_name in component
+        }
+
+        successors: list[set[int]] = [set() for _ in components]
+        in_degree = [0] * len(components)
+        for tool_name, tool_dependents in dependents.items():
+            source = component_of[tool_name]
+            for dependent in tool_dependents:
+                target = component_of[dependent]
+                if target != source and target not in successors[source]:
+                    successors[source].add(target)
+                    in_degree[target] += 1
+
+        position = self._tool_position
+
+        def _first_position(i: int) -> int:
+            return position[components[i][0]]
+
+        level = sorted(
+            (i for i, degree in enumerate(in_degree) if degree == 0),
+            key=_first_position,
+        )
+        levels = []
+        while level:
+            levels.append([components[i] for i in level])
+            next_level = []
+            for i in level:
+                for successor in successors[i]:
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        next_level.append(successor)
+            level = sorted(next_level, key=_first_position)
+        return levels
+
+    def strongly_connected_components(self) -> list[list[str]]:
+        """Returns the strongly connected components in execution order.
+
+        See `condensation`, whose levels this flattens.
+        """
+        return [component for level in self.condensation() for component in level]
+
+    def is_coupled(self, component: list[str]) -> bool:
+        """Tells whether a component is a coupled cluster needing an MDA.
+
+        Args:
+            component: A component returned by `condensation`.
+
+        Returns:
+            Whether the component holds several tools, or a single tool
+            consuming one of its own outputs.
+        """
+        if len(component) > 1:
+            return True
+        tool_data = self.tools[component[0]]
+        return not set(tool_data.get("inputs", [])).isdisjoint(
+            tool_data.get("outputs", [])
+        )
+
     def extract_parameters(self, design_vars: list[str]) -> list[dict[str, Any]]:
         """Formats design variables into Ax-Platform ready parameter structures."""
         parameters = []
@@ -11,6 +11,56 @@ import numpy as np
 from gemseo.mda.factory import MDAFactory
 
 from mdo_framework.core.components import ToolComponent
+from mdo_framework.core.plan import CoupledCluster, ExecutionPlan
+from mdo_framework.core.topology import TopologicalAnalyzer
+
+# Memoized input slices per tool when a tool is `cacheable` without `cache_size`.
+DEFAULT_TOOL_CACHE_SIZE = 128
+
+# Tool metadata tuning the inner MDA of the coupled cluster holding the tool,
+# mapped to the `CoupledCluster` argument it sets.
+MDA_OPTION_KEYS = {
+    "mda_solver": "solver",
+    "mda_tolerance": "tolerance",
+    "mda_max_iter": "max_iter",
+    "mda_warm_start": "warm_start",
+}
+
+
+def _mda_option(key: str, value: Any) -> Any:
+    if key == "tolerance":
+        return float(value)
+    if key == "max_iter":
+        return int(value)
+    if key == "warm_start" and isinstance(value, str):
+        return value.lower() in ("1", "true", "yes")
+    if key == "warm_start":
+        return bool(value)
+    return value
+
+
+def cluster_mda_options(
+    tools: list[dict[str, Any]],
+    defaults: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Resolves the inner MDA settings of a coupled cluster.
+
+    Args:
+        tools: The schema entries of the cluster tools, in schema order. The
+            first tool setting a key of ``MDA_OPTION_KEYS`` decides it.
+        defaults: Graph-wide ``CoupledCluster`` settings, overridden by the
+            tool metadata.
+
+    Returns:
+        The keyword arguments of ``CoupledCluster``.
+    """
+    options = dict(defaults or {})
+    for metadata_key, option in MDA_OPTION_KEYS.items():
+        for tool in tools:
+            if tool.get(metadata_key) is not None:
+                options[option] = tool[metadata_key]
+                break
+    return {key: _mda_option(key, value) for key, value in options.items()}
 
 
 class GraphProblemBuilder:
@@ -25,17 +75,50 @@ class GraphProblemBuilder:
         """
         self.schema = schema
 
-    def build_problem(self, tool_registry: dict[str, Callable]) -> Any:
-        """Constructs a GEMSEO MDA from the parsed schema.
+    def build_problem(
+        self,
+        tool_registry: dict[str, Callable],
+        compile_plan: bool = True,
+        max_workers: int = 1,
+        reuse: dict[str, ToolComponent] | None = None,
+        mda_options: dict[str, Any] | None = None,
+    ) -> Any:
+        """Constructs an executable problem from the parsed schema.
+
+        The graph is compiled into an ``ExecutionPlan`` following the
+        condensation of its strongly connected components: every coupled
+        cluster gets its own inner MDA, and the other tools are called once,
+        sequentially.
 
         Args:
             tool_registry: Dictionary mapping tool names to Python functions.
+                Functions decorated with ``with_jacobian`` provide analytical
+                derivatives.
+            compile_plan: Whether to build the compiled plan (default True).
+                If False, an ``MDAChain`` is built instead.
+            max_workers: The number of threads the compiled plan uses to run
+                independent tools of a level concurrently (default 1).
+            reuse: Components of a previously built problem, by tool name.
+                Components whose function, Jacobian, inputs, outputs, cache
+                size and vectorization are unchanged are reused instead of
+                being rebuilt. The previous problem must not be executed
+                anymore.
+            mda_options: Default ``CoupledCluster`` settings (``solver``,
+                ``tolerance``, ``max_iter``, ``warm_start``) of the coupled
+                clusters, which tools override with their ``mda_*`` metadata.
 
         Returns:
-            An instantiated GEMSEO MDA Discipline object.
+            An object exposing ``execute(input_data)``: by default an
+            ``ExecutionPlan``, which is not a GEMSEO ``Discipline``, or with
+            ``compile_plan=False`` an instantiated GEMSEO ``MDAChain``.
+
+        Raises:
+            ValueError: If a tool is missing from the registry, or if the plan
+                is compiled and several tools output the same variable.
         """
         tools = self.schema.get("tools", [])
-        disciplines = []
+        tools_by_name = {tool["name"]: tool for tool in tools}
+        disciplines = {}
 
         # Add components
         for tool in tools:
@@ -48,15 +131,35 @@ class GraphProblemBuilder:
             inputs = tool.get("inputs", [])
             outputs = tool.get("outputs", [])
 
-            # Wrap the function in our custom GEMSEO Discipline
-            comp = ToolComponent(name=name, func=func, inputs=inputs, outputs=outputs)
-            disciplines.append(comp)
-
-        # Create an MDA (Multidisciplinary Design Analysis) to handle the coupling
-        # We use 'MDAChain' by default which can handle sequential execution
-        # and incorporates an 'MDAGaussSeidel' if cycles exist.
-        mda_factory = MDAFactory()
-        mda = mda_factory.create("MDAChain", disciplines=disciplines)
+            # Tools flagged `cacheable` in the graph memoize their outputs so
+            # that MDA iterations with unchanged local inputs skip the call.
+            cache_size = 0
+            if tool.get("cacheable"):
+                cache_size = int(tool.get("cache_size", DEFAULT_TOOL_CACHE_SIZE))
+
+            # Tools flagged `vectorized` take NumPy arrays of design points.
+            vectorized = bool(tool.get("vectorized", False))
+
+            comp = (reuse or {}).get(name)
+            if (
+                comp is None
+                or comp.func is not func
+                or comp.input_names != inputs
+                or comp.output_names != outputs
+                or comp.cache_size != cache_size
+                or comp.vectorized != vectorized
+                or comp.jacobian is not getattr(func, "jacobian", None)
+            ):
+                # Wrap the function in our custom GEMSEO Discipline
+                comp = ToolComponent(
+                    name=name,
+                    func=func,
+                    inputs=inputs,
+                    outputs=outputs,
+                    cache_size=cache_size,
+                    vectorized=vectorized,
+                )
+            disciplines[name] = comp
 
         # We can extract default values from schema and store them
         # to be used later in execution
@@ -67,8 +170,62 @@ class GraphProblemBuilder:
             if val is not None:
                 self.default_inputs[var["name"]] = np.atleast_1d(val)
 
+        if compile_plan:
+            analyzer = TopologicalAnalyzer(self.schema)
+            # Plan entries write into one flat mapping, where a second
+            # producer of a variable would silently overwrite the first.
+            for var_name, sources in analyzer.var_sources.items():
+                if len(sources) > 1:
+                    raise ValueError(
+                        f"Variable '{var_name}' is an output of several tools "
+                        f"({', '.join(sources)}); use compile_plan=False to "
+                        "build an MDAChain instead."
+                    )
+            levels = []
+            for level in analyzer.condensation():
+                levels.append(
+                    [
+                        CoupledCluster(
+                            [disciplines[name] for name in component],
+                            self.default_inputs,
+                            **cluster_mda_options(
+                                [tools_by_name[name] for name in component],
+                                mda_options,
+                            ),
+                        )
+                        if analyzer.is_coupled(component)
+                        else disciplines[component[0]]
+                        for component in level
+                    ]
+                )
+            return ExecutionPlan(levels, self.default_inputs, max_workers=max_workers)
+
+        # Create an MDA (Multidisciplinary Design Analysis) to handle the coupling
+        # We use 'MDAChain' by default which can handle sequential execution
+        # and incorporates an 'MDAGaussSeidel' if cycles exist.
+        mda_factory = MDAFactory()
+        mda = mda_factory.create("MDAChain", disciplines=list(disciplines.values()))
+
         for var_name, var_val in self.default_inputs.items():
             if var_name in mda.input_grammar:
                 mda.default_input_data[var_name] = var_val
 
         return mda
+
+
+def tool_components(problem: Any) -> dict[str, ToolComponent]:
+    """Collects the tool components of a built problem, by tool name.
+
+    Args:
+        problem: An ``ExecutionPlan`` or GEMSEO MDA returned by
+            ``GraphProblemBuilder.build_problem``.
+    """
+    components = {}
+    pending = list(getattr(problem, "disciplines", []))
+    while pending:
+        discipline = pending.pop()
+        if isinstance(discipline, ToolComponent):
+            components[discipline.name] = discipline
+        else:
+            pending.extend(getattr(discipline, "disciplines", []))
+    return components
@@ -5,9 +5,25 @@ file, You can obtain one at http://mozilla.org/MPL/2.0/.
 """
 
 import os
+import re
+import threading
 
 from falkordb import FalkorDB
 
+DEFAULT_GRAPH_NAME = "mdo_graph"
+_GRAPH_NAME_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def validate_graph_name(name: str) -> str:
+    """Returns ``name`` if it is a valid graph name.
+
+    Raises:
+        ValueError: If the name is not 1 to 64 letters, digits, "_" or "-".
+    """
+    if not isinstance(name, str) or not _GRAPH_NAME_PATTERN.fullmatch(name):
+        raise ValueError(f"Invalid graph name: {name!r}")
+    return name
+
 
 class FalkorDBClient:
     """Singleton class to manage the connection to the FalkorDB database."""
@@ -25,12 +41,30 @@ class FalkorDBClient:
         host = os.getenv("FALKORDB_HOST", "localhost")
         port = int(os.getenv("FALKORDB_PORT", 6379))
         self.client = FalkorDB(host=host, port=port)
-        self.graph_name = "mdo_graph"
+        self.graph_name = DEFAULT_GRAPH_NAME
         self.graph = self.client.select_graph(self.graph_name)
+        self._graphs = {self.graph_name: self.graph}
+        self._graphs_lock = threading.Lock()
+
+    def get_graph(self, graph_name: str | None = None):
+        """Returns the graph object for executing queries.
+
+        Handles are created once per graph name and reused afterwards.
+
+        Args:
+            graph_name: The name of the graph (defaults to "mdo_graph").
 
-    def get_graph(self):
-        """Returns the graph object for executing queries."""
-        return self.graph
+        Raises:
+            ValueError: If the graph name is invalid.
+        """
+        name = validate_graph_name(
+            self.graph_name if graph_name is None else graph_name
+        )
+        with self._graphs_lock:
+            graph = self._graphs.get(name)
+            if graph is None:
+                graph = self._graphs[name] = self.client.select_graph(name)
+            return graph
 
     def close(self):
         """Closes the connection."""
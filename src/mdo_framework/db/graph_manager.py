@@ -4,20 +4,61 @@ License, v. 2.0. If a copy of the MPL was not distributed with this
 file, You can obtain one at http://mozilla.org/MPL/2.0/.
 """
 
+import hashlib
+import json
+import threading
+import time
 from typing import Any
 
 from mdo_framework.db.client import FalkorDBClient
 
 
+def schema_digest(schema: dict[str, Any]) -> str:
+    """Returns the SHA-256 of the canonical (sorted keys) JSON of a schema."""
+    serialized = json.dumps(schema, sort_keys=True)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
 class GraphManager:
-    def __init__(self):
+    """Reads and writes the MDO graph stored in FalkorDB.
+
+    The schema returned by `get_graph_schema` is kept as an in-memory snapshot
+    that every write method of this manager invalidates, so repeated reads do
+    not query the database. Writes made by other processes are only seen
+    once the snapshot expires. The digest of the snapshot is computed once
+    and served by `get_schema_snapshot` until then.
+
+    Args:
+        graph_name: The name of the graph to work on (defaults to the
+            client's default graph).
+        snapshot_ttl: The lifetime of the schema snapshot in seconds. 0 keeps
+            it until the next write through this manager.
+    """
+
+    def __init__(self, graph_name: str | None = None, snapshot_ttl: float = 0.0):
         self.client = FalkorDBClient()
-        self.graph = self.client.get_graph()
+        self.graph = self.client.get_graph(graph_name)
+        self.graph_name = graph_name or self.client.graph_name
+        self.snapshot_ttl = snapshot_ttl
+        # Bumped by every invalidation, so that a read racing a write does
+        # not store a snapshot older than the write.
+        self.snapshot_version = 0
+        self._snapshot: dict[str, Any] | None = None
+        self._snapshot_digest = ""
+        self._snapshot_time = 0.0
+        self._snapshot_lock = threading.Lock()
+
+    def invalidate_snapshot(self):
+        """Drops the schema snapshot, so the next read queries the database."""
+        with self._snapshot_lock:
+            self._snapshot = None
+            self.snapshot_version += 1
 
     def clear_graph(self):
         """Clears the entire graph."""
         query = "MATCH (n) DETACH DELETE n"
         self.graph.query(query)
+        self.invalidate_snapshot()
 
     def add_node(self, kind: str, name: str, **kwargs: Any):
         """Adds a generic node to the graph.
@@ -45,6 +86,7 @@ class GraphManager:
             "        "
         )
         self.graph.query(query, params={"name": name, "props": props})
+        self.invalidate_snapshot()
 
     def add_variable(
         self,
@@ -127,6 +169,7 @@ class GraphManager:
             query,
             params={"tool_name": tool_name, "variable_name": variable_name},
         )
+        self.invalidate_snapshot()
 
     def connect_input_to_tool(self, variable_name: str, tool_name: str):
         """Connects an input variable to a tool (Variable -> Tool).
@@ -149,6 +192,94 @@ class GraphManager:
             query,
             params={"variable_name": variable_name, "tool_name": tool_name},
         )
+        self.invalidate_snapshot()
+
+    def import_schema(self, schema: dict[str, Any]) -> dict[str, int]:
+        """Writes a whole graph schema in a single batched query.
+
+        Variables and tools are merged on their name and their properties
+        updated, like `add_variable` and `add_tool`, then every connection is
+        merged. All rows are passed as parameters and expanded with `UNWIND`,
+        so the import costs one round trip and is applied atomically.
+        Connections to variables or tools that do not exist are skipped.
+
+        Args:
+            schema: A dictionary with 'variables' and 'tools' lists, in the
+                format returned by `get_graph_schema`. Tools may list the
+                names of their 'inputs' and 'outputs'.
+
+        Returns:
+            The number of variables, tools, inputs and outputs written.
+
+        Example:
+            ```python
+            gm.import_schema(
+                {
+                    "variables": [{"name": "x", "value": 1.0}, {"name": "y"}],
+                    "tools": [{"name": "Square", "inputs": ["x"], "outputs": ["y"]}],
+                }
+            )
+            ```
+
+        """
+        variables = []
+        for var in schema.get("variables", []):
+            props = {"param_type": "continuous", "value_type": "float", **var}
+            props = {k: v for k, v in props.items() if v is not None}
+            variables.append({"name": var["name"], "props": props})
+
+        tools, inputs, outputs = [], [], []
+        for tool in schema.get("tools", []):
+            props = {"fidelity": "high", **tool}
+            tool_inputs = props.pop("inputs", None) or []
+            tool_outputs = props.pop("outputs", None) or []
+            props = {k: v for k, v in props.items() if v is not None}
+            tools.append({"name": tool["name"], "props": props})
+            inputs.extend({"variable": v, "tool": tool["name"]} for v in tool_inputs)
+            outputs.extend({"tool": tool["name"], "variable": v} for v in tool_outputs)
+
+        # Each stage runs in its own unit subquery, whose count(*) without
+        # grouping keys always returns one row, so an empty stage cannot stop
+        # the ones after it.
+        query = """
+        CALL {
+            UNWIND $variables AS row
+            MERGE (v:Variable {name: row.name})
+            SET v += row.props
+            RETURN count(*) AS variables
+        }
+        CALL {
+            UNWIND $tools AS row
+            MERGE (t:Tool {name: row.name})
+            SET t += row.props
+            RETURN count(*) AS tools
+        }
+        CALL {
+            UNWIND $inputs AS edge
+            MATCH (v:Variable {name: edge.variable}), (t:Tool {name: edge.tool})
+            MERGE (v)-[:INPUTS_TO]->(t)
+            RETURN count(*) AS inputs
+        }
+        CALL {
+            UNWIND $outputs AS edge
+            MATCH (t:Tool {name: edge.tool}), (v:Variable {name: edge.variable})
+            MERGE (t)-[:OUTPUTS]->(v)
+            RETURN count(*) AS outputs
+        }
+        RETURN variables, tools, inputs, outputs
+        """
+        result = self.graph.query(
+            query,
+            params={
+                "variables": variables,
+                "tools": tools,
+                "inputs": inputs,
+                "outputs": outputs,
+            },
+        )
+        self.invalidate_snapshot()
+        counts = result.result_set[0]
+        return dict(zip(("variables", "tools", "inputs", "outputs"), counts))
 
     def get_tools(self) -> list[dict[str, Any]]:
         """Retrieves all tools."""
@@ -199,6 +330,9 @@ class GraphManager:
     def get_graph_schema(self) -> dict[str, Any]:
         """Returns a serializable dictionary representing the entire graph structure.
 
+        The result is served from the snapshot when it is still valid. It is
+        shared between callers and must not be modified.
+
         Returns:
             A dictionary containing 'tools' and 'variables' lists defining the topology.
 
@@ -209,6 +343,32 @@ class GraphManager:
             ```
 
         """
+        return self.get_schema_snapshot()[0]
+
+    def get_schema_snapshot(self) -> tuple[dict[str, Any], str]:
+        """Returns the schema with its `schema_digest`, e.g. for ETags.
+
+        Both come from the snapshot when it is still valid, so the digest is
+        computed once per snapshot rather than once per read.
+        """
+        with self._snapshot_lock:
+            if self._snapshot is not None and (
+                not self.snapshot_ttl
+                or time.monotonic() - self._snapshot_time <= self.snapshot_ttl
+            ):
+                return self._snapshot, self._snapshot_digest
+            version = self.snapshot_version
+
+        schema = self._read_graph_schema()
+        digest = schema_digest(schema)
+        with self._snapshot_lock:
+            if self.snapshot_version == version:
+                self._snapshot = schema
+                self._snapshot_digest = digest
+                self._snapshot_time = time.monotonic()
+        return schema, digest
+
+    def _read_graph_schema(self) -> dict[str, Any]:
         variables = self.get_variables()
 
         # Single query to get all tools with their inputs and outputs
@@ -228,9 +388,11 @@ class GraphManager:
             inputs = [name for name in r[1] if name is not None]
             outputs = [name for name in r[2] if name is not None]
 
+            # Extra tool metadata (e.g. `cacheable`, `cache_size`) is passed
+            # through so that problem builders can act on it.
             tools.append(
                 {
-                    "name": tool_node.properties["name"],
+                    **tool_node.properties,
                     "fidelity": tool_node.properties.get("fidelity", "high"),
                     "inputs": inputs,
                     "outputs": outputs,
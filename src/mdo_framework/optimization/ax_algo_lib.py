@@ -5,9 +5,21 @@ file, You can obtain one at http://mozilla.org/MPL/2.0/.
 """
 
 import logging
+import multiprocessing
+import pickle
 import traceback
 import warnings
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from contextlib import contextmanager
 from typing import Any, Literal, NamedTuple, TypedDict, cast
 
 import numpy as np
@@ -205,6 +217,43 @@ def _require_ax_settings(settings: BaseOptimizerSettings | None) -> "AxSettings"
     return settings
 
 
+# Start methods of trial worker processes. "fork" is excluded: forking the
+# multithreaded optimizer process (event loop, HTTP clients, torch pools) can
+# deadlock the children.
+TRIAL_START_METHODS = ("spawn", "forkserver")
+
+# Problem copy owned by a trial worker process.
+_WORKER_PROBLEM: OptimizationProblem | None = None
+
+
+def _init_trial_worker(payload: bytes) -> None:
+    """Keeps the worker's problem copy and detaches the parent's iteration hooks.
+
+    Args:
+        payload: The pickled problem.
+    """
+    global _WORKER_PROBLEM
+    problem = pickle.loads(payload)
+    problem.database.clear_listeners()
+    _WORKER_PROBLEM = problem
+
+
+def _evaluate_in_trial_worker(x: np.ndarray) -> dict[str, Any]:
+    """Evaluates a design vector on the worker's problem copy."""
+    if _WORKER_PROBLEM is None:
+        raise RuntimeError("Trial worker was started without a problem.")
+    out_dict, _ = _WORKER_PROBLEM.evaluate_functions(
+        x, design_vector_is_normalized=False
+    )
+    return out_dict
+
+
+def _evaluate_in_thread(problem: OptimizationProblem, x: np.ndarray) -> dict[str, Any]:
+    """Evaluates a design vector on the shared problem."""
+    out_dict, _ = problem.evaluate_functions(x, design_vector_is_normalized=False)
+    return out_dict
+
+
 class _ConfiguredClient(NamedTuple):
     """Bundles a configured Ax Client with derived optimization metadata."""
 
@@ -223,6 +272,10 @@ class AxSettings(BaseOptimizerSettings):
     ax_objectives: list[AxObjectiveDict] | None = None
     ax_parameter_constraints: list[str] | None = None
     normalize_design_space: bool = False
+    n_processes: int = 1
+    use_threading: bool = False
+    start_method: str | None = None
+    asynchronous: bool = False
 
 
 def build_from_ax_parameters(
@@ -617,6 +670,18 @@ class AxOptimizationLibrary(BaseOptimizationLibrary):
             client.mark_trial_abandoned(trial_index=trial_index)
             return False
 
+        self._complete_trial(client, trial_index, parameters, out_dict, metric_names)
+        return False
+
+    def _complete_trial(
+        self,
+        client: Client,
+        trial_index: int,
+        parameters: Mapping[str, Any],
+        out_dict: Mapping[str, Any],
+        metric_names: set[str],
+    ) -> None:
+        """Reports the evaluated metrics of a trial back to Ax."""
         res = {}
         for metric in metric_names:
             if metric in out_dict:
@@ -642,7 +707,7 @@ class AxOptimizationLibrary(BaseOptimizationLibrary):
                 trial_index,
             )
             client.mark_trial_abandoned(trial_index=trial_index)
-            return False
+            return
 
         client.complete_trial(trial_index=trial_index, raw_data=res)
         trial_parameters = dict(parameters)
@@ -652,8 +717,218 @@ class AxOptimizationLibrary(BaseOptimizationLibrary):
                 "objectives": dict(res),
             }
         )
+
+    @contextmanager
+    def _trial_executor(
+        self, problem: OptimizationProblem, settings: "AxSettings"
+    ) -> Iterator[Executor | None]:
+        """Yields the pool running batch trials, or None for serial execution.
+
+        Processes are started with ``settings.start_method`` (by default
+        "forkserver" where available, "spawn" otherwise) and get their
+        own copy of the problem, so the disciplines never run concurrently on
+        shared state; the problem must therefore be picklable. Threads share
+        the problem and therefore require thread-safe disciplines.
+
+        Raises:
+            ValueError: If the start method is not supported on this platform
+                or the problem cannot be sent to worker processes.
+        """
+        if settings.n_processes <= 1:
+            yield None
+            return
+
+        if settings.use_threading:
+            executor: Executor = ThreadPoolExecutor(max_workers=settings.n_processes)
+        else:
+            start_method = settings.start_method or (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+            if (
+                start_method not in TRIAL_START_METHODS
+                or start_method not in multiprocessing.get_all_start_methods()
+            ):
+                raise ValueError(
+                    f"Unsupported trial start method '{start_method}'; use one of "
+                    f"{', '.join(TRIAL_START_METHODS)} available on this platform, "
+                    "or set use_threading=True."
+                )
+            try:
+                payload = pickle.dumps(problem)
+            except Exception as e:
+                raise ValueError(
+                    "Process-based trial execution requires a picklable "
+                    "problem; set use_threading=True for this problem."
+                ) from e
+            context = multiprocessing.get_context(start_method)
+            if start_method == "forkserver":
+                # Workers fork from the single-threaded server, which imports
+                # the heavy optimization stack once instead of once per worker.
+                context.set_forkserver_preload([__name__])
+            executor = ProcessPoolExecutor(
+                max_workers=settings.n_processes,
+                mp_context=context,
+                initializer=_init_trial_worker,
+                initargs=(payload,),
+            )
+        with executor:
+            yield executor
+
+    def _submit_trial(
+        self,
+        executor: Executor,
+        problem: OptimizationProblem,
+        parameters: Mapping[str, Any],
+        normalize: bool = False,
+        ax_parameters: list[AxParameterDict] | None = None,
+    ) -> tuple[Future, np.ndarray]:
+        """Schedules the evaluation of one trial and returns its future and design vector."""
+        x = _build_design_vector(
+            parameters, problem.design_space, normalize, ax_parameters
+        )
+        if isinstance(executor, ProcessPoolExecutor):
+            return executor.submit(_evaluate_in_trial_worker, x), x
+        return executor.submit(_evaluate_in_thread, problem, x), x
+
+    def _finish_trial(
+        self,
+        future: Future,
+        client: Client,
+        problem: OptimizationProblem,
+        trial_index: int,
+        parameters: Mapping[str, Any],
+        x: np.ndarray,
+        metric_names: set[str],
+        normalize: bool = False,
+        store_in_database: bool = False,
+    ) -> bool:
+        """Reports a finished future to Ax.
+
+        Args:
+            store_in_database: Whether the result was computed outside this
+                process and must be stored in the problem database here.
+
+        Returns:
+            Whether the evaluation budget was exhausted.
+        """
+        try:
+            out_dict = future.result()
+            if store_in_database:
+                # Workers evaluate on their own copy, so the parent database
+                # (and its iteration counter) is updated here.
+                problem.database.store(
+                    problem.design_space.normalize_vect(x) if normalize else x,
+                    dict(out_dict),
+                )
+        except MaxIterReachedException:
+            client.mark_trial_abandoned(trial_index=trial_index)
+            return True
+        except _RECOVERABLE_EVAL_ERRORS as e:
+            logger.error("Failed to evaluate point: %s\n%s", e, traceback.format_exc())
+            client.mark_trial_abandoned(trial_index=trial_index)
+            return False
+
+        self._complete_trial(client, trial_index, parameters, out_dict, metric_names)
         return False
 
+    def _execute_trials_in_parallel(
+        self,
+        executor: Executor,
+        client: Client,
+        problem: OptimizationProblem,
+        trials: Mapping[int, Mapping[str, Any]],
+        metric_names: set[str],
+        normalize: bool = False,
+        ax_parameters: list[AxParameterDict] | None = None,
+    ) -> bool:
+        """Evaluates a batch of trials concurrently, completing each as it finishes.
+
+        Returns:
+            Whether the evaluation budget was exhausted.
+        """
+        futures: dict[Future, tuple[int, Mapping[str, Any], np.ndarray]] = {}
+        for trial_index, parameters in trials.items():
+            future, x = self._submit_trial(
+                executor, problem, parameters, normalize, ax_parameters
+            )
+            futures[future] = (trial_index, parameters, x)
+
+        budget_exhausted = False
+        for future in as_completed(futures):
+            trial_index, parameters, x = futures[future]
+            if self._finish_trial(
+                future,
+                client,
+                problem,
+                trial_index,
+                parameters,
+                x,
+                metric_names,
+                normalize,
+                store_in_database=isinstance(executor, ProcessPoolExecutor),
+            ):
+                budget_exhausted = True
+        return budget_exhausted
+
+    def _run_asynchronously(
+        self,
+        executor: Executor,
+        client: Client,
+        problem: OptimizationProblem,
+        metric_names: set[str],
+        n_workers: int,
+        max_trials: int,
+        normalize: bool = False,
+        ax_parameters: list[AxParameterDict] | None = None,
+    ) -> bool:
+        """Keeps up to ``n_workers`` trials in flight until ``max_trials`` are generated.
+
+        Whenever a trial finishes it is completed in the Ax client and a new
+        trial is generated straight away; Ax treats the trials still running
+        as pending points.
+
+        Returns:
+            Whether the evaluation budget was exhausted.
+        """
+        pending: dict[Future, tuple[int, Mapping[str, Any], np.ndarray]] = {}
+        n_generated = 0
+        budget_exhausted = False
+        while True:
+            free_slots = min(n_workers - len(pending), max_trials - n_generated)
+            if free_slots > 0 and not budget_exhausted:
+                trials = client.get_next_trials(max_trials=free_slots)
+                n_generated += len(trials)
+                for trial_index, parameters in trials.items():
+                    future, x = self._submit_trial(
+                        executor, problem, parameters, normalize, ax_parameters
+                    )
+                    pending[future] = (trial_index, parameters, x)
+                if not trials and not pending:
+                    self._record_last_point(problem, ax_parameters)
+                    break
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                trial_index, parameters, x = pending.pop(future)
+                if self._finish_trial(
+                    future,
+                    client,
+                    problem,
+                    trial_index,
+                    parameters,
+                    x,
+                    metric_names,
+                    normalize,
+                    store_in_database=isinstance(executor, ProcessPoolExecutor),
+                ):
+                    budget_exhausted = True
+        return budget_exhausted
+
     def _extract_best_solution(
         self,
         client: Client,
@@ -769,28 +1044,50 @@ class AxOptimizationLibrary(BaseOptimizationLibrary):
             c_names = {c.name for c in problem.constraints}
             metric_names = set(obj_names) | c_names
 
-            for _ in range(settings.max_iter):
-                if budget_exhausted:
-                    break
-                executed_trial = False
-                trials = configured.client.get_next_trials(
-                    max_trials=settings.batch_size
-                )
-                for trial_index, parameters in trials.items():
-                    executed_trial = True
-                    budget_exhausted = self._execute_trial(
+            with self._trial_executor(problem, settings) as executor:
+                if executor is not None and settings.asynchronous:
+                    budget_exhausted = self._run_asynchronously(
+                        executor,
                         configured.client,
                         problem,
-                        trial_index,
-                        parameters,
                         metric_names,
+                        n_workers=settings.n_processes,
+                        max_trials=settings.max_iter,
                         normalize=settings.normalize_design_space,
                         ax_parameters=settings.ax_parameters,
                     )
-                    if budget_exhausted:
-                        break
-                if not executed_trial:
-                    self._record_last_point(problem, settings.ax_parameters)
+                else:
+                    for _ in range(settings.max_iter):
+                        if budget_exhausted:
+                            break
+                        trials = configured.client.get_next_trials(
+                            max_trials=settings.batch_size
+                        )
+                        if not trials:
+                            self._record_last_point(problem, settings.ax_parameters)
+                        elif executor is not None and len(trials) > 1:
+                            budget_exhausted = self._execute_trials_in_parallel(
+                                executor,
+                                configured.client,
+                                problem,
+                                trials,
+                                metric_names,
+                                normalize=settings.normalize_design_space,
+                                ax_parameters=settings.ax_parameters,
+                            )
+                        else:
+                            for trial_index, parameters in trials.items():
+                                budget_exhausted = self._execute_trial(
+                                    configured.client,
+                                    problem,
+                                    trial_index,
+                                    parameters,
+                                    metric_names,
+                                    normalize=settings.normalize_design_space,
+                                    ax_parameters=settings.ax_parameters,
+                                )
+                                if budget_exhausted:
+                                    break
 
             self._extract_best_solution(
                 configured.client,
@@ -6,6 +6,7 @@ file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import logging
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Protocol, TypeAlias
 
 import httpx
@@ -198,6 +199,11 @@ class RemoteEvaluator:
 
     Args:
         service_url: The URL of the execution service.
+        client: An optional pre-configured HTTP client (not closed by ``close``).
+        timeout: The timeout used when the evaluator creates its own client.
+        max_concurrency: The maximum number of requests in flight at once
+            when ``evaluate_many`` pipelines single-point requests.
+        batch_size: The maximum number of points sent per batch request.
 
     """
 
@@ -206,41 +212,44 @@ class RemoteEvaluator:
         service_url: str,
         client: httpx.Client | None = None,
         timeout: httpx.Timeout | None = None,
+        max_concurrency: int = 8,
+        batch_size: int = 256,
     ):
+        if max_concurrency < 1 or batch_size < 1:
+            raise ValueError("max_concurrency and batch_size must be positive.")
         self.service_url = service_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        # None until the first evaluate_many call tells us whether the
+        # execution service exposes POST /evaluate/batch.
+        self._batch_supported: bool | None = None
         self._owns_client = client is None
         self.client = client or httpx.Client(
             base_url=self.service_url,
             timeout=timeout or httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
         )
 
     def close(self) -> None:
         if self._owns_client:
             self.client.close()
 
-    def evaluate(
-        self,
-        parameters: dict[str, Any],
-        objectives: list[str],
-    ) -> dict[str, float]:
-        payload = {
-            "inputs": parameters,
-            "objectives": objectives,
-        }
+    def _post_json(self, path: str, payload: dict[str, Any]) -> Any:
+        """Posts a payload and classifies failures as transport or contract errors."""
         try:
-            response = self.client.post(f"{self.service_url}/evaluate", json=payload)
+            response = self.client.post(f"{self.service_url}{path}", json=payload)
             response.raise_for_status()
         except httpx.TimeoutException as exc:
             raise RemoteEvaluationTransportError(
                 "Execution service request timed out."
             ) from exc
         except httpx.HTTPStatusError as exc:
-            if exc.response.status_code >= 500:
-                raise RemoteEvaluationTransportError(
-                    f"Execution service returned HTTP {exc.response.status_code}."
-                ) from exc
-            raise RemoteEvaluationContractError(
-                f"Execution service rejected the evaluation request with HTTP {exc.response.status_code}."
+            raise _classify_status(
+                exc.response.status_code,
+                f"Execution service rejected the evaluation request with HTTP {exc.response.status_code}.",
             ) from exc
         except httpx.RequestError as exc:
             raise RemoteEvaluationTransportError(
@@ -248,13 +257,14 @@ class RemoteEvaluator:
             ) from exc
 
         try:
-            data = response.json()
+            return response.json()
         except ValueError as exc:
             raise RemoteEvaluationContractError(
                 "Execution service returned invalid JSON."
             ) from exc
 
-        results = data.get("results")
+    @staticmethod
+    def _normalize_results(results: Any, objectives: list[str]) -> dict[str, float]:
         if not isinstance(results, dict):
             raise RemoteEvaluationContractError(
                 "Execution service response is missing a 'results' object."
@@ -278,6 +288,161 @@ class RemoteEvaluator:
                 ) from exc
         return normalized_results
 
+    def evaluate(
+        self,
+        parameters: dict[str, Any],
+        objectives: list[str],
+    ) -> dict[str, float]:
+        payload = {
+            "inputs": parameters,
+            "objectives": objectives,
+        }
+        data = self._post_json("/evaluate", payload)
+        results = data.get("results") if isinstance(data, dict) else None
+        return self._normalize_results(results, objectives)
+
+    def evaluate_many(
+        self,
+        parameters_list: list[dict[str, Any]],
+        objectives: list[str],
+        return_exceptions: bool = False,
+    ) -> list[dict[str, float] | Exception]:
+        """Evaluates many design points, keeping the execution service busy.
+
+        Points are sent through ``POST /evaluate/batch`` in chunks of
+        ``batch_size``. If the service does not expose that endpoint, the
+        evaluator remembers it and pipelines single-point requests instead,
+        with at most ``max_concurrency`` requests in flight.
+
+        Each point keeps the error classification of ``evaluate``: a
+        ``RemoteEvaluationTransportError`` or ``RemoteEvaluationContractError``.
+
+        Args:
+            parameters_list: The design points to evaluate.
+            objectives: The outputs requested for every point.
+            return_exceptions: Whether failed points are returned in place as
+                exception instances instead of raising the first failure.
+
+        Returns:
+            The normalized results, in the order of ``parameters_list``.
+        """
+        if not parameters_list:
+            return []
+
+        outcomes = None
+        if self._batch_supported is not False:
+            outcomes = self._evaluate_batched(parameters_list, objectives)
+        if outcomes is None:
+            outcomes = self._evaluate_pipelined(parameters_list, objectives)
+
+        if not return_exceptions:
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    raise outcome
+        return outcomes
+
+    def _evaluate_batched(
+        self,
+        parameters_list: list[dict[str, Any]],
+        objectives: list[str],
+    ) -> list[dict[str, float] | Exception] | None:
+        """Uses the batch endpoint; returns None if the service lacks it."""
+        outcomes: list[dict[str, float] | Exception] = []
+        for start in range(0, len(parameters_list), self.batch_size):
+            chunk = parameters_list[start : start + self.batch_size]
+            try:
+                data = self._post_json(
+                    "/evaluate/batch",
+                    {"points": chunk, "objectives": objectives},
+                )
+            except RemoteEvaluationContractError as exc:
+                if self._batch_supported is None and _is_missing_endpoint(exc):
+                    logger.info(
+                        "Execution service has no batch endpoint; "
+                        "pipelining single-point requests."
+                    )
+                    self._batch_supported = False
+                    return None
+                outcomes.extend(exc for _ in chunk)
+                continue
+            except RemoteEvaluationTransportError as exc:
+                outcomes.extend(exc for _ in chunk)
+                continue
+
+            self._batch_supported = True
+            entries = data.get("results") if isinstance(data, dict) else None
+            if not isinstance(entries, list) or len(entries) != len(chunk):
+                error = RemoteEvaluationContractError(
+                    "Execution service batch response does not match the request."
+                )
+                outcomes.extend(error for _ in chunk)
+                continue
+
+            for offset, entry in enumerate(entries):
+                outcomes.append(
+                    self._normalize_batch_entry(entry, objectives, start + offset)
+                )
+        return outcomes
+
+    def _normalize_batch_entry(
+        self,
+        entry: Any,
+        objectives: list[str],
+        index: int,
+    ) -> dict[str, float] | Exception:
+        if isinstance(entry, dict) and "error" in entry:
+            status_code = entry.get("status_code")
+            if not isinstance(status_code, int):
+                return RemoteEvaluationContractError(
+                    f"Execution service batch entry {index} has no status code."
+                )
+            return _classify_status(
+                status_code,
+                f"Execution service rejected point {index} with HTTP {status_code}: "
+                f"{entry['error']}",
+            )
+        try:
+            results = entry.get("results") if isinstance(entry, dict) else None
+            return self._normalize_results(results, objectives)
+        except RemoteEvaluationContractError as exc:
+            return exc
+
+    def _evaluate_pipelined(
+        self,
+        parameters_list: list[dict[str, Any]],
+        objectives: list[str],
+    ) -> list[dict[str, float] | Exception]:
+        def _evaluate_point(parameters: dict[str, Any]) -> dict[str, float] | Exception:
+            try:
+                return self.evaluate(parameters, objectives)
+            except (
+                RemoteEvaluationTransportError,
+                RemoteEvaluationContractError,
+            ) as exc:
+                return exc
+
+        n_workers = min(self.max_concurrency, len(parameters_list))
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            return list(executor.map(_evaluate_point, parameters_list))
+
+
+def _classify_status(
+    status_code: int, message: str
+) -> RemoteEvaluationTransportError | RemoteEvaluationContractError:
+    """Maps an execution-service status code to the matching error type."""
+    if status_code >= 500:
+        return RemoteEvaluationTransportError(
+            f"Execution service returned HTTP {status_code}."
+        )
+    return RemoteEvaluationContractError(message)
+
+
+def _is_missing_endpoint(exc: RemoteEvaluationContractError) -> bool:
+    cause = exc.__cause__
+    return isinstance(cause, httpx.HTTPStatusError) and (
+        cause.response.status_code in (404, 405)
+    )
+
 
 class RemoteDiscipline(Discipline):
     def __init__(
@@ -363,8 +528,11 @@ class BayesianOptimizer:
         ]
 
     def _build_discipline(self) -> Discipline:
-        if hasattr(self.evaluator, "problem"):
-            return self.evaluator.problem
+        # Compiled execution plans are not GEMSEO disciplines; they go through
+        # the evaluator like remote problems do.
+        problem = getattr(self.evaluator, "problem", None)
+        if isinstance(problem, Discipline):
+            return problem
         return RemoteDiscipline(
             self.evaluator,
             self.parameters,
@@ -455,8 +623,29 @@ class BayesianOptimizer:
             logger.error(f"Exploration failed: {e}")
             raise OptimizationExecutionError(f"Exploration failed: {str(e)}") from e
 
-    def optimize(self, n_steps: int = 5, n_init: int = 5) -> dict[str, Any]:
-        """Runs the optimization loop using GEMSEO MDOScenario."""
+    def optimize(
+        self,
+        n_steps: int = 5,
+        n_init: int = 5,
+        batch_size: int = 1,
+        n_processes: int = 1,
+        use_threading: bool = False,
+        asynchronous: bool = False,
+    ) -> dict[str, Any]:
+        """Runs the optimization loop using GEMSEO MDOScenario.
+
+        Args:
+            n_steps: Evaluation budget, passed to GEMSEO as ``max_iter``.
+            n_init: Number of initial Sobol trials.
+            batch_size: Number of trials requested from Ax per step.
+            n_processes: Number of trials of a batch evaluated concurrently.
+            use_threading: Whether to evaluate concurrent trials in threads
+                sharing the problem instead of worker processes, which need a
+                picklable problem.
+            asynchronous: Whether to keep ``n_processes`` trials in flight and
+                generate a new one as soon as any finishes, instead of
+                waiting for whole batches.
+        """
         if self.fidelity_parameter is not None:
             warnings.warn("fidelity_parameter is ignored.")
         discipline, design_space, objective_names = self._prepare_scenario_context()
@@ -486,6 +675,10 @@ class BayesianOptimizer:
                 problem,
                 max_iter=n_steps,
                 n_init=n_init,
+                batch_size=batch_size,
+                n_processes=n_processes,
+                use_threading=use_threading,
+                asynchronous=asynchronous,
                 use_bonsai=self.use_bonsai,
                 ax_parameters=self.parameters,
                 ax_objectives=self.objectives,
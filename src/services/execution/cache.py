@@ -0,0 +1,325 @@
+"""
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this
+file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Protocol, TypeVar
+
+T = TypeVar("T")
+
+
+def _canonical(value: Any) -> Any:
+    """Normalizes numbers to floats, so that ``1`` and ``1.0`` hash alike."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int | float):
+        return float(value)
+    if isinstance(value, list | tuple):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+    return value
+
+
+def evaluation_key(
+    schema_hash: str,
+    inputs: dict[str, Any],
+    objectives: list[str],
+    namespace: str = "",
+) -> str:
+    """Builds a content-addressed key for one evaluation.
+
+    Inputs and objectives are canonicalized (sorted keys, numbers as floats,
+    sorted objective names) so that equivalent requests map to the same key.
+
+    Args:
+        schema_hash: The hash of the schema the evaluation runs against.
+        inputs: The design point.
+        objectives: The requested outputs.
+        namespace: An optional prefix, e.g. a tool-registry version.
+    """
+    canonical = json.dumps(
+        [namespace, schema_hash, _canonical(inputs), sorted(objectives)],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> dict[str, float] | None:
+        """Returns the cached results, or None on a miss or expired entry."""
+        ...
+
+    def set(self, key: str, results: dict[str, float]) -> None:
+        """Stores results, evicting old entries if the backend is full."""
+        ...
+
+    def __len__(self) -> int: ...
+
+    def close(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with optional TTL.
+
+    Args:
+        max_entries: The maximum number of entries kept.
+        ttl: The lifetime of an entry in seconds (0 disables expiry).
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 0.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict[str, float]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict[str, float] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created, results = entry
+            if self.ttl and time.time() - created > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(results)
+
+    def set(self, key: str, results: dict[str, float]) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), dict(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """On-disk LRU cache stored in a SQLite file, surviving service restarts.
+
+    Lookups only read the database: access times and expired entries are
+    kept in memory and written with the next ``set`` (or every
+    ``flush_every`` lookups), so that cache hits do not each pay a commit.
+
+    Args:
+        path: The SQLite database file.
+        max_entries: The maximum number of entries kept.
+        ttl: The lifetime of an entry in seconds (0 disables expiry).
+        flush_every: The number of buffered lookups that triggers a write.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 100000,
+        ttl: float = 0.0,
+        flush_every: int = 1024,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        # Buffered writes of lookups: access times and expired keys (None)
+        self._pending: dict[str, float | None] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            "key TEXT PRIMARY KEY, results TEXT NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS evaluations_accessed ON evaluations (accessed)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> dict[str, float] | None:
+        now = time.time()
+        with self._lock:
+            if key in self._pending and self._pending[key] is None:
+                return None
+            row = self._conn.execute(
+                "SELECT results, created FROM evaluations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            results, created = row
+            expired = bool(self.ttl) and now - created > self.ttl
+            self._pending[key] = None if expired else now
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+        return None if expired else json.loads(results)
+
+    def set(self, key: str, results: dict[str, float]) -> None:
+        now = time.time()
+        with self._lock:
+            self._pending.pop(key, None)
+            self._write_pending()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?)",
+                (key, json.dumps(results), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM evaluations WHERE key IN ("
+                "SELECT key FROM evaluations ORDER BY accessed DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def _write_pending(self) -> bool:
+        """Applies the buffered lookups, without committing.
+
+        Returns:
+            Whether anything was written.
+        """
+        if not self._pending:
+            return False
+        self._conn.executemany(
+            "UPDATE evaluations SET accessed = ? WHERE key = ?",
+            [(t, k) for k, t in self._pending.items() if t is not None],
+        )
+        self._conn.executemany(
+            "DELETE FROM evaluations WHERE key = ?",
+            [(k,) for k, t in self._pending.items() if t is None],
+        )
+        self._pending.clear()
+        return True
+
+    def _flush(self) -> None:
+        if self._write_pending():
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._flush()
+            return self._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+
+class EvaluationCache:
+    """Counts hits and misses in front of a pluggable cache backend.
+
+    Args:
+        backend: The storage backend.
+        namespace: A prefix mixed into every key, e.g. a tool-registry
+            version, so that results from other tool code are never reused.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str = ""):
+        self.backend = backend
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def key(
+        self, schema_hash: str, inputs: dict[str, Any], objectives: list[str]
+    ) -> str:
+        return evaluation_key(schema_hash, inputs, objectives, self.namespace)
+
+    def get(self, key: str) -> dict[str, float] | None:
+        results = self.backend.get(key)
+        if results is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return results
+
+    def set(self, key: str, results: dict[str, float]) -> None:
+        self.backend.set(key, results)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls sharing a key into one in-flight call.
+
+    The first caller for a key starts the call; callers arriving while it runs
+    wait for it and share its result or exception. The call is shielded, so a
+    cancelled caller does not cancel it for the others. Must be used from a
+    single event loop.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        call = self._calls.get(key)
+        if call is not None:
+            self.coalesced += 1
+            return await asyncio.shield(call)
+
+        call = asyncio.ensure_future(func())
+        self._calls[key] = call
+
+        def _done(finished: asyncio.Future) -> None:
+            if self._calls.get(key) is finished:
+                del self._calls[key]
+            # Retrieve the exception in case every caller was cancelled.
+            if not finished.cancelled():
+                finished.exception()
+
+        call.add_done_callback(_done)
+        return await asyncio.shield(call)
+
+
+def build_evaluation_cache(
+    backend: str,
+    max_entries: int,
+    ttl: float,
+    path: str = "evaluation_cache.sqlite",
+    namespace: str = "",
+) -> EvaluationCache | None:
+    """Creates the cache selected by configuration, or None when disabled.
+
+    Args:
+        backend: One of "none", "memory" or "sqlite".
+        max_entries: The maximum number of entries kept.
+        ttl: The lifetime of an entry in seconds (0 disables expiry).
+        path: The database file of the "sqlite" backend.
+        namespace: A prefix mixed into every key.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return EvaluationCache(MemoryCacheBackend(max_entries, ttl), namespace)
+    if backend == "sqlite":
+        return EvaluationCache(SQLiteCacheBackend(path, max_entries, ttl), namespace)
+    raise ValueError(f"Unknown evaluation cache backend: {backend}")
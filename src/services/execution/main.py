@@ -10,17 +10,34 @@ import json
 import logging
 import os
 import time
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
 from typing import Any, TypeAlias
 
 import httpx
 import numpy as np
-from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, field_validator
 
-from mdo_framework.core.translator import GraphProblemBuilder
+from mdo_framework.core.plan import MDA_SOLVERS
+from mdo_framework.core.schema_codec import COMPACT_SCHEMA_MEDIA_TYPE, decode_schema
+from mdo_framework.core.topology import TopologicalAnalyzer
+from mdo_framework.core.translator import GraphProblemBuilder, tool_components
+from mdo_framework.db.client import DEFAULT_GRAPH_NAME
+from services.execution.cache import (
+    EvaluationCache,
+    SingleFlight,
+    build_evaluation_cache,
+    evaluation_key,
+)
+from services.execution.workers import ProcessProblem
+from services.graph_selection import (
+    GRAPH_PATH_PREFIX,
+    get_graph_name,
+    graph_scoped_url,
+)
 
 # Configure logging
 logger = logging.getLogger("uvicorn.error")
@@ -35,18 +52,100 @@ try:
     CACHE_TTL = float(os.getenv("CACHE_TTL", "60.0"))
     CACHE_BACKOFF = float(os.getenv("CACHE_BACKOFF", "15.0"))
     POOL_SIZE = int(os.getenv("PROBLEM_POOL_SIZE", "5"))
+    POOL_MAX_SIZE = int(os.getenv("PROBLEM_POOL_MAX_SIZE", str(4 * POOL_SIZE)))
+    POOL_IDLE_TIMEOUT = float(os.getenv("POOL_IDLE_TIMEOUT", "300.0"))
+    POOL_GROW_AFTER = float(os.getenv("POOL_GROW_AFTER", "0.1"))
+    POOL_MAX_SUBGRAPHS = int(os.getenv("PROBLEM_POOL_MAX_SUBGRAPHS", "8"))
     POOL_ACQUIRE_TIMEOUT = float(os.getenv("POOL_ACQUIRE_TIMEOUT", "5.0"))
+    BATCH_MAX_POINTS = int(os.getenv("BATCH_MAX_POINTS", "5000"))
+    PLAN_MAX_WORKERS = int(os.getenv("PLAN_MAX_WORKERS", "1"))
+    EVAL_CACHE_MAX_ENTRIES = int(os.getenv("EVAL_CACHE_MAX_ENTRIES", "10000"))
+    EVAL_CACHE_TTL = float(os.getenv("EVAL_CACHE_TTL", "0"))
+    SCHEMA_EVENTS_TIMEOUT = float(os.getenv("SCHEMA_EVENTS_TIMEOUT", "60.0"))
+    MAX_GRAPHS = int(os.getenv("EXECUTION_MAX_GRAPHS", "16"))
+    MDA_TOLERANCE = float(os.getenv("MDA_TOLERANCE", "1e-6"))
+    MDA_MAX_ITER = int(os.getenv("MDA_MAX_ITER", "20"))
 except ValueError as e:
     logger.error("Failed to parse configuration.", exc_info=True)
     raise ValueError(
-        "CACHE_TTL, CACHE_BACKOFF, PROBLEM_POOL_SIZE, and POOL_ACQUIRE_TIMEOUT must be numeric.",
+        "CACHE_TTL, CACHE_BACKOFF, PROBLEM_POOL_SIZE, PROBLEM_POOL_MAX_SIZE, "
+        "PROBLEM_POOL_MAX_SUBGRAPHS, POOL_ACQUIRE_TIMEOUT, POOL_IDLE_TIMEOUT, "
+        "POOL_GROW_AFTER, BATCH_MAX_POINTS, PLAN_MAX_WORKERS, "
+        "EVAL_CACHE_MAX_ENTRIES, EVAL_CACHE_TTL, SCHEMA_EVENTS_TIMEOUT, "
+        "EXECUTION_MAX_GRAPHS, MDA_TOLERANCE, and MDA_MAX_ITER must be numeric.",
     ) from e
 
 if POOL_SIZE <= 0:
     raise ValueError("PROBLEM_POOL_SIZE must be a positive integer.")
-if CACHE_TTL <= 0 or CACHE_BACKOFF <= 0 or POOL_ACQUIRE_TIMEOUT <= 0:
+if POOL_MAX_SIZE < POOL_SIZE:
+    raise ValueError("PROBLEM_POOL_MAX_SIZE must not be below PROBLEM_POOL_SIZE.")
+if POOL_IDLE_TIMEOUT <= 0 or POOL_GROW_AFTER < 0:
+    raise ValueError(
+        "POOL_IDLE_TIMEOUT must be positive and POOL_GROW_AFTER not negative."
+    )
+if POOL_MAX_SUBGRAPHS <= 0:
+    raise ValueError("PROBLEM_POOL_MAX_SUBGRAPHS must be a positive integer.")
+if MAX_GRAPHS <= 0:
+    raise ValueError("EXECUTION_MAX_GRAPHS must be a positive integer.")
+if BATCH_MAX_POINTS <= 0:
+    raise ValueError("BATCH_MAX_POINTS must be a positive integer.")
+if PLAN_MAX_WORKERS <= 0:
+    raise ValueError("PLAN_MAX_WORKERS must be a positive integer.")
+if EVAL_CACHE_MAX_ENTRIES <= 0:
+    raise ValueError("EVAL_CACHE_MAX_ENTRIES must be a positive integer.")
+if EVAL_CACHE_TTL < 0:
+    raise ValueError("EVAL_CACHE_TTL must not be negative.")
+if MDA_TOLERANCE <= 0 or MDA_MAX_ITER <= 0:
+    raise ValueError("MDA_TOLERANCE and MDA_MAX_ITER must be positive.")
+if (
+    CACHE_TTL <= 0
+    or CACHE_BACKOFF <= 0
+    or POOL_ACQUIRE_TIMEOUT <= 0
+    or SCHEMA_EVENTS_TIMEOUT <= 0
+):
     raise ValueError("Timeout and TTL values must be positive.")
 
+# "none", "memory" (per process) or "sqlite" (persistent across restarts).
+EVAL_CACHE_BACKEND = os.getenv("EVAL_CACHE_BACKEND", "memory")
+EVAL_CACHE_PATH = os.getenv("EVAL_CACHE_PATH", "evaluation_cache.sqlite")
+# Bump when tool implementations change so persisted results are not reused.
+EVAL_CACHE_NAMESPACE = os.getenv("EVAL_CACHE_NAMESPACE", "")
+
+# Objective sets pre-warmed at startup besides the full schema, e.g. "f;g,h".
+POOL_PREWARM_OBJECTIVES = [
+    [name.strip() for name in group.split(",") if name.strip()]
+    for group in os.getenv("POOL_PREWARM_OBJECTIVES", "").split(";")
+    if group.strip()
+]
+
+# Subscribe to the Graph Service's schema change stream, refreshing the cached
+# schema as soon as it changes instead of waiting for CACHE_TTL to expire.
+# SCHEMA_EVENTS_TIMEOUT must exceed the Graph Service's keepalive interval.
+SCHEMA_EVENTS = os.getenv("SCHEMA_EVENTS", "true").lower() in ("1", "true", "yes")
+
+# "thread" keeps problem instances in this process; "process" gives each
+# pooled instance its own worker process so CPU-bound tools use every core.
+EXECUTION_BACKEND = os.getenv("EXECUTION_BACKEND", "thread")
+EXECUTION_START_METHOD = os.getenv("EXECUTION_START_METHOD", "spawn")
+if EXECUTION_BACKEND not in ("thread", "process"):
+    raise ValueError("EXECUTION_BACKEND must be 'thread' or 'process'.")
+
+# Default inner MDA of coupled clusters; tools override it with `mda_*` metadata.
+MDA_SOLVER = os.getenv("MDA_SOLVER", "gauss_seidel")
+if MDA_SOLVER not in MDA_SOLVERS:
+    raise ValueError(f"MDA_SOLVER must be one of: {', '.join(MDA_SOLVERS)}.")
+MDA_OPTIONS = {
+    "solver": MDA_SOLVER,
+    "tolerance": MDA_TOLERANCE,
+    "max_iter": MDA_MAX_ITER,
+    "warm_start": os.getenv("MDA_WARM_START", "false").lower() in ("1", "true", "yes"),
+}
+
+
+# The compact schema encoding is smaller and faster to parse; plain JSON
+# remains acceptable for Graph Services that do not offer it.
+SCHEMA_ACCEPT = f"{COMPACT_SCHEMA_MEDIA_TYPE}, application/json;q=0.9"
+
 
 # --- Helper Functions ---
 def paraboloid_func(x: float, y: float) -> float:
@@ -57,9 +156,31 @@ def paraboloid_func(x: float, y: float) -> float:
 def build_and_init(
     schema: dict[str, Any],
     registry: dict[str, Callable[..., Any]],
+    donor: Any = None,
 ) -> Any:
-    """Instantiates builder and creates problem in a worker thread."""
-    return GraphProblemBuilder(schema).build_problem(registry)
+    """Instantiates builder and creates problem in a worker thread.
+
+    Tool components of ``donor``, a retired problem instance, are reused when
+    their tool definition did not change. With the "process" backend the
+    problem lives in a worker process, and a donor's worker is rebuilt in
+    place.
+    """
+    if EXECUTION_BACKEND == "process":
+        if isinstance(donor, ProcessProblem):
+            return ProcessProblem.rebuild_from(donor, schema)
+        return ProcessProblem(
+            schema,
+            registry,
+            max_workers=PLAN_MAX_WORKERS,
+            start_method=EXECUTION_START_METHOD,
+            mda_options=MDA_OPTIONS,
+        )
+    return GraphProblemBuilder(schema).build_problem(
+        registry,
+        max_workers=PLAN_MAX_WORKERS,
+        reuse=tool_components(donor) if donor is not None else None,
+        mda_options=MDA_OPTIONS,
+    )
 
 
 def execute_problem(
@@ -70,12 +191,42 @@ def execute_problem(
     import numpy as np
 
     input_data = {name: np.atleast_1d(val) for name, val in inputs.items()}
-    out_data = prob.execute(input_data)
+    if isinstance(prob, ProcessProblem):
+        # Only the objectives cross the process boundary.
+        out_data = prob.execute(input_data, objectives)
+    else:
+        out_data = prob.execute(input_data)
     return {
         obj: 0.0 if (val := out_data.get(obj)) is None else val for obj in objectives
     }
 
 
+def execute_problem_batch(
+    prob,
+    points: list[dict[str, bool | int | float | str]],
+    objectives: list[str],
+) -> list[dict[str, Any]]:
+    """Runs many design points in one pass of a compiled plan.
+
+    Returns:
+        The objective values of every point, in order.
+    """
+    input_data = [
+        {name: np.atleast_1d(val) for name, val in inputs.items()} for inputs in points
+    ]
+    if isinstance(prob, ProcessProblem):
+        out_data = prob.execute_batch(input_data, objectives)
+    else:
+        out_data = prob.execute_batch(input_data)
+    return [
+        {
+            obj: 0.0 if (val := out_data.get(obj)) is None else val[i]
+            for obj in objectives
+        }
+        for i in range(len(points))
+    ]
+
+
 def to_float(val: Any) -> float:
     """Convert result to float. Raises IndexError if val is empty, TypeError if unconvertible."""
     if isinstance(val, (float, int)):
@@ -91,9 +242,17 @@ InputScalar: TypeAlias = bool | int | float | str
 
 # --- Domain Models ---
 class SchemaEnvelope:
-    """Wraps raw schema data with pre-parsed metadata and hashing."""
+    """Wraps raw schema data with pre-parsed metadata and hashing.
 
-    def __init__(self, raw_data: dict[str, Any]):
+    Args:
+        raw_data: The schema returned by the Graph Service, plain or in the
+            compact encoding. Both give the same ``hash``.
+        source_hash: The hash of the full schema a pruned envelope was
+            derived from (defaults to the envelope's own hash).
+    """
+
+    def __init__(self, raw_data: dict[str, Any], source_hash: str | None = None):
+        raw_data = decode_schema(raw_data)
         self.data = raw_data
         try:
             variables = raw_data.get("variables", [])
@@ -106,6 +265,10 @@ class SchemaEnvelope:
                         self.known_objectives.add(out["name"])
                     else:
                         self.known_objectives.add(str(out))
+            # Batches of a schema whose tools all take NumPy arrays of design
+            # points run in a single vectorized pass.
+            tools = raw_data.get("tools", [])
+            self.vectorized = bool(tools) and all(t.get("vectorized") for t in tools)
         except (KeyError, TypeError) as e:
             logger.error("Failed to parse schema structure.", exc_info=True)
             raise ValueError("Schema format is invalid.") from e
@@ -114,20 +277,81 @@ class SchemaEnvelope:
         # Note: In production, consider using a faster/more stable serializer like orjson
         serialized = json.dumps(raw_data, sort_keys=True)
         self.hash = hashlib.sha256(serialized.encode()).hexdigest()
+        self.source_hash = source_hash or self.hash
+        # The objective set a pruned envelope was built for (None: full schema)
+        self.objectives: frozenset[str] | None = None
+        self._pruned: dict[frozenset[str], SchemaEnvelope] = {}
+        # Shared by all objective sets, so upstream closures are memoized
+        self._analyzer: TopologicalAnalyzer | None = None
+
+    def pruned(self, objectives: list[str]) -> "SchemaEnvelope":
+        """Returns the sub-schema holding only the tools needed for ``objectives``.
+
+        Sub-schemas are memoized per objective set for the lifetime of the
+        envelope. Tools keep their schema order, so objective sets needing the
+        same tools share one hash (and one pool).
+        """
+        key = frozenset(objectives)
+        sub = self._pruned.get(key)
+        if sub is not None:
+            return sub
+
+        try:
+            if self._analyzer is None:
+                self._analyzer = TopologicalAnalyzer(self.data)
+            _, required = self._analyzer.resolve_dependencies(sorted(key))
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Schema pruning failed, using the full schema.")
+            sub = self
+        else:
+            required_names = {tool["name"] for tool in required}
+            tools = [
+                t for t in self.data.get("tools", []) if t["name"] in required_names
+            ]
+            used = {
+                name
+                for tool in tools
+                for name in (*tool.get("inputs", []), *tool.get("outputs", []))
+            }
+            sub = SchemaEnvelope(
+                {
+                    "tools": tools,
+                    "variables": [
+                        v for v in self.data.get("variables", []) if v["name"] in used
+                    ],
+                },
+                source_hash=self.source_hash,
+            )
+            sub.objectives = key
+        self._pruned[key] = sub
+        return sub
 
 
 # --- Providers ---
 
 
 class SchemaProvider:
-    """Manages schema fetching and caching from the Graph Service."""
+    """Manages schema fetching and caching from the Graph Service.
+
+    Args:
+        client: The HTTP client used to reach the Graph Service.
+        graph_name: The graph whose schema is provided.
+    """
 
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(self, client: httpx.AsyncClient, graph_name: str = DEFAULT_GRAPH_NAME):
         self.client = client
+        self.graph_name = graph_name
         self.envelope: SchemaEnvelope | None = None
+        # The Graph Service's ETag for ``envelope``, sent back to revalidate.
+        self.etag: str | None = None
         self.expiry: float = 0.0
         self.lock = asyncio.Lock()
 
+    @property
+    def graph_url(self) -> str:
+        """The Graph Service URL serving this provider's graph."""
+        return graph_scoped_url(GRAPH_SERVICE_URL, self.graph_name)
+
     async def get_schema(self) -> SchemaEnvelope:
         current_time = time.time()
         if self.envelope and current_time <= self.expiry:
@@ -154,9 +378,24 @@ class SchemaProvider:
                 return self.envelope
 
             try:
-                resp = await self.client.get(f"{GRAPH_SERVICE_URL}/schema")
+                headers = {"Accept": SCHEMA_ACCEPT}
+                if self.envelope is not None and self.etag:
+                    headers["If-None-Match"] = self.etag
+                resp = await self.client.get(
+                    f"{self.graph_url}/schema", headers=headers
+                )
+                if resp.status_code == 304 and self.envelope is not None:
+                    # Unchanged: no download, parsing or rehashing.
+                    self.expiry = current_time + CACHE_TTL
+                    return self.envelope
                 resp.raise_for_status()
-                self.envelope = SchemaEnvelope(resp.json())
+                envelope = SchemaEnvelope(resp.json())
+                # Keep the current envelope (and its pruned sub-schemas) when
+                # the schema did not change.
+                if self.envelope is None or envelope.hash != self.envelope.hash:
+                    self.envelope = envelope
+                etag = resp.headers.get("ETag")
+                self.etag = etag if isinstance(etag, str) else None
                 self.expiry = current_time + CACHE_TTL
             except (httpx.RequestError, httpx.HTTPStatusError):
                 if self.envelope is not None:
@@ -189,17 +428,176 @@ class SchemaProvider:
 
         return self.envelope
 
+    def invalidate(self) -> None:
+        """Makes the next ``get_schema`` call revalidate with the Graph Service."""
+        self.expiry = 0.0
 
-class ProblemPool:
-    """Manages a pool of GEMSEO OptimizationProblem instances for a given schema."""
+    async def listen(
+        self,
+        on_change: Callable[[SchemaEnvelope], Awaitable[None]] | None = None,
+    ) -> None:
+        """Refreshes the schema on each Graph Service event until the stream ends.
+
+        The stream opens with a ``hello`` event, so a (re)connection also
+        refreshes whatever changed while disconnected. ``on_change`` is
+        awaited with the new envelope whenever the schema hash changed.
+        """
+        async with self.client.stream(
+            "GET",
+            f"{self.graph_url}/schema/events",
+            # The Graph Service sends keepalives, so a silent stream is dead.
+            timeout=httpx.Timeout(5.0, read=SCHEMA_EVENTS_TIMEOUT),
+        ) as resp:
+            resp.raise_for_status()
+            event = None
+            async for line in resp.aiter_lines():
+                if line.startswith("event:"):
+                    event = line.removeprefix("event:").strip()
+                elif not line and event is not None:
+                    event = None
+                    previous = self.envelope
+                    self.invalidate()
+                    envelope = await self.get_schema()
+                    if envelope is not previous and on_change is not None:
+                        await on_change(envelope)
+
+    async def watch(
+        self,
+        on_change: Callable[[SchemaEnvelope], Awaitable[None]] | None = None,
+    ) -> None:
+        """Listens to schema events forever, reconnecting after failures."""
+        while True:
+            try:
+                await self.listen(on_change)
+            except (httpx.HTTPError, HTTPException):
+                logger.warning(
+                    "Schema event stream interrupted, reconnecting.", exc_info=True
+                )
+            await asyncio.sleep(CACHE_BACKOFF)
+
+
+class InstancePool(asyncio.LifoQueue):
+    """Idle problem instances of one schema.
+
+    The most recently released instance is handed out first, so surplus
+    instances stay at the bottom and can be reaped once they idle too long.
+
+    Args:
+        source_hash: The hash of the full schema the instances were built from.
+    """
+
+    def __init__(self, source_hash: str | None = None):
+        super().__init__()
+        self.source_hash = source_hash
+        # Instances owned by this pool: idle, checked out or being built.
+        self.size = 0
+
+    def _init(self, maxsize: int) -> None:
+        super()._init(maxsize)
+        self._idle_since: list[float] = []
+
+    def _put(self, item: Any) -> None:
+        super()._put(item)
+        self._idle_since.append(time.monotonic())
+
+    def _get(self) -> Any:
+        self._idle_since.pop()
+        return super()._get()
 
-    def __init__(self, registry: ToolRegistry, size: int = POOL_SIZE):
+    def reap(self, idle_timeout: float, keep: int) -> list[Any]:
+        """Removes instances idle for longer than ``idle_timeout`` seconds.
+
+        Args:
+            idle_timeout: The idle period after which an instance is removed.
+            keep: The number of owned instances never reaped below.
+
+        Returns:
+            The removed instances, which the caller must clean up.
+        """
+        reaped = []
+        now = time.monotonic()
+        while (
+            self._idle_since
+            and self.size > keep
+            and now - self._idle_since[0] > idle_timeout
+        ):
+            self._idle_since.pop(0)
+            reaped.append(self._queue.pop(0))
+            self.size -= 1
+        return reaped
+
+
+class ProblemPool:
+    """Manages pools of problem instances for the current schema.
+
+    Instances are pooled per (pruned) schema envelope, so requests for
+    different objective sets get problems holding only the tools they need.
+    At most ``max_subgraphs`` envelopes are kept; the least recently used one
+    is dropped first.
+
+    Each pool is elastic: it starts with ``size`` instances, grows by one
+    instance whenever a request waits more than ``grow_after`` seconds (up to
+    ``max_size``), and instances idle for more than ``idle_timeout`` seconds
+    are reaped back down to ``size`` by ``reap_idle``.
+
+    When the schema of an objective set changes, the new pool is built in the
+    background (blue/green): requests keep being served by the previous pool
+    until the new one is ready, and idle previous instances donate their
+    unchanged tool components to the new ones. Requests for an objective set
+    without any pool yet are served by the full-schema pool, if one was
+    pre-warmed, while their pruned pool builds.
+    """
+
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        size: int = POOL_SIZE,
+        max_subgraphs: int = POOL_MAX_SUBGRAPHS,
+        max_size: int | None = None,
+        idle_timeout: float = POOL_IDLE_TIMEOUT,
+        grow_after: float = POOL_GROW_AFTER,
+    ):
         self.registry = registry
         self.size = size
-        self.pool = asyncio.Queue()
-        self.current_hash: str | None = None
+        self.max_size = max(size, POOL_MAX_SIZE if max_size is None else max_size)
+        self.idle_timeout = idle_timeout
+        self.grow_after = grow_after
+        self.max_subgraphs = max_subgraphs
+        self.pools: OrderedDict[str, InstancePool] = OrderedDict()
         self.lock = asyncio.Lock()
         self._background_tasks: set[asyncio.Task] = set()
+        # Latest pool hash per objective set, used to find the pool to keep
+        # serving while its successor builds.
+        self._lineage: dict[frozenset[str] | None, str] = {}
+        self._builds: dict[str, asyncio.Task] = {}
+
+    def start(self) -> None:
+        """Starts reaping idle instances in the background."""
+        self._spawn(self._reap_periodically())
+
+    async def _reap_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 2))
+            await self.reap_idle()
+
+    async def reap_idle(self) -> None:
+        """Cleans up instances idle for longer than ``idle_timeout``."""
+        async with self.lock:
+            reaped = [
+                inst
+                for pool in self.pools.values()
+                for inst in pool.reap(self.idle_timeout, keep=self.size)
+            ]
+        if reaped:
+            logger.info(f"Reaped {len(reaped)} idle problem instances.")
+        for inst in reaped:
+            if hasattr(inst, "cleanup"):
+                await asyncio.to_thread(inst.cleanup)
+
+    async def prewarm(self, envelope: SchemaEnvelope) -> None:
+        """Builds the pool for ``envelope`` ahead of the first request."""
+        inst, inst_hash = await self.get_instance(envelope)
+        await self.release_instance(inst, inst_hash)
 
     async def teardown(self):
         """Drain and clean up all pool instances.
@@ -212,101 +610,372 @@ class ProblemPool:
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
 
-        while not self.pool.empty():
+        self._lineage.clear()
+        while self.pools:
+            _, pool = self.pools.popitem(last=False)
+            await self._drain(pool)
+
+    async def _drain(self, pool: InstancePool) -> None:
+        while not pool.empty():
             try:
-                inst = self.pool.get_nowait()
+                inst = pool.get_nowait()
+                pool.size -= 1
                 if hasattr(inst, "cleanup"):
                     await asyncio.to_thread(inst.cleanup)
             except asyncio.QueueEmpty:
                 break
 
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        # Builds may fail while nobody awaits them; they already log why.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
     async def _replenish_one(self, schema_hash: str, schema_data: dict[str, Any]):
-        """Builds one replacement instance if the schema hasn't changed."""
+        """Builds one instance for a pool that already reserved room for it."""
         try:
             inst = await asyncio.to_thread(build_and_init, schema_data, self.registry)
-            async with self.lock:
-                if self.current_hash == schema_hash:
-                    await self.pool.put(inst)
         except Exception:
             logger.warning("Failed to replenish pool instance.", exc_info=True)
-
-    async def discard_instance(self, instance: Any, envelope: SchemaEnvelope) -> None:
-        """Explicitly drops an instance without returning it to the pool and spawns a replacement."""
+            pool = self.pools.get(schema_hash)
+            if pool is not None:
+                pool.size -= 1
+            return
+        async with self.lock:
+            pool = self.pools.get(schema_hash)
+            if pool is not None:
+                await pool.put(inst)
+                return
+        if hasattr(inst, "cleanup"):
+            await asyncio.to_thread(inst.cleanup)
+
+    async def discard_instance(
+        self,
+        instance: Any,
+        envelope: SchemaEnvelope,
+        instance_hash: str | None = None,
+    ) -> None:
+        """Explicitly drops an instance without returning it to the pool.
+
+        A replacement is built in the background if the pool falls below its
+        minimum size.
+
+        Args:
+            instance: The checked-out instance.
+            envelope: The schema the request ran against.
+            instance_hash: The hash of the pool the instance came from, if it
+                differs from ``envelope.hash`` (e.g. during a rebuild).
+        """
         logger.warning("Discarding instance (not returned to pool).")
         if hasattr(instance, "cleanup"):
             await asyncio.to_thread(instance.cleanup)
 
-        task = asyncio.create_task(self._replenish_one(envelope.hash, envelope.data))
-        self._background_tasks.add(task)
-        task.add_done_callback(self._background_tasks.discard)
+        pool = self.pools.get(instance_hash or envelope.hash)
+        if pool is None:
+            return
+        pool.size = max(0, pool.size - 1)
+        if (instance_hash or envelope.hash) == envelope.hash and pool.size < self.size:
+            pool.size += 1
+            self._spawn(self._replenish_one(envelope.hash, envelope.data))
+
+    def _grow(self, pool: InstancePool, pool_hash: str, envelope: SchemaEnvelope):
+        # Pools serving while their successor builds are not worth growing.
+        if pool_hash != envelope.hash or pool.size >= self.max_size:
+            return
+        logger.info("Problem pool exhausted, adding an instance.")
+        pool.size += 1
+        self._spawn(self._replenish_one(envelope.hash, envelope.data))
+
+    async def _build_pool(
+        self, envelope: SchemaEnvelope, donors: list[Any]
+    ) -> InstancePool:
+        tasks = [
+            asyncio.to_thread(
+                build_and_init,
+                envelope.data,
+                self.registry,
+                donors[i] if i < len(donors) else None,
+            )
+            for i in range(self.size)
+        ]
+
+        # Ensure we don't leak successful instances if some fail
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        valid_instances = [r for r in results if not isinstance(r, Exception)]
+        failed = [r for r in results if isinstance(r, Exception)]
+        for err in failed:
+            logger.warning("Pool instance failed to build.", exc_info=err)
+
+        if not valid_instances:
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to build any execution instances.",
+            )
+
+        pool = InstancePool(envelope.source_hash)
+        for inst in valid_instances:
+            await pool.put(inst)
+        pool.size = len(valid_instances)
+        return pool
+
+    async def _rebuild(
+        self, envelope: SchemaEnvelope, previous_hash: str | None
+    ) -> InstancePool:
+        """Builds the pool for ``envelope`` and swaps it in place of the previous one."""
+        # Idle previous instances donate their components. One is left
+        # serving requests while the new pool builds.
+        donors = []
+        previous = self.pools.get(previous_hash) if previous_hash else None
+        while previous is not None and previous.qsize() > 1 and len(donors) < self.size:
+            donors.append(previous.get_nowait())
+            previous.size -= 1
+
+        try:
+            pool = await self._build_pool(envelope, donors)
+        except BaseException:
+            async with self.lock:
+                self._builds.pop(envelope.hash, None)
+                previous = self.pools.get(previous_hash) if previous_hash else None
+                for donor in donors:
+                    if previous is not None:
+                        previous.size += 1
+                        await previous.put(donor)
+                    elif hasattr(donor, "cleanup"):
+                        await asyncio.to_thread(donor.cleanup)
+            raise
+
+        # Donors share components with the new instances and must not run again.
+        for donor in donors:
+            if hasattr(donor, "cleanup"):
+                await asyncio.to_thread(donor.cleanup)
+
+        async with self.lock:
+            self._builds.pop(envelope.hash, None)
+            self.pools[envelope.hash] = pool
+            self._lineage[envelope.objectives] = envelope.hash
+            if previous_hash and previous_hash != envelope.hash:
+                await self._retire(previous_hash)
+            while len(self.pools) > self.max_subgraphs:
+                evicted_hash, evicted = self.pools.popitem(last=False)
+                self._lineage = {
+                    k: v for k, v in self._lineage.items() if v != evicted_hash
+                }
+                await self._drain(evicted)
+        return pool
+
+    async def _retire(self, pool_hash: str) -> None:
+        """Drains a superseded pool once no objective set maps to it anymore.
+
+        Objective sets with identical pruned schemas share a pool, which must
+        keep serving the sets that have not moved to their new pool yet.
+        Must be called under ``self.lock``.
+        """
+        if pool_hash in self._lineage.values():
+            return
+        retired = self.pools.pop(pool_hash, None)
+        if retired is not None:
+            logger.info("Schema change detected. Swapped in rebuilt pool.")
+            await self._drain(retired)
+
+    def _stand_in(self, envelope: SchemaEnvelope) -> str | None:
+        """Finds a pool able to serve ``envelope`` while its own pool builds."""
+        previous_hash = self._lineage.get(envelope.objectives)
+        if previous_hash in self.pools:
+            return previous_hash
+        # The full schema computes every objective of the same schema version.
+        full_hash = self._lineage.get(None)
+        full = self.pools.get(full_hash)
+        if full is not None and full.source_hash == envelope.source_hash:
+            return full_hash
+        return None
 
     async def get_instance(self, envelope: SchemaEnvelope) -> tuple[Any, str]:
-        """Retrieves an instance and the hash it was built for."""
+        """Retrieves an instance and the hash of the pool it belongs to.
+
+        While the pool of ``envelope`` builds, instances of a stand-in pool
+        (the previous pool for the same objectives, or the full-schema pool)
+        are returned, with that pool's hash.
+
+        Args:
+            envelope: The full schema, or a pruned sub-schema of it.
+        """
         async with self.lock:
-            if self.current_hash != envelope.hash:
-                logger.info("Schema change detected. Rebuilding pool.")
-                # Clear pool
-                await self.teardown()
-
-                # Populate new pool
-                # Note: All incoming requests queue on self.lock while the pool rebuilds.
-                # This could be slow if build_and_init is expensive, but it's a deliberate
-                # serialization point to prevent concurrent rebuilds.
-                tasks = [
-                    asyncio.to_thread(build_and_init, envelope.data, self.registry)
-                    for _ in range(self.size)
-                ]
-
-                # Ensure we don't leak successful instances if some fail
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                valid_instances = [r for r in results if not isinstance(r, Exception)]
-                failed = [r for r in results if isinstance(r, Exception)]
-                for err in failed:
-                    logger.warning("Pool instance failed to build.", exc_info=err)
-
-                for inst in valid_instances:
-                    await self.pool.put(inst)
-
-                if not valid_instances:
-                    self.current_hash = None  # Reset so we try again next time
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to build any execution instances.",
+            pool_hash = envelope.hash
+            pool = self.pools.get(pool_hash)
+            build = None
+            if pool is None:
+                build = self._builds.get(pool_hash)
+                if build is None:
+                    build = self._spawn(
+                        self._rebuild(envelope, self._lineage.get(envelope.objectives))
                     )
-
-                self.current_hash = envelope.hash
+                    self._builds[pool_hash] = build
+                stand_in = self._stand_in(envelope)
+                if stand_in is not None:
+                    pool_hash = stand_in
+                    pool = self.pools[stand_in]
+                    build = None
+            elif self._lineage.get(envelope.objectives) != pool_hash:
+                # Another objective set built this pool: move this set over.
+                stale_hash = self._lineage.get(envelope.objectives)
+                self._lineage[envelope.objectives] = pool_hash
+                if stale_hash is not None:
+                    await self._retire(stale_hash)
+            if pool is not None:
+                self.pools.move_to_end(pool_hash)
+
+        if build is not None:
+            # Nothing to serve from yet: wait for the first build. Shielded so
+            # one cancelled request does not abort the build for the others.
+            pool = await asyncio.shield(build)
 
+        try:
+            inst = pool.get_nowait()
+        except asyncio.QueueEmpty:
+            inst = await self._wait_for_instance(pool, pool_hash, envelope)
+        return inst, pool_hash
+
+    async def _wait_for_instance(
+        self, pool: InstancePool, pool_hash: str, envelope: SchemaEnvelope
+    ) -> Any:
         try:
             async with asyncio.timeout(POOL_ACQUIRE_TIMEOUT):
-                inst = await self.pool.get()
+                try:
+                    async with asyncio.timeout(self.grow_after):
+                        return await pool.get()
+                except TimeoutError:
+                    self._grow(pool, pool_hash, envelope)
+                return await pool.get()
         except TimeoutError:
             raise HTTPException(
                 status_code=503,
                 detail="No execution instances available.",
             )
 
-        return inst, envelope.hash
-
     async def release_instance(self, instance: Any, instance_hash: str):
-        """Returns an instance to the pool only if it matches the current schema."""
+        """Returns an instance to its pool only if that pool is still current."""
         async with self.lock:
-            if instance_hash == self.current_hash:
-                await self.pool.put(instance)
+            pool = self.pools.get(instance_hash)
+            if pool is not None:
+                await pool.put(instance)
             else:
                 logger.info("Discarding stale Problem instance (hash mismatch).")
 
 
 # --- Dependencies ---
-async def get_schema_provider(request: Request) -> SchemaProvider:
-    return request.app.state.schema_provider
+class GraphContext:
+    """The schema provider, problem pool and background tasks of one graph."""
+
+    def __init__(
+        self,
+        schema_provider: SchemaProvider,
+        problem_pool: ProblemPool,
+        tasks: list[asyncio.Task] | None = None,
+    ):
+        self.schema_provider = schema_provider
+        self.problem_pool = problem_pool
+        self.tasks = tasks or []
+        # Requests currently using this graph; only idle graphs are evicted.
+        self.in_flight = 0
+
+    async def close(self) -> None:
+        """Cancels the graph's tasks and drains its problem pool."""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        await self.problem_pool.teardown()
+
+
+async def _graph_context(request: Request, graph_name: str) -> GraphContext:
+    """Returns the context of a graph.
+
+    The default graph's is created at startup. Other graphs get their own,
+    created on first use, so that edits to one graph never invalidate the
+    pools and cached schema of another. At most ``MAX_GRAPHS`` of them are
+    kept: the least recently used idle graph is closed to make room, and the
+    request is refused only when every graph is busy.
+    """
+    state = request.app.state
+    if graph_name == DEFAULT_GRAPH_NAME:
+        return GraphContext(state.schema_provider, state.problem_pool)
+
+    graphs: OrderedDict[str, GraphContext] = state.graphs
+    context = graphs.get(graph_name)
+    if context is not None:
+        graphs.move_to_end(graph_name)
+        return context
+
+    evicted = None
+    if len(graphs) >= MAX_GRAPHS:
+        idle = next((name for name, c in graphs.items() if not c.in_flight), None)
+        if idle is None:
+            raise HTTPException(
+                status_code=503, detail="Too many graphs served at once."
+            )
+        evicted = graphs.pop(idle)
+        logger.info(f"Evicting idle graph '{idle}'.")
+    schema_p = SchemaProvider(state.schema_provider.client, graph_name)
+    problem_pool = ProblemPool(TOOL_REGISTRY)
+    problem_pool.start()
+    context = graphs[graph_name] = GraphContext(
+        schema_p, problem_pool, start_graph_tasks(schema_p, problem_pool)
+    )
+    if evicted is not None:
+        # Registered before awaiting so concurrent requests see the new graph.
+        await evicted.close()
+    return context
+
+
+async def get_graph_context(
+    request: Request, graph_name: str = Depends(get_graph_name)
+) -> AsyncIterator[GraphContext]:
+    context = await _graph_context(request, graph_name)
+    context.in_flight += 1
+    try:
+        yield context
+    finally:
+        context.in_flight -= 1
+
+
+async def get_schema_provider(
+    context: GraphContext = Depends(get_graph_context),
+) -> SchemaProvider:
+    return context.schema_provider
+
+
+async def get_problem_pool(
+    context: GraphContext = Depends(get_graph_context),
+) -> ProblemPool:
+    return context.problem_pool
 
 
-async def get_problem_pool(request: Request) -> ProblemPool:
-    return request.app.state.problem_pool
+async def get_evaluation_cache(request: Request) -> EvaluationCache | None:
+    return getattr(request.app.state, "evaluation_cache", None)
+
+
+async def get_single_flight(request: Request) -> SingleFlight | None:
+    return getattr(request.app.state, "single_flight", None)
 
 
 # --- Request Models ---
+def _check_input_mapping(v: dict[str, InputScalar]) -> dict[str, InputScalar]:
+    """Applies the payload limits shared by single and batch evaluation requests."""
+    if not v:
+        raise ValueError("At least one input is required.")
+    if len(v) > 100:
+        raise ValueError("Too many inputs (max 100 allowed).")
+    for key in v:
+        if len(key) > 50:
+            preview = key[:20]
+            raise ValueError(
+                f"Input key '{preview}...' exceeds maximum length of 50.",
+            )
+    return v
+
+
 class EvaluateRequest(BaseModel):
     inputs: dict[str, InputScalar]
     objectives: list[str] = Field(..., min_length=1)
@@ -314,20 +983,54 @@ class EvaluateRequest(BaseModel):
     @field_validator("inputs")
     @classmethod
     def validate_inputs(cls, v: dict[str, InputScalar]) -> dict[str, InputScalar]:
-        if not v:
-            raise ValueError("At least one input is required.")
-        if len(v) > 100:
-            raise ValueError("Too many inputs (max 100 allowed).")
-        for key in v:
-            if len(key) > 50:
-                preview = key[:20]
-                raise ValueError(
-                    f"Input key '{preview}...' exceeds maximum length of 50.",
-                )
+        return _check_input_mapping(v)
+
+
+class EvaluateBatchRequest(BaseModel):
+    points: list[dict[str, InputScalar]] = Field(
+        ..., min_length=1, max_length=BATCH_MAX_POINTS
+    )
+    objectives: list[str] = Field(..., min_length=1)
+
+    @field_validator("points")
+    @classmethod
+    def validate_points(
+        cls, v: list[dict[str, InputScalar]]
+    ) -> list[dict[str, InputScalar]]:
+        for point in v:
+            _check_input_mapping(point)
         return v
 
 
 # --- App Setup ---
+async def prewarm_pool(schema_p: SchemaProvider, problem_pool: ProblemPool) -> None:
+    """Builds pools for the current schema before the first request arrives."""
+    try:
+        envelope = await schema_p.get_schema()
+        await problem_pool.prewarm(envelope)
+        for objectives in POOL_PREWARM_OBJECTIVES:
+            await problem_pool.prewarm(envelope.pruned(objectives))
+    except Exception:
+        logger.warning("Problem pool pre-warm failed.", exc_info=True)
+    else:
+        logger.info("Problem pool pre-warmed.")
+
+
+def start_graph_tasks(
+    schema_p: SchemaProvider, problem_pool: ProblemPool
+) -> list[asyncio.Task]:
+    """Starts pre-warming a graph's pool and, if enabled, watching its schema."""
+    tasks = [asyncio.create_task(prewarm_pool(schema_p, problem_pool))]
+    if SCHEMA_EVENTS:
+        # Pools for a changed schema are built before requests ask for them.
+        tasks.append(
+            asyncio.create_task(
+                schema_p.watch(lambda _: prewarm_pool(schema_p, problem_pool))
+            )
+        )
+    return tasks
+
+
 @asynccontextmanager
 async def lifespan(app_instance: FastAPI):
     # Startup validation
@@ -337,34 +1040,127 @@ async def lifespan(app_instance: FastAPI):
     client = httpx.AsyncClient(timeout=5.0)
     app_instance.state.schema_provider = SchemaProvider(client)
     app_instance.state.problem_pool = ProblemPool(TOOL_REGISTRY)
+    app_instance.state.problem_pool.start()
+    # Other graphs, keyed by name in least recently used order; see
+    # `_graph_context`.
+    app_instance.state.graphs = OrderedDict()
+    app_instance.state.graph_tasks = start_graph_tasks(
+        app_instance.state.schema_provider, app_instance.state.problem_pool
+    )
+    app_instance.state.evaluation_cache = build_evaluation_cache(
+        EVAL_CACHE_BACKEND,
+        EVAL_CACHE_MAX_ENTRIES,
+        EVAL_CACHE_TTL,
+        path=EVAL_CACHE_PATH,
+        namespace=EVAL_CACHE_NAMESPACE,
+    )
+    app_instance.state.single_flight = SingleFlight()
     yield
+    background = app_instance.state.graph_tasks
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
     await app_instance.state.problem_pool.teardown()
+    for context in app_instance.state.graphs.values():
+        await context.close()
+    if app_instance.state.evaluation_cache is not None:
+        app_instance.state.evaluation_cache.close()
     await client.aclose()
 
 
 app = FastAPI(title="Execution Service", lifespan=lifespan)
+# Evaluation endpoints act on the graph chosen by `get_graph_name`; the router
+# is mounted at the root and under the graph prefix after its endpoints.
+router = APIRouter()
 
 
-# --- Endpoints ---
-@app.post("/evaluate")
-async def evaluate(
-    req: EvaluateRequest,
-    schema_p: SchemaProvider = Depends(get_schema_provider),
-    problem_pool: ProblemPool = Depends(get_problem_pool),
-):
-    """Evaluate an objective function using the graph-defined problem structure."""
-    envelope = await schema_p.get_schema()
-
-    # 1. Validation against Schema
-    for obj in req.objectives:
+# --- Evaluation ---
+def validate_against_schema(
+    envelope: SchemaEnvelope,
+    input_names: set[str],
+    objectives: list[str],
+) -> None:
+    """Rejects objectives and inputs that the current schema does not define."""
+    for obj in objectives:
         if obj not in envelope.known_objectives:
             raise HTTPException(status_code=422, detail=f"Unknown objective: {obj}")
 
-    unknown = set(req.inputs.keys()) - envelope.known_vars
+    unknown = input_names - envelope.known_vars
     if unknown:
         raise HTTPException(status_code=422, detail=f"Unknown inputs: {unknown}")
 
-    # 2. Execution from Pool
+
+async def evaluate_on_pool(
+    problem_pool: ProblemPool,
+    envelope: SchemaEnvelope,
+    inputs: dict[str, InputScalar],
+    objectives: list[str],
+    cache: EvaluationCache | None = None,
+    flights: SingleFlight | None = None,
+    convergence: dict[str, Any] | None = None,
+) -> dict[str, float]:
+    """Runs one design point on a pooled instance and returns float results.
+
+    The point runs on a problem pruned to the tools the objectives depend on.
+    Results already in ``cache`` for the same sub-schema, relevant inputs and
+    objectives are returned without touching the pool, and concurrent
+    identical requests are coalesced by ``flights`` into a single execution.
+    The instance goes back to the pool on success and is discarded (and
+    replaced in the background) on any execution failure.
+
+    The MDA statistics of the coupled clusters are added to ``convergence``,
+    if given. Cached results carry none.
+    """
+    envelope = envelope.pruned(objectives)
+    if cache is None and flights is None:
+        results, stats = await _execute_on_pool(
+            problem_pool, envelope, inputs, objectives
+        )
+        if convergence is not None:
+            convergence.update(stats)
+        return results
+
+    # Inputs the pruned problem never reads cannot change its results.
+    relevant = {k: v for k, v in inputs.items() if k in envelope.known_vars}
+    if cache is not None:
+        # Backends are local (memory or SQLite file), so lookups stay inline.
+        key = cache.key(envelope.hash, relevant, objectives)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    else:
+        key = evaluation_key(envelope.hash, relevant, objectives)
+
+    if flights is None:
+        results, stats = await _execute_on_pool(
+            problem_pool, envelope, inputs, objectives, cache, key
+        )
+    else:
+        results, stats = await flights.do(
+            key,
+            lambda: _execute_on_pool(
+                problem_pool, envelope, inputs, objectives, cache, key
+            ),
+        )
+    if convergence is not None:
+        convergence.update(stats)
+    # Coalesced callers each get their own copy of the shared results.
+    return dict(results)
+
+
+async def _execute_on_pool(
+    problem_pool: ProblemPool,
+    envelope: SchemaEnvelope,
+    inputs: dict[str, InputScalar],
+    objectives: list[str],
+    cache: EvaluationCache | None = None,
+    cache_key: str | None = None,
+) -> tuple[dict[str, float], dict[str, Any]]:
+    """Executes a pruned design point on a pooled instance, caching the results.
+
+    Returns:
+        The results and the MDA statistics of the instance's coupled clusters.
+    """
     instance, instance_hash = await problem_pool.get_instance(envelope)
     execution_succeeded = False
     try:
@@ -373,15 +1169,15 @@ async def evaluate(
             raw_results = await asyncio.to_thread(
                 execute_problem,
                 instance,
-                req.inputs,
-                req.objectives,
+                inputs,
+                objectives,
             )
             execution_succeeded = True
+            stats = dict(getattr(instance, "convergence", None) or {})
 
-            # 3. Safe result transformation
+            # Safe result transformation
             try:
                 results = {obj: to_float(val) for obj, val in raw_results.items()}
-                return {"results": results}
             except (IndexError, TypeError, ValueError) as e:
                 logger.error("Result transformation failed.", exc_info=True)
                 raise HTTPException(
@@ -389,6 +1185,12 @@ async def evaluate(
                     detail="Invalid result shape.",
                 ) from e
 
+            # Results of a previous pool serving during a rebuild are not
+            # cached under the new schema.
+            if cache is not None and instance_hash == envelope.hash:
+                cache.set(cache_key, results)
+            return results, stats
+
         except HTTPException:
             # Re-raise explicit HTTPExceptions before the generic catch
             raise
@@ -406,7 +1208,174 @@ async def evaluate(
         if execution_succeeded:
             await problem_pool.release_instance(instance, instance_hash)
         else:
-            await problem_pool.discard_instance(instance, envelope)
+            await problem_pool.discard_instance(instance, envelope, instance_hash)
+
+
+async def evaluate_vectorized(
+    problem_pool: ProblemPool,
+    envelope: SchemaEnvelope,
+    points: list[dict[str, InputScalar]],
+    objectives: list[str],
+    cache: EvaluationCache | None = None,
+) -> list[dict[str, float]] | None:
+    """Runs the points of a batch in one vectorized pass on a pooled instance.
+
+    ``envelope`` must be pruned to ``objectives``. Cached points are not run
+    again and duplicate points are run once.
+
+    Returns:
+        The results of every point in order, or None if no instance was free
+        or the pass failed, in which case the points should be evaluated one
+        by one so that failures are reported per point.
+    """
+    results: list[dict[str, float] | None] = [None] * len(points)
+    pending: dict[str, list[int]] = {}
+    for i, inputs in enumerate(points):
+        relevant = {k: v for k, v in inputs.items() if k in envelope.known_vars}
+        if cache is not None:
+            key = cache.key(envelope.hash, relevant, objectives)
+            cached = cache.get(key)
+            if cached is not None:
+                results[i] = cached
+                continue
+        else:
+            key = evaluation_key(envelope.hash, relevant, objectives)
+        pending.setdefault(key, []).append(i)
+    if not pending:
+        return results
+
+    try:
+        instance, instance_hash = await problem_pool.get_instance(envelope)
+    except HTTPException:
+        return None
+    try:
+        raw_results = await asyncio.to_thread(
+            execute_problem_batch,
+            instance,
+            [points[indices[0]] for indices in pending.values()],
+            objectives,
+        )
+        values = [
+            {obj: to_float(val) for obj, val in raw.items()} for raw in raw_results
+        ]
+    except Exception:
+        logger.warning(
+            "Vectorized batch failed, evaluating points one by one.", exc_info=True
+        )
+        await problem_pool.discard_instance(instance, envelope, instance_hash)
+        return None
+    await problem_pool.release_instance(instance, instance_hash)
+
+    for (key, indices), value in zip(pending.items(), values, strict=True):
+        # Results of a previous pool serving during a rebuild are not
+        # cached under the new schema.
+        if cache is not None and instance_hash == envelope.hash:
+            cache.set(key, value)
+        for i in indices:
+            results[i] = dict(value)
+    return results
+
+
+# --- Endpoints ---
+@router.post("/evaluate")
+async def evaluate(
+    req: EvaluateRequest,
+    schema_p: SchemaProvider = Depends(get_schema_provider),
+    problem_pool: ProblemPool = Depends(get_problem_pool),
+    cache: EvaluationCache | None = Depends(get_evaluation_cache),
+    flights: SingleFlight | None = Depends(get_single_flight),
+):
+    """Evaluate an objective function using the graph-defined problem structure."""
+    envelope = await schema_p.get_schema()
+
+    # 1. Validation against Schema
+    validate_against_schema(envelope, set(req.inputs.keys()), req.objectives)
+
+    # 2. Execution from Pool
+    convergence: dict[str, Any] = {}
+    results = await evaluate_on_pool(
+        problem_pool, envelope, req.inputs, req.objectives, cache, flights, convergence
+    )
+    response: dict[str, Any] = {"results": results}
+    if convergence:
+        response["convergence"] = convergence
+    return response
+
+
+@router.post("/evaluate/batch")
+async def evaluate_batch(
+    req: EvaluateBatchRequest,
+    schema_p: SchemaProvider = Depends(get_schema_provider),
+    problem_pool: ProblemPool = Depends(get_problem_pool),
+    cache: EvaluationCache | None = Depends(get_evaluation_cache),
+    flights: SingleFlight | None = Depends(get_single_flight),
+):
+    """Evaluate many design points against one schema snapshot.
+
+    The schema is fetched and validated once for the whole batch. Points are
+    fanned out across the pool concurrently and results are returned in
+    request order; a failing point is reported in place with its status code
+    instead of failing the batch. When every tool the objectives depend on is
+    vectorized, the whole batch runs in one pass on a single instance.
+    """
+    envelope = await schema_p.get_schema()
+
+    input_names: set[str] = set()
+    for point in req.points:
+        input_names.update(point.keys())
+    validate_against_schema(envelope, input_names, req.objectives)
+
+    pruned = envelope.pruned(req.objectives)
+    if pruned.vectorized and len(req.points) > 1:
+        results = await evaluate_vectorized(
+            problem_pool, pruned, req.points, req.objectives, cache
+        )
+        if results is not None:
+            return {"results": [{"results": r} for r in results]}
+
+    # Never ask for more instances at once than the pool holds, so queued
+    # points wait on the semaphore rather than on the pool acquire timeout.
+    slots = asyncio.Semaphore(problem_pool.max_size)
+
+    async def _evaluate_point(inputs: dict[str, InputScalar]) -> dict[str, Any]:
+        async with slots:
+            convergence: dict[str, Any] = {}
+            try:
+                results = await evaluate_on_pool(
+                    problem_pool,
+                    envelope,
+                    inputs,
+                    req.objectives,
+                    cache,
+                    flights,
+                    convergence,
+                )
+            except HTTPException as e:
+                return {"error": e.detail, "status_code": e.status_code}
+            outcome: dict[str, Any] = {"results": results}
+            if convergence:
+                outcome["convergence"] = convergence
+            return outcome
+
+    outcomes = await asyncio.gather(*(_evaluate_point(p) for p in req.points))
+    return {"results": outcomes}
+
+
+app.include_router(router)
+app.include_router(router, prefix=GRAPH_PATH_PREFIX)
+
+
+@app.get("/cache/stats")
+async def cache_stats(
+    cache: EvaluationCache | None = Depends(get_evaluation_cache),
+    flights: SingleFlight | None = Depends(get_single_flight),
+):
+    """Report evaluation cache hit/miss and request coalescing counters."""
+    stats = {"backend": None} if cache is None else cache.stats()
+    if flights is not None:
+        stats["coalesced"] = flights.coalesced
+        stats["in_flight"] = len(flights)
+    return stats
 
 
 @app.get("/health")
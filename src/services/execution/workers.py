@@ -0,0 +1,223 @@
+"""
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this
+file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import logging
+import multiprocessing
+import pickle
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from typing import Any
+
+from mdo_framework.core.translator import GraphProblemBuilder, tool_components
+
+logger = logging.getLogger(__name__)
+
+
+def _portable_error(exc: BaseException) -> BaseException:
+    """Returns ``exc`` if it survives pickling, else a RuntimeError describing it."""
+    try:
+        pickle.dumps(exc)
+    except Exception:
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+    return exc
+
+
+def _serve(
+    conn: Connection,
+    schema: dict[str, Any],
+    registry: dict[str, Callable[..., Any]],
+    max_workers: int,
+    mda_options: dict[str, Any] | None = None,
+) -> None:
+    """Worker process loop: builds one problem, then answers requests on ``conn``.
+
+    Requests are ``(command, payload)`` tuples. ``execute`` runs the problem on
+    the payload ``(inputs, output_names)`` and replies with the requested
+    values only (every value if ``output_names`` is None) and the MDA
+    convergence statistics of the coupled clusters, ``execute_batch`` runs
+    the payload ``(points, output_names)`` in one vectorized pass, ``rebuild``
+    replaces the problem with one built from the payload schema (reusing
+    unchanged tool components) and ``close`` ends the loop. Every request gets
+    an ``("ok", result)`` or ``("error", exc)`` reply.
+    """
+    try:
+        problem = GraphProblemBuilder(schema).build_problem(
+            registry, max_workers=max_workers, mda_options=mda_options
+        )
+    except Exception as e:
+        conn.send(("error", _portable_error(e)))
+        conn.close()
+        return
+    conn.send(("ok", None))
+
+    while True:
+        try:
+            command, payload = conn.recv()
+        except EOFError:
+            break
+        if command == "close":
+            break
+        try:
+            if command == "execute":
+                input_data, output_names = payload
+                data = problem.execute(input_data)
+                if output_names is None:
+                    result = dict(data)
+                else:
+                    result = {name: data[name] for name in output_names if name in data}
+                result = (result, getattr(problem, "convergence", {}))
+            elif command == "execute_batch":
+                points, output_names = payload
+                data = problem.execute_batch(points)
+                result = {name: data[name] for name in output_names if name in data}
+            elif command == "rebuild":
+                problem = GraphProblemBuilder(payload).build_problem(
+                    registry,
+                    max_workers=max_workers,
+                    reuse=tool_components(problem),
+                    mda_options=mda_options,
+                )
+                result = None
+            else:
+                raise ValueError(f"Unknown worker command: {command}")
+        except Exception as e:
+            conn.send(("error", _portable_error(e)))
+        else:
+            conn.send(("ok", result))
+
+    if hasattr(problem, "cleanup"):
+        problem.cleanup()
+    conn.close()
+
+
+class ProcessProblem:
+    """A problem instance living in a dedicated worker process.
+
+    The worker builds the problem from the schema and registry once, then
+    runs evaluations sent over a pipe, so that CPU-bound tools of different
+    pooled instances run on different cores. It exposes the same
+    ``execute(input_data)`` interface as in-process problems. A handle must
+    only be used by one caller at a time, which the problem pool guarantees.
+
+    Args:
+        schema: The graph schema the problem is built from.
+        registry: Dictionary mapping tool names to Python functions. It must
+            be picklable for start methods other than "fork".
+        max_workers: The threads of the compiled execution plan.
+        mda_options: The default settings of the coupled cluster MDAs.
+        start_method: The multiprocessing start method of the worker.
+
+    Raises:
+        Exception: The error raised while building the problem in the worker.
+    """
+
+    def __init__(
+        self,
+        schema: dict[str, Any],
+        registry: dict[str, Callable[..., Any]],
+        max_workers: int = 1,
+        start_method: str = "spawn",
+        mda_options: dict[str, Any] | None = None,
+    ):
+        # MDA statistics of the last execution, by coupled cluster name
+        self.convergence: dict[str, dict[str, Any]] = {}
+        context = multiprocessing.get_context(start_method)
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_serve,
+            args=(child_conn, schema, registry, max_workers, mda_options),
+            name="problem-worker",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        try:
+            self._receive()
+        except BaseException:
+            self.cleanup()
+            raise
+
+    @classmethod
+    def rebuild_from(
+        cls, donor: "ProcessProblem", schema: dict[str, Any]
+    ) -> "ProcessProblem":
+        """Rebuilds the problem of ``donor``'s worker for a new schema.
+
+        Unchanged tool components are reused inside the worker. The returned
+        handle takes over the worker process and ``donor`` is detached, so
+        cleaning it up afterwards is a no-op. If the rebuild fails, ``donor``
+        keeps its previous problem.
+        """
+        donor._send("rebuild", schema)
+        handle = cls.__new__(cls)
+        handle._conn, handle._process = donor._conn, donor._process
+        handle.convergence = {}
+        donor._conn = donor._process = None
+        return handle
+
+    def _send(self, command: str, payload: Any) -> Any:
+        if self._process is None:
+            raise RuntimeError("Problem worker was released.")
+        try:
+            self._conn.send((command, payload))
+        except (BrokenPipeError, EOFError, OSError) as e:
+            raise RuntimeError("Problem worker is not running.") from e
+        return self._receive()
+
+    def _receive(self) -> Any:
+        try:
+            status, result = self._conn.recv()
+        except (EOFError, OSError) as e:
+            raise RuntimeError("Problem worker exited unexpectedly.") from e
+        if status == "error":
+            raise result
+        return result
+
+    def execute(
+        self,
+        input_data: dict[str, Any] | None = None,
+        output_names: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Runs the problem in the worker process.
+
+        Args:
+            input_data: Input values overriding the defaults.
+            output_names: The values to send back. Restricting them keeps the
+                reply small; all values are returned if None.
+
+        Returns:
+            The requested values, or the input values merged with every output.
+        """
+        result, self.convergence = self._send(
+            "execute", (input_data or {}, output_names)
+        )
+        return result
+
+    def execute_batch(
+        self, points: list[dict[str, Any]], output_names: list[str]
+    ) -> dict[str, Any]:
+        """Runs many design points in one pass of the worker's problem.
+
+        Returns:
+            The requested values, stacked with one entry per point.
+        """
+        return self._send("execute_batch", (points, output_names))
+
+    def cleanup(self) -> None:
+        """Stops the worker process."""
+        if self._process is None:
+            return
+        try:
+            self._conn.send(("close", None))
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            logger.warning("Problem worker did not stop, terminating it.")
+            self._process.terminate()
+            self._process.join()
+        self._conn.close()
+        self._conn = self._process = None
@@ -0,0 +1,111 @@
+"""
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this
+file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import json
+import threading
+from collections.abc import AsyncIterator
+from typing import Any
+
+
+def format_event(event: str, data: dict[str, Any]) -> str:
+    """Encodes one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class SchemaEventBroker:
+    """Fans schema change notifications out to server-sent-event subscribers.
+
+    Every mutation bumps a version counter and pushes a ``schema-changed``
+    event to each subscriber queue. Mutating endpoints run in the threadpool,
+    so events are handed to each subscriber's event loop thread-safely.
+
+    Args:
+        max_queued: The events buffered per subscriber. A subscriber that
+            falls further behind only needs the latest event, so older ones
+            are dropped.
+    """
+
+    def __init__(self, max_queued: int = 16):
+        self.max_queued = max_queued
+        self.version = 0
+        self._lock = threading.Lock()
+        self._subscribers: set[tuple[asyncio.Queue, asyncio.AbstractEventLoop]] = set()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, reason: str) -> int:
+        """Records a schema mutation and notifies every subscriber.
+
+        Args:
+            reason: What changed, e.g. "tool" or "clear".
+
+        Returns:
+            The new schema version.
+        """
+        with self._lock:
+            self.version += 1
+            event = {"version": self.version, "reason": reason}
+            subscribers = list(self._subscribers)
+        self._notify(subscribers, event)
+        return event["version"]
+
+    def close(self) -> None:
+        """Ends every open stream; later streams end after their hello."""
+        with self._lock:
+            self._closed = True
+            subscribers = list(self._subscribers)
+        self._notify(subscribers, None)
+
+    def _notify(
+        self,
+        subscribers: list[tuple[asyncio.Queue, asyncio.AbstractEventLoop]],
+        event: dict[str, Any] | None,
+    ) -> None:
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # The subscriber's loop is closed; it unsubscribes on exit.
+                pass
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: dict[str, Any] | None) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    async def stream(self, keepalive: float = 15.0) -> AsyncIterator[str]:
+        """Yields server-sent events until the consumer stops or the broker closes.
+
+        The stream opens with a ``hello`` event carrying the current version,
+        so that reconnecting clients can refresh what they may have missed.
+        A comment line is sent after ``keepalive`` seconds without events.
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.max_queued)
+        subscriber = (queue, asyncio.get_running_loop())
+        with self._lock:
+            if not self._closed:
+                self._subscribers.add(subscriber)
+            closed = self._closed
+            version = self.version
+        try:
+            yield format_event("hello", {"version": version})
+            while not closed:
+                try:
+                    async with asyncio.timeout(keepalive):
+                        event = await queue.get()
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield format_event("schema-changed", event)
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
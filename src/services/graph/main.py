@@ -4,18 +4,114 @@ License, v. 2.0. If a copy of the MPL was not distributed with this
 file, You can obtain one at http://mozilla.org/MPL/2.0/.
 """
 
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
 from typing import Any
 
-from fastapi import Depends, FastAPI
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, ConfigDict
 
+from mdo_framework.core.schema_codec import (
+    COMPACT_SCHEMA_MEDIA_TYPE,
+    COMPACT_SCHEMA_VERSION,
+    encode_compact_schema,
+)
+from mdo_framework.db.client import DEFAULT_GRAPH_NAME
 from mdo_framework.db.graph_manager import GraphManager
+from services.graph.events import SchemaEventBroker
+from services.graph_selection import GRAPH_PATH_PREFIX, get_graph_name
+
+SCHEMA_EVENTS_KEEPALIVE = float(os.getenv("SCHEMA_EVENTS_KEEPALIVE", "15.0"))
+# Seconds a schema snapshot may serve reads; 0 keeps it until a write through
+# this service. Set it when other processes also write to the graph.
+GRAPH_SNAPSHOT_TTL = float(os.getenv("GRAPH_SNAPSHOT_TTL", "0"))
+# Named graphs kept at once besides the default one; see `_graph_context`.
+GRAPH_MAX_GRAPHS = int(os.getenv("GRAPH_MAX_GRAPHS", "64"))
+if GRAPH_MAX_GRAPHS <= 0:
+    raise ValueError("GRAPH_MAX_GRAPHS must be a positive integer.")
 
 app = FastAPI(title="Graph Service")
-
-
-def get_graph_manager() -> GraphManager:
-    return GraphManager()
+# Endpoints act on the graph chosen by `get_graph_name`; see the bottom of
+# this module for how the router is mounted.
+router = APIRouter()
+
+
+class GraphContext:
+    """The graph manager and change event broker of one graph."""
+
+    def __init__(self, graph_name: str):
+        # Shared per graph, so that its schema snapshot outlives a request.
+        self.manager = GraphManager(
+            graph_name=graph_name, snapshot_ttl=GRAPH_SNAPSHOT_TTL
+        )
+        self.events = SchemaEventBroker()
+        # Requests currently using this graph; only idle graphs are evicted.
+        self.in_flight = 0
+
+    @property
+    def idle(self) -> bool:
+        return not self.in_flight and not len(self.events)
+
+
+# Graphs in least recently used order; see `_graph_context`.
+_graphs: OrderedDict[str, GraphContext] = OrderedDict()
+_graphs_lock = threading.RLock()
+
+
+def _graph_context(graph_name: str) -> GraphContext:
+    """Returns the context of a graph, created on first use.
+
+    At most ``GRAPH_MAX_GRAPHS`` graphs besides the default one are kept: the
+    least recently used graph without requests or event subscribers is
+    dropped to make room, and its broker closed. The request is refused only
+    when every graph is busy.
+    """
+    with _graphs_lock:
+        context = _graphs.get(graph_name)
+        if context is not None:
+            _graphs.move_to_end(graph_name)
+            return context
+        evicted = None
+        named = [name for name in _graphs if name != DEFAULT_GRAPH_NAME]
+        if graph_name != DEFAULT_GRAPH_NAME and len(named) >= GRAPH_MAX_GRAPHS:
+            idle = next((name for name in named if _graphs[name].idle), None)
+            if idle is None:
+                raise HTTPException(
+                    status_code=503, detail="Too many graphs served at once."
+                )
+            evicted = _graphs.pop(idle)
+        context = _graphs[graph_name] = GraphContext(graph_name)
+    if evicted is not None:
+        evicted.events.close()
+    return context
+
+
+def get_graph_context(
+    graph_name: str = Depends(get_graph_name),
+) -> Iterator[GraphContext]:
+    with _graphs_lock:
+        context = _graph_context(graph_name)
+        context.in_flight += 1
+    try:
+        yield context
+    finally:
+        with _graphs_lock:
+            context.in_flight -= 1
+
+
+def get_graph_manager(
+    context: GraphContext = Depends(get_graph_context),
+) -> GraphManager:
+    return context.manager
+
+
+def get_schema_events(
+    context: GraphContext = Depends(get_graph_context),
+) -> SchemaEventBroker:
+    return context.events
 
 
 class VariableCreate(BaseModel):
@@ -37,6 +133,16 @@ class ToolCreate(BaseModel):
     fidelity: str = "high"
 
 
+class ToolImport(ToolCreate):
+    inputs: list[str] = []
+    outputs: list[str] = []
+
+
+class SchemaImport(BaseModel):
+    variables: list[VariableCreate] = []
+    tools: list[ToolImport] = []
+
+
 class ConnectionCreate(BaseModel):
     source: str
     target: str
@@ -58,19 +164,34 @@ class ConnectionResponse(StatusResponse):
     type: str
 
 
+class ImportResponse(StatusResponse):
+    variables: int
+    tools: int
+    inputs: int
+    outputs: int
+
+
 class SchemaResponse(BaseModel):
     tools: list[dict[str, Any]]
     variables: list[dict[str, Any]]
 
 
-@app.post("/clear", response_model=StatusResponse)
-def clear_graph(gm: GraphManager = Depends(get_graph_manager)):
+@router.post("/clear", response_model=StatusResponse)
+def clear_graph(
+    gm: GraphManager = Depends(get_graph_manager),
+    events: SchemaEventBroker = Depends(get_schema_events),
+):
     gm.clear_graph()
+    events.publish("clear")
     return StatusResponse(status="cleared")
 
 
-@app.post("/variables", response_model=VariableResponse)
-def create_variable(var: VariableCreate, gm: GraphManager = Depends(get_graph_manager)):
+@router.post("/variables", response_model=VariableResponse)
+def create_variable(
+    var: VariableCreate,
+    gm: GraphManager = Depends(get_graph_manager),
+    events: SchemaEventBroker = Depends(get_schema_events),
+):
     gm.add_variable(
         var.name,
         var.value,
@@ -81,35 +202,143 @@ def create_variable(var: VariableCreate, gm: GraphManager = Depends(get_graph_ma
         var.value_type,
         **(var.model_extra or {}),
     )
+    events.publish("variable")
     return VariableResponse(status="created", variable=var.name)
 
 
-@app.post("/tools", response_model=ToolResponse)
-def create_tool(tool: ToolCreate, gm: GraphManager = Depends(get_graph_manager)):
+@router.post("/tools", response_model=ToolResponse)
+def create_tool(
+    tool: ToolCreate,
+    gm: GraphManager = Depends(get_graph_manager),
+    events: SchemaEventBroker = Depends(get_schema_events),
+):
     gm.add_tool(tool.name, tool.fidelity, **(tool.model_extra or {}))
+    events.publish("tool")
     return ToolResponse(status="created", tool=tool.name)
 
 
-@app.post("/connections/input", response_model=ConnectionResponse)
+@router.post("/connections/input", response_model=ConnectionResponse)
 def connect_input(
     conn: ConnectionCreate,
     gm: GraphManager = Depends(get_graph_manager),
+    events: SchemaEventBroker = Depends(get_schema_events),
 ):
     # Variable -> Tool
     gm.connect_input_to_tool(conn.source, conn.target)
+    events.publish("connection")
     return ConnectionResponse(status="connected", type="input")
 
 
-@app.post("/connections/output", response_model=ConnectionResponse)
+@router.post("/connections/output", response_model=ConnectionResponse)
 def connect_output(
     conn: ConnectionCreate,
     gm: GraphManager = Depends(get_graph_manager),
+    events: SchemaEventBroker = Depends(get_schema_events),
 ):
     # Tool -> Variable
     gm.connect_tool_to_output(conn.source, conn.target)
+    events.publish("connection")
     return ConnectionResponse(status="connected", type="output")
 
 
-@app.get("/schema", response_model=SchemaResponse)
-def get_schema(gm: GraphManager = Depends(get_graph_manager)):
-    return gm.get_graph_schema()
+def _etag(digest: str, variant: str = "") -> str:
+    """Returns a strong ETag for the schema with the given content digest.
+
+    The tag quotes the `schema_digest` of the schema, the same digest the
+    execution service uses as the schema hash. Other encodings of the same
+    content append their ``variant`` name.
+    """
+    return f'"{digest}-{variant}"' if variant else f'"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    # If-None-Match uses weak comparison.
+    return etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def _accept_quality(accept: str, media_type: str) -> float:
+    """Returns the quality the Accept header gives ``media_type`` (0 if absent)."""
+    for entry in accept.split(","):
+        kind, *params = (part.strip() for part in entry.split(";"))
+        if kind != media_type:
+            continue
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    return float(value)
+                except ValueError:
+                    return 0.0
+        return 1.0
+    return 0.0
+
+
+def _wants_compact_schema(accept: str | None) -> bool:
+    if not accept:
+        return False
+    compact = _accept_quality(accept, COMPACT_SCHEMA_MEDIA_TYPE)
+    return compact > 0 and compact >= _accept_quality(accept, "application/json")
+
+
+@router.get(
+    "/schema",
+    response_model=SchemaResponse,
+    responses={200: {"content": {COMPACT_SCHEMA_MEDIA_TYPE: {}}}},
+)
+def get_schema(
+    request: Request,
+    response: Response,
+    gm: GraphManager = Depends(get_graph_manager),
+):
+    """Returns the schema, or 304 if it matches the client's If-None-Match tag.
+
+    Clients accepting the compact media type (preferred over JSON) get the
+    columnar encoding of `encode_compact_schema` instead.
+    """
+    # The digest is kept with the snapshot, so revalidations cost no hashing.
+    schema, digest = gm.get_schema_snapshot()
+    compact = _wants_compact_schema(request.headers.get("accept"))
+    etag = _etag(digest, f"c{COMPACT_SCHEMA_VERSION}" if compact else "")
+    headers = {"ETag": etag, "Vary": "Accept"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    if compact:
+        return JSONResponse(
+            encode_compact_schema(schema),
+            media_type=COMPACT_SCHEMA_MEDIA_TYPE,
+            headers=headers,
+        )
+    response.headers.update(headers)
+    return schema
+
+
+@router.post("/schema/import", response_model=ImportResponse)
+def import_schema(
+    schema: SchemaImport,
+    gm: GraphManager = Depends(get_graph_manager),
+    events: SchemaEventBroker = Depends(get_schema_events),
+):
+    """Merges a whole schema into the graph in one batched write."""
+    counts = gm.import_schema(schema.model_dump())
+    events.publish("import")
+    return ImportResponse(status="imported", **counts)
+
+
+@router.get("/schema/events")
+async def stream_schema_events(
+    events: SchemaEventBroker = Depends(get_schema_events),
+):
+    """Streams schema change notifications as server-sent events."""
+    return StreamingResponse(
+        events.stream(SCHEMA_EVENTS_KEEPALIVE),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+app.include_router(router)
+app.include_router(router, prefix=GRAPH_PATH_PREFIX)
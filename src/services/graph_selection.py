@@ -0,0 +1,41 @@
+"""
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this
+file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+from fastapi import HTTPException, Request
+
+from mdo_framework.db.client import DEFAULT_GRAPH_NAME, validate_graph_name
+
+# Graph-scoped routes are served both at the root, for the default graph or
+# the graph named by the header, and under this prefix.
+GRAPH_PATH_PREFIX = "/graphs/{graph_name}"
+GRAPH_NAME_HEADER = "X-Graph-Name"
+
+
+def get_graph_name(request: Request) -> str:
+    """Resolves the graph a request targets: path, then header, then default.
+
+    Raises:
+        HTTPException: 400 if the graph name is invalid.
+    """
+    name = (
+        request.path_params.get("graph_name")
+        or request.headers.get(GRAPH_NAME_HEADER)
+        or DEFAULT_GRAPH_NAME
+    )
+    try:
+        return validate_graph_name(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def graph_scoped_url(service_url: str, graph_name: str) -> str:
+    """Returns the base URL of a service's graph-scoped endpoints for one graph.
+
+    The default graph keeps the root URL, which older services also serve.
+    """
+    if graph_name == DEFAULT_GRAPH_NAME:
+        return service_url
+    return f"{service_url.rstrip('/')}/graphs/{graph_name}"
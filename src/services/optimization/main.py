@@ -6,14 +6,17 @@ file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import asyncio
 import os
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from typing import Any, Literal
 
 import httpx
 import numpy as np
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
 from pydantic import BaseModel
 
+from mdo_framework.core.schema_codec import COMPACT_SCHEMA_MEDIA_TYPE
+from mdo_framework.core.topology import TopologicalAnalyzer
 from mdo_framework.optimization.optimizer import (
     BayesianOptimizer,
     OptimizationConfigurationError,
@@ -22,6 +25,11 @@ from mdo_framework.optimization.optimizer import (
     RemoteEvaluationTransportError,
     RemoteEvaluator,
 )
+from services.graph_selection import (
+    GRAPH_PATH_PREFIX,
+    get_graph_name,
+    graph_scoped_url,
+)
 
 
 def to_jsonable(obj: Any) -> Any:
@@ -52,9 +60,41 @@ async def lifespan(app: FastAPI):
 
 
 app = FastAPI(title="Optimization Service", lifespan=lifespan)
+# /optimize runs on the graph chosen by `get_graph_name`; the router is
+# mounted at the root and under the graph prefix.
+router = APIRouter()
 
 EXECUTION_SERVICE_URL = os.getenv("EXECUTION_SERVICE_URL", "http://localhost:8002")
 GRAPH_SERVICE_URL = os.getenv("GRAPH_SERVICE_URL", "http://localhost:8001")
+ANALYZER_CACHE_SIZE = int(os.getenv("ANALYZER_CACHE_SIZE", "8"))
+if ANALYZER_CACHE_SIZE <= 0:
+    raise ValueError("ANALYZER_CACHE_SIZE must be a positive integer.")
+
+# (graph name, schema ETag) -> analyzer, least recently used first
+_analyzers: OrderedDict[tuple[str, str], TopologicalAnalyzer] = OrderedDict()
+
+
+def get_analyzer(
+    schema: dict[str, Any], graph_name: str, etag: Any = None
+) -> TopologicalAnalyzer:
+    """Returns a `TopologicalAnalyzer` for ``schema``, reused while its ETag holds.
+
+    Reusing the analyzer keeps its index and memoized dependency closures
+    across optimization requests on an unchanged graph.
+    """
+    if not isinstance(etag, str):
+        return TopologicalAnalyzer(schema)
+
+    key = (graph_name, etag)
+    analyzer = _analyzers.get(key)
+    if analyzer is None:
+        analyzer = TopologicalAnalyzer(schema)
+        _analyzers[key] = analyzer
+        while len(_analyzers) > ANALYZER_CACHE_SIZE:
+            _analyzers.popitem(last=False)
+    else:
+        _analyzers.move_to_end(key)
+    return analyzer
 
 
 class ObjectiveConfig(BaseModel):
@@ -81,12 +121,19 @@ class OptimizeRequest(BaseModel):
     use_bonsai: bool = False
 
 
-@app.post("/optimize")
-async def optimize(req: OptimizeRequest, request: Request):
+@router.post("/optimize")
+async def optimize(
+    req: OptimizeRequest,
+    request: Request,
+    graph_name: str = Depends(get_graph_name),
+):
     # 1. Fetch schema from Graph Service
     try:
         client: httpx.AsyncClient = request.app.state.client
-        resp = await client.get(f"{GRAPH_SERVICE_URL}/schema")
+        resp = await client.get(
+            f"{graph_scoped_url(GRAPH_SERVICE_URL, graph_name)}/schema",
+            headers={"Accept": f"{COMPACT_SCHEMA_MEDIA_TYPE}, application/json;q=0.9"},
+        )
         resp.raise_for_status()
         schema = resp.json()
     except Exception as e:
@@ -95,10 +142,8 @@ async def optimize(req: OptimizeRequest, request: Request):
             detail=f"Failed to fetch graph schema: {e}",
         )
 
-    from mdo_framework.core.topology import TopologicalAnalyzer
-
-    # 2. Identify Design Variables recursively from requested objectives and constraints
-    analyzer = TopologicalAnalyzer(schema)
+    # 2. Identify Design Variables from requested objectives and constraints
+    analyzer = get_analyzer(schema, graph_name, resp.headers.get("etag"))
 
     target_outputs = [obj.name for obj in req.objectives]
     if req.constraints:
@@ -125,7 +170,7 @@ async def optimize(req: OptimizeRequest, request: Request):
         )
 
     # 4. Setup Evaluator
-    evaluator = RemoteEvaluator(EXECUTION_SERVICE_URL)
+    evaluator = RemoteEvaluator(graph_scoped_url(EXECUTION_SERVICE_URL, graph_name))
 
     # 5. Setup Optimizer
     try:
@@ -180,6 +225,10 @@ async def optimize(req: OptimizeRequest, request: Request):
         evaluator.close()
 
 
+app.include_router(router)
+app.include_router(router, prefix=GRAPH_PATH_PREFIX)
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
@@ -28,6 +28,10 @@ from mdo_framework.optimization.ax_algo_lib import (
 )
 
 
+def _square(x):
+    return np.array([x[0] ** 2])
+
+
 class TestAxOptimizationLibrary(unittest.TestCase):
     def _add_variable(
         self,
@@ -53,11 +57,8 @@ class TestAxOptimizationLibrary(unittest.TestCase):
         design_space = DesignSpace()
         self._add_variable(design_space, "x", 0.0, upper_bound)
         problem = OptimizationProblem(design_space)
-
-        def objective(x):
-            return np.array([x[0] ** 2])
-
-        problem.objective = MDOFunction(objective, "obj", expr="x**2")
+        # Module-level, so that the problem can be sent to trial processes.
+        problem.objective = MDOFunction(_square, "obj", expr="x**2")
         return problem
 
     def test_build_from_ax_parameters_validation_and_inference(self):
@@ -310,6 +311,142 @@ class TestAxOptimizationLibrary(unittest.TestCase):
                 self.assertEqual(budget_exhausted, expected_budget_exhausted)
                 client.mark_trial_abandoned.assert_called_once_with(trial_index=1)
 
+    def test_batch_trials_run_in_parallel(self):
+        trials = {0: {"x": 0.1}, 1: {"x": 0.2}, 2: {"x": 0.3}}
+
+        for use_threading in (True, False):
+            with self.subTest(use_threading=use_threading):
+                problem = self._make_problem()
+                client = MagicMock()
+                client.get_next_trials.side_effect = [trials, {}]
+                client.get_best_parameterization.return_value = (
+                    {"x": 0.1},
+                    ({"obj": (0.01, None)}, None),
+                    0,
+                    "0_0",
+                )
+
+                algo = AxOptimizationLibrary(client_factory=lambda c=client: c)
+                algo.execute(
+                    problem,
+                    max_iter=2,
+                    n_init=1,
+                    batch_size=3,
+                    n_processes=3,
+                    use_threading=use_threading,
+                    ax_parameters=[
+                        {"name": "x", "type": "range", "bounds": [0.0, 1.0]}
+                    ],
+                    ax_objectives=[{"name": "obj", "minimize": True}],
+                )
+
+                # The seeded baseline is completed with a mocked trial index.
+                completed = {
+                    call.kwargs["trial_index"]: call.kwargs["raw_data"]["obj"]
+                    for call in client.complete_trial.call_args_list
+                    if isinstance(call.kwargs["trial_index"], int)
+                }
+                self.assertEqual(set(completed), {0, 1, 2})
+                for trial_index, parameters in trials.items():
+                    self.assertAlmostEqual(completed[trial_index], parameters["x"] ** 2)
+                # Results computed in workers land in the parent database
+                self.assertGreaterEqual(len(problem.database), 3)
+
+    def test_trial_processes_are_never_forked(self):
+        algo = AxOptimizationLibrary()
+        problem = self._make_problem()
+        forked = AxSettings(n_processes=2, start_method="fork")
+        with (
+            self.assertRaisesRegex(ValueError, "start method 'fork'"),
+            algo._trial_executor(problem, forked),
+        ):
+            pass
+
+        # Closures cannot reach spawned workers.
+        problem.objective = MDOFunction(lambda x: x**2, "obj")
+        with (
+            self.assertRaisesRegex(ValueError, "picklable problem"),
+            algo._trial_executor(problem, AxSettings(n_processes=2)),
+        ):
+            pass
+
+    def test_parallel_trials_abandon_failures_and_exhausted_budget(self):
+        problem = self._make_problem()
+        client = MagicMock()
+        algo = AxOptimizationLibrary()
+        outcomes = {
+            0.1: ({"obj": np.array([0.01])}, None),
+            0.2: ValueError("boom"),
+            0.3: MaxIterReachedException(),
+        }
+
+        def fake_evaluate(x, design_vector_is_normalized=False):
+            outcome = outcomes[round(float(x[0]), 1)]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        problem.evaluate_functions = MagicMock(side_effect=fake_evaluate)
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            budget_exhausted = algo._execute_trials_in_parallel(
+                executor,
+                client,
+                problem,
+                {0: {"x": 0.1}, 1: {"x": 0.2}, 2: {"x": 0.3}},
+                {"obj"},
+            )
+
+        self.assertTrue(budget_exhausted)
+        client.complete_trial.assert_called_once_with(
+            trial_index=0, raw_data={"obj": 0.01}
+        )
+        abandoned = {
+            call.kwargs["trial_index"]
+            for call in client.mark_trial_abandoned.call_args_list
+        }
+        self.assertEqual(abandoned, {1, 2})
+
+    def test_asynchronous_loop_refills_free_slots(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        problem = self._make_problem()
+        problem.evaluate_functions = MagicMock(
+            side_effect=lambda x, design_vector_is_normalized=False: (
+                {"obj": np.array([x[0] ** 2])},
+                None,
+            )
+        )
+        client = MagicMock()
+        generated = iter(range(100))
+        client.get_next_trials.side_effect = lambda max_trials: {
+            index: {"x": index / 10.0}
+            for index in (next(generated) for _ in range(max_trials))
+        }
+
+        algo = AxOptimizationLibrary()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            budget_exhausted = algo._run_asynchronously(
+                executor,
+                client,
+                problem,
+                {"obj"},
+                n_workers=2,
+                max_trials=5,
+            )
+
+        self.assertFalse(budget_exhausted)
+        requested = [
+            call.kwargs["max_trials"] for call in client.get_next_trials.call_args_list
+        ]
+        # Two trials start in flight, then the pool is refilled as trials finish
+        self.assertEqual(requested[0], 2)
+        self.assertTrue(all(n in (1, 2) for n in requested[1:]))
+        self.assertEqual(sum(requested), 5)
+        self.assertEqual(client.complete_trial.call_count, 5)
+        self.assertEqual(len(algo.trial_history), 5)
+
     def test_extract_best_solution_contracts(self):
         problem = self._make_problem()
         client = MagicMock()
@@ -0,0 +1,215 @@
+"""
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this
+file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from services.execution.cache import (
+    EvaluationCache,
+    MemoryCacheBackend,
+    SingleFlight,
+    SQLiteCacheBackend,
+    build_evaluation_cache,
+    evaluation_key,
+)
+
+
+class TestEvaluationKey(unittest.TestCase):
+    def test_key_is_canonical(self):
+        k1 = evaluation_key("h", {"x": 1.0, "y": 2.0}, ["f", "g"])
+        k2 = evaluation_key("h", {"y": 2.0, "x": 1.0}, ["g", "f"])
+        self.assertEqual(k1, k2)
+
+    def test_key_normalizes_numbers(self):
+        self.assertEqual(
+            evaluation_key("h", {"x": 1, "v": [2, 3.0]}, ["f"]),
+            evaluation_key("h", {"x": 1.0, "v": [2.0, 3]}, ["f"]),
+        )
+        self.assertNotEqual(
+            evaluation_key("h", {"x": True}, ["f"]),
+            evaluation_key("h", {"x": 1.0}, ["f"]),
+        )
+
+    def test_key_depends_on_schema_inputs_and_namespace(self):
+        base = evaluation_key("h", {"x": 1.0}, ["f"])
+        self.assertNotEqual(base, evaluation_key("h2", {"x": 1.0}, ["f"]))
+        self.assertNotEqual(base, evaluation_key("h", {"x": 1.5}, ["f"]))
+        self.assertNotEqual(base, evaluation_key("h", {"x": 1.0}, ["f"], "v2"))
+
+
+class TestCacheBackends(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _backends(self):
+        return {
+            "memory": lambda **kw: MemoryCacheBackend(**kw),
+            "sqlite": lambda **kw: SQLiteCacheBackend(self.path, **kw),
+        }
+
+    def test_lru_eviction(self):
+        for name, factory in self._backends().items():
+            with self.subTest(backend=name):
+                backend = factory(max_entries=2)
+                with patch("services.execution.cache.time.time", side_effect=range(10)):
+                    backend.set("a", {"f": 1.0})
+                    backend.set("b", {"f": 2.0})
+                    # Touching "a" makes "b" the least recently used entry
+                    self.assertEqual(backend.get("a"), {"f": 1.0})
+                    backend.set("c", {"f": 3.0})
+                self.assertEqual(len(backend), 2)
+                self.assertIsNone(backend.get("b"))
+                self.assertEqual(backend.get("c"), {"f": 3.0})
+                backend.close()
+
+    def test_ttl_expiry(self):
+        for name, factory in self._backends().items():
+            with self.subTest(backend=name):
+                backend = factory(ttl=10.0)
+                with patch("services.execution.cache.time.time", return_value=100.0):
+                    backend.set("a", {"f": 1.0})
+                with patch("services.execution.cache.time.time", return_value=105.0):
+                    self.assertEqual(backend.get("a"), {"f": 1.0})
+                with patch("services.execution.cache.time.time", return_value=111.0):
+                    self.assertIsNone(backend.get("a"))
+                self.assertEqual(len(backend), 0)
+                backend.close()
+
+    def test_sqlite_persists_across_reopen(self):
+        backend = SQLiteCacheBackend(self.path)
+        backend.set("a", {"f": 1.5})
+        backend.close()
+
+        reopened = SQLiteCacheBackend(self.path)
+        self.assertEqual(reopened.get("a"), {"f": 1.5})
+        reopened.close()
+
+    def test_sqlite_hits_do_not_write(self):
+        backend = SQLiteCacheBackend(self.path, flush_every=3)
+        backend.set("a", {"f": 1.0})
+        changes = backend._conn.total_changes
+        for _ in range(2):
+            self.assertEqual(backend.get("a"), {"f": 1.0})
+        self.assertEqual(backend._conn.total_changes, changes)
+        self.assertFalse(backend._conn.in_transaction)
+
+        # The next set writes the buffered access times with its own commit.
+        backend.set("b", {"f": 2.0})
+        backend.set("c", {"f": 3.0})
+        changes = backend._conn.total_changes
+        for key in ("a", "b"):
+            backend.get(key)
+        self.assertEqual(backend._conn.total_changes, changes)
+        # So does reaching `flush_every` buffered lookups.
+        backend.get("c")
+        self.assertEqual(backend._conn.total_changes, changes + 3)
+        self.assertFalse(backend._conn.in_transaction)
+        backend.close()
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def test_hit_miss_stats(self):
+        cache = EvaluationCache(MemoryCacheBackend())
+        key = cache.key("h", {"x": 1.0}, ["f"])
+        self.assertIsNone(cache.get(key))
+        cache.set(key, {"f": 2.0})
+        self.assertEqual(cache.get(key), {"f": 2.0})
+        self.assertEqual(
+            cache.stats(),
+            {
+                "backend": "MemoryCacheBackend",
+                "entries": 1,
+                "hits": 1,
+                "misses": 1,
+                "hit_rate": 0.5,
+            },
+        )
+
+    def test_build_evaluation_cache(self):
+        self.assertIsNone(build_evaluation_cache("none", 10, 0.0))
+        cache = build_evaluation_cache("memory", 10, 0.0, namespace="v1")
+        self.assertIsInstance(cache.backend, MemoryCacheBackend)
+        self.assertEqual(cache.namespace, "v1")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = build_evaluation_cache(
+                "sqlite", 10, 0.0, path=os.path.join(tmpdir, "c.sqlite")
+            )
+            self.assertIsInstance(cache.backend, SQLiteCacheBackend)
+            cache.close()
+        with self.assertRaises(ValueError):
+            build_evaluation_cache("redis", 10, 0.0)
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"f": 1.0}
+
+        waiters = [asyncio.create_task(flights.do("k", compute)) for _ in range(3)]
+        other = asyncio.create_task(flights.do("other", compute))
+        await asyncio.sleep(0)
+        self.assertEqual(len(flights), 2)
+        release.set()
+
+        results = await asyncio.gather(*waiters, other)
+        self.assertEqual(results, [{"f": 1.0}] * 4)
+        self.assertEqual(calls, 2)
+        self.assertEqual(flights.coalesced, 2)
+        self.assertEqual(len(flights), 0)
+
+        # Finished calls are not reused.
+        await flights.do("k", compute)
+        self.assertEqual(calls, 3)
+
+    async def test_errors_are_shared_and_not_kept(self):
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise ValueError("boom")
+
+        waiters = [asyncio.create_task(flights.do("k", failing)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(len(flights), 0)
+
+    async def test_cancelled_caller_does_not_cancel_the_call(self):
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return 42
+
+        leader = asyncio.create_task(flights.do("k", compute))
+        follower = asyncio.create_task(flights.do("k", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        release.set()
+        self.assertEqual(await follower, 42)
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,7 +8,7 @@ import unittest
 
 import numpy as np
 
-from mdo_framework.core.components import ToolComponent
+from mdo_framework.core.components import ToolComponent, with_jacobian
 
 
 def simple_func(x, y):
@@ -60,19 +60,70 @@ class TestToolComponent(unittest.TestCase):
         self.assertAlmostEqual(out["b"][0], 20.0)
         self.assertAlmostEqual(out["c"][0], 11.0)
 
-    def test_derivatives_setup(self):
+    def test_analytical_jacobian(self):
+        calls = []
+
+        def product(x, y):
+            calls.append("func")
+            return x * y
+
+        def product_jacobian(x, y):
+            calls.append("jacobian")
+            return {"x": y, "y": x}
+
         comp = ToolComponent(
             name="deriv_comp",
-            func=simple_func,
+            func=product,
             inputs=["x", "y"],
             outputs=["z"],
-            derivatives=True,
+            jacobian=product_jacobian,
         )
-        # In GEMSEO, analytical derivatives are enabled or computed via jacobian methods.
-        input_data = {"x": np.array([2.0]), "y": np.array([3.0])}
-        comp.execute(input_data)
-        # Since _compute_jacobian is empty, we just verify it runs without crashing.
-        comp._compute_jacobian(inputs=["x", "y"], outputs=["z"])
+        self.assertTrue(comp.derivatives)
+        jac = comp.linearize(
+            {"x": np.array([2.0]), "y": np.array([3.0])}, compute_all_jacobians=True
+        )
+        np.testing.assert_array_equal(jac["z"]["x"], [[3.0]])
+        np.testing.assert_array_equal(jac["z"]["y"], [[2.0]])
+        # Exact derivatives cost one call, not one per input.
+        self.assertEqual(calls, ["func", "jacobian"])
+
+    def test_registered_jacobian_and_missing_entries(self):
+        @with_jacobian(lambda x, y: {"sum": {"x": 1.0}, "prod": {"x": y, "y": x}})
+        def sum_prod(x, y):
+            return x + y, x * y
+
+        comp = ToolComponent("sp", sum_prod, ["x", "y"], ["sum", "prod"])
+        self.assertTrue(comp.derivatives)
+        jac = comp.linearize(
+            {"x": np.array([2.0]), "y": np.array([3.0])}, compute_all_jacobians=True
+        )
+        np.testing.assert_array_equal(jac["sum"]["x"], [[1.0]])
+        # Pairs the Jacobian function leaves out are zero.
+        np.testing.assert_array_equal(jac["sum"]["y"], [[0.0]])
+        np.testing.assert_array_equal(jac["prod"]["x"], [[3.0]])
+
+    def test_jacobian_falls_back_to_finite_differences(self):
+        comp = ToolComponent("add", simple_func, ["x", "y"], ["z"])
+        self.assertFalse(comp.derivatives)
+        partials = comp.compute_jacobian({"x": np.array([2.0]), "y": np.array([3.0])})
+        np.testing.assert_allclose(partials["z"]["x"], [[1.0]])
+        np.testing.assert_allclose(partials["z"]["y"], [[1.0]])
+
+    def test_invalid_jacobians(self):
+        with self.assertRaisesRegex(ValueError, "no Jacobian"):
+            ToolComponent("add", simple_func, ["x", "y"], ["z"], derivatives=True)
+
+        comp = ToolComponent(
+            "add", simple_func, ["x", "y"], ["z"], jacobian=lambda x, y: {"w": 1.0}
+        )
+        with self.assertRaisesRegex(ValueError, "unknown input 'w'"):
+            comp.compute_jacobian({"x": 1.0, "y": 2.0})
+
+        comp = ToolComponent(
+            "add", simple_func, ["x", "y"], ["z"], jacobian=lambda x, y: {"x": [1, 2]}
+        )
+        with self.assertRaisesRegex(ValueError, "expected 1x1"):
+            comp.compute_jacobian({"x": 1.0, "y": 2.0, "z": 3.0})
 
     def test_kwargs_mapping_uses_input_names(self):
         """Function parameter names must match the declared input names.
@@ -113,6 +164,101 @@ class TestToolComponent(unittest.TestCase):
         with self.assertRaises(TypeError):
             comp.execute(input_data)
 
+    def test_memoization_reuses_outputs_per_input_slice(self):
+        calls = []
+
+        def counted(x, y):
+            calls.append((x, y))
+            return x + y
+
+        comp = ToolComponent(
+            name="memo",
+            func=counted,
+            inputs=["x", "y"],
+            outputs=["z"],
+            cache_size=2,
+        )
+
+        a = {"x": np.array([1.0]), "y": np.array([2.0])}
+        b = {"x": np.array([2.0]), "y": np.array([2.0])}
+        c = {"x": np.array([3.0]), "y": np.array([2.0])}
+
+        # Alternate points so GEMSEO's own last-input cache never answers.
+        self.assertAlmostEqual(comp.execute(a)["z"][0], 3.0)
+        self.assertAlmostEqual(comp.execute(b)["z"][0], 4.0)
+        self.assertAlmostEqual(comp.execute(a)["z"][0], 3.0)
+        self.assertEqual(len(calls), 2)
+
+        # "b" is now the least recently used slice and gets evicted by "c".
+        comp.execute(c)
+        comp.execute(b)
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(len(comp._memo), 2)
+
+    def test_memoization_disabled_by_default(self):
+        calls = []
+
+        def counted(x):
+            calls.append(x)
+            return x
+
+        comp = ToolComponent(name="plain", func=counted, inputs=["x"], outputs=["y"])
+        for x in (1.0, 2.0, 1.0):
+            comp.execute({"x": np.array([x])})
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len(comp._memo), 0)
+
+    def test_vectorized_batch_runs_in_one_call(self):
+        calls = []
+
+        def norm(x, y):
+            calls.append(np.shape(x))
+            return {"r": np.hypot(x, y), "scale": 2.0}
+
+        comp = ToolComponent(
+            name="norm",
+            func=norm,
+            inputs=["x", "y"],
+            outputs=["r", "scale"],
+            vectorized=True,
+        )
+        data = {"x": np.array([3.0, 5.0, 0.0]), "y": np.array([4.0, 12.0, 1.0])}
+        out = comp.compute_batch(data, 3)
+        np.testing.assert_allclose(out["r"], [5.0, 13.0, 1.0])
+        # Constant outputs apply to every point.
+        np.testing.assert_allclose(out["scale"], [2.0, 2.0, 2.0])
+        self.assertEqual(calls, [(3,)])
+
+        # A single point gets arrays too, not unpacked scalars.
+        out = comp.execute({"x": np.array([6.0]), "y": np.array([8.0])})
+        self.assertAlmostEqual(out["r"][0], 10.0)
+        self.assertEqual(calls[-1], (1,))
+
+    def test_vectorized_batch_checks_output_length(self):
+        comp = ToolComponent(
+            name="bad",
+            func=lambda x: x[:1],
+            inputs=["x"],
+            outputs=["y"],
+            vectorized=True,
+        )
+        with self.assertRaisesRegex(ValueError, "1 values of 'y' for 2 points"):
+            comp.compute_batch({"x": np.array([[1.0, 2.0], [3.0, 4.0]])}, 2)
+
+    def test_batch_of_scalar_tool_loops_over_points(self):
+        calls = []
+
+        def add(x, y):
+            calls.append((x, y))
+            return x + y
+
+        comp = ToolComponent(name="add", func=add, inputs=["x", "y"], outputs=["z"])
+        out = comp.compute_batch(
+            {"x": np.array([1.0, 2.0]), "y": np.array([10.0, 20.0])}, 2
+        )
+        np.testing.assert_allclose(out["z"], [11.0, 22.0])
+        self.assertEqual(calls, [(1.0, 10.0), (2.0, 20.0)])
+
 
 if __name__ == "__main__":
     unittest.main()
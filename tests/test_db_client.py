@@ -47,6 +47,28 @@ class TestFalkorDBClient(unittest.TestCase):
 
         self.assertEqual(graph, client.graph)
 
+    @patch("mdo_framework.db.client.FalkorDB")
+    def test_get_graph_caches_named_handles(self, mock_falkordb):
+        # Reset singleton instance
+        FalkorDBClient._instance = None
+
+        client = FalkorDBClient()
+        select_graph = client.client.select_graph
+        select_graph.side_effect = lambda name: f"handle:{name}"
+
+        self.assertIs(client.get_graph("mdo_graph"), client.graph)
+        self.assertEqual(client.get_graph("team_a"), "handle:team_a")
+        self.assertEqual(client.get_graph("team_a"), "handle:team_a")
+        self.assertEqual(client.get_graph("team-b"), "handle:team-b")
+        self.assertEqual(
+            [c.args[0] for c in select_graph.call_args_list],
+            ["mdo_graph", "team_a", "team-b"],
+        )
+
+        for name in ("", "a b", "x" * 65, "graph;DROP"):
+            with self.assertRaises(ValueError):
+                client.get_graph(name)
+
     @patch("mdo_framework.db.client.FalkorDB")
     def test_close(self, mock_falkordb):
         # Reset singleton instance
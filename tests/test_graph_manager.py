@@ -4,10 +4,11 @@ License, v. 2.0. If a copy of the MPL was not distributed with this
 file, You can obtain one at http://mozilla.org/MPL/2.0/.
 """
 
+import re
 import unittest
 from unittest.mock import MagicMock, patch
 
-from mdo_framework.db.graph_manager import GraphManager
+from mdo_framework.db.graph_manager import GraphManager, schema_digest
 
 
 class TestGraphManager(unittest.TestCase):
@@ -40,6 +41,181 @@ class TestGraphManager(unittest.TestCase):
         args, _ = mock_graph.query.call_args
         self.assertIn("MERGE (n:Tool {name: $name})", args[0])
 
+    @patch("mdo_framework.db.graph_manager.FalkorDBClient")
+    def test_import_schema(self, mock_client_cls):
+        mock_client_instance = mock_client_cls.return_value
+        mock_graph = MagicMock()
+        mock_client_instance.get_graph.return_value = mock_graph
+        mock_graph.query.return_value.result_set = [[2, 1, 1, 1]]
+
+        gm = GraphManager()
+        counts = gm.import_schema(
+            {
+                "variables": [
+                    {"name": "x", "value": 1.0, "lower": None},
+                    {"name": "y"},
+                ],
+                "tools": [
+                    {
+                        "name": "ToolA",
+                        "inputs": ["x"],
+                        "outputs": ["y"],
+                        "cacheable": True,
+                    }
+                ],
+            }
+        )
+
+        # Everything is written in one query
+        mock_graph.query.assert_called_once()
+        args, kwargs = mock_graph.query.call_args
+        self.assertIn("UNWIND $variables AS row", args[0])
+        self.assertIn("MERGE (v)-[:INPUTS_TO]->(t)", args[0])
+        self.assertIn("MERGE (t)-[:OUTPUTS]->(v)", args[0])
+        params = kwargs["params"]
+        self.assertEqual(
+            params["variables"][0],
+            {
+                "name": "x",
+                "props": {
+                    "name": "x",
+                    "value": 1.0,
+                    "param_type": "continuous",
+                    "value_type": "float",
+                },
+            },
+        )
+        self.assertEqual(
+            params["tools"],
+            [
+                {
+                    "name": "ToolA",
+                    "props": {"name": "ToolA", "fidelity": "high", "cacheable": True},
+                }
+            ],
+        )
+        self.assertEqual(params["inputs"], [{"variable": "x", "tool": "ToolA"}])
+        self.assertEqual(params["outputs"], [{"tool": "ToolA", "variable": "y"}])
+        self.assertEqual(
+            counts, {"variables": 2, "tools": 1, "inputs": 1, "outputs": 1}
+        )
+
+    @patch("mdo_framework.db.graph_manager.FalkorDBClient")
+    def test_import_schema_empty_stages(self, mock_client_cls):
+        mock_client_instance = mock_client_cls.return_value
+        mock_graph = MagicMock()
+        mock_client_instance.get_graph.return_value = mock_graph
+        mock_graph.query.return_value.result_set = [[1, 0, 0, 0]]
+
+        gm = GraphManager()
+        cases = {
+            "no tools": {"variables": [{"name": "x"}]},
+            "no input edges": {
+                "variables": [{"name": "y"}],
+                "tools": [{"name": "Source", "outputs": ["y"]}],
+            },
+        }
+        for case, schema in cases.items():
+            with self.subTest(case):
+                gm.import_schema(schema)
+                args, kwargs = mock_graph.query.call_args
+                # No stage aggregates over the rows of the previous one, so an
+                # empty list cannot drop the row the later stages run on.
+                self.assertNotIn("WITH", args[0])
+                stages = re.findall(r"CALL \{(.*?)\}\n", args[0], re.DOTALL)
+                self.assertEqual(len(stages), 4)
+                for stage, name in zip(
+                    stages, ("variables", "tools", "inputs", "outputs")
+                ):
+                    self.assertIn(f"UNWIND ${name} AS", stage)
+                    self.assertIn(f"RETURN count(*) AS {name}", stage)
+                params = kwargs["params"]
+                self.assertEqual(params["inputs"], [])
+                if case == "no tools":
+                    self.assertEqual(params["tools"], [])
+                    self.assertEqual(params["outputs"], [])
+                else:
+                    self.assertEqual(
+                        params["outputs"], [{"tool": "Source", "variable": "y"}]
+                    )
+
+    @patch("mdo_framework.db.graph_manager.FalkorDBClient")
+    def test_get_graph_schema_snapshot(self, mock_client_cls):
+        mock_client_instance = mock_client_cls.return_value
+        mock_graph = MagicMock()
+        mock_client_instance.get_graph.return_value = mock_graph
+        mock_graph.query.return_value.result_set = []
+
+        gm = GraphManager()
+        schema = gm.get_graph_schema()
+        reads = mock_graph.query.call_count
+        self.assertIs(gm.get_graph_schema(), schema)
+        self.assertEqual(mock_graph.query.call_count, reads)
+
+        # Every write drops the snapshot
+        writes = [
+            lambda: gm.add_tool("ToolA"),
+            lambda: gm.add_variable("x"),
+            lambda: gm.connect_input_to_tool("x", "ToolA"),
+            lambda: gm.connect_tool_to_output("ToolA", "y"),
+            lambda: gm.import_schema({}),
+            gm.clear_graph,
+        ]
+        mock_graph.query.return_value.result_set = [[0, 0, 0, 0]]
+        for write in writes:
+            write()
+            mock_graph.query.return_value.result_set = []
+            self.assertIsNot(gm.get_graph_schema(), schema)
+            schema = gm.get_graph_schema()
+            mock_graph.query.return_value.result_set = [[0, 0, 0, 0]]
+
+    @patch("mdo_framework.db.graph_manager.FalkorDBClient")
+    def test_get_graph_schema_snapshot_ttl_and_races(self, mock_client_cls):
+        mock_client_instance = mock_client_cls.return_value
+        mock_graph = MagicMock()
+        mock_client_instance.get_graph.return_value = mock_graph
+        mock_graph.query.return_value.result_set = []
+
+        gm = GraphManager(snapshot_ttl=60.0)
+        with patch("mdo_framework.db.graph_manager.time.monotonic", return_value=0.0):
+            schema = gm.get_graph_schema()
+        with patch("mdo_framework.db.graph_manager.time.monotonic", return_value=30.0):
+            self.assertIs(gm.get_graph_schema(), schema)
+        with patch("mdo_framework.db.graph_manager.time.monotonic", return_value=61.0):
+            self.assertIsNot(gm.get_graph_schema(), schema)
+
+        # A read racing a write does not store its (possibly stale) result
+        gm.invalidate_snapshot()
+        read = gm._read_graph_schema
+
+        def racing_read():
+            result = read()
+            gm.invalidate_snapshot()
+            return result
+
+        with patch.object(gm, "_read_graph_schema", side_effect=racing_read):
+            gm.get_graph_schema()
+        self.assertIsNone(gm._snapshot)
+
+    @patch("mdo_framework.db.graph_manager.FalkorDBClient")
+    def test_schema_digest_is_kept_with_the_snapshot(self, mock_client_cls):
+        mock_graph = mock_client_cls.return_value.get_graph.return_value
+        mock_graph.query.return_value.result_set = []
+
+        gm = GraphManager()
+        with patch(
+            "mdo_framework.db.graph_manager.schema_digest", wraps=schema_digest
+        ) as digest:
+            schema, tag = gm.get_schema_snapshot()
+            self.assertEqual(tag, schema_digest({"tools": [], "variables": []}))
+            self.assertEqual(gm.get_schema_snapshot(), (schema, tag))
+            self.assertIs(gm.get_graph_schema(), schema)
+            self.assertEqual(digest.call_count, 1)
+
+            gm.invalidate_snapshot()
+            gm.get_schema_snapshot()
+            self.assertEqual(digest.call_count, 2)
+
     @patch("mdo_framework.db.graph_manager.FalkorDBClient")
     def test_get_tools(self, mock_client_cls):
         mock_client_instance = mock_client_cls.return_value
@@ -184,7 +360,7 @@ class TestGraphManager(unittest.TestCase):
 
         res2 = MagicMock()
         node_a = MagicMock()
-        node_a.properties = {"name": "ToolA", "fidelity": "high"}
+        node_a.properties = {"name": "ToolA", "fidelity": "high", "cacheable": True}
         res2.result_set = [[node_a, ["VarX"], ["VarY"]]]
 
         mock_graph.query.side_effect = [res1, res2]
@@ -198,6 +374,7 @@ class TestGraphManager(unittest.TestCase):
         self.assertEqual(schema["tools"][0]["name"], "ToolA")
         self.assertEqual(schema["tools"][0]["inputs"], ["VarX"])
         self.assertEqual(schema["tools"][0]["outputs"], ["VarY"])
+        self.assertTrue(schema["tools"][0]["cacheable"])
         self.assertEqual(len(schema["variables"]), 1)
 
 
@@ -10,8 +10,11 @@ from unittest.mock import MagicMock, patch
 import httpx
 import numpy as np
 from gemseo.core.discipline import Discipline
+from gemseo.mda.factory import MDAFactory
 
+from mdo_framework.core.components import ToolComponent
 from mdo_framework.core.evaluators import LocalEvaluator
+from mdo_framework.core.plan import ExecutionPlan
 from mdo_framework.optimization.optimizer import (
     BayesianOptimizer,
     OptimizationConfigurationError,
@@ -110,6 +113,72 @@ class TestLocalEvaluator(OptimizerTestCase):
         with self.assertRaises(KeyError):
             evaluator.evaluate({"x": 0.5, "y": 0.5, "c": 0.0}, ["f_xy"])
 
+    def test_evaluate_gradient(self):
+        def paraboloid(x, y):
+            return (x - 1.0) ** 2 + y
+
+        def paraboloid_jacobian(x, y):
+            return {"x": 2.0 * (x - 1.0), "y": 1.0}
+
+        def component():
+            return ToolComponent(
+                "P", paraboloid, ["x", "y"], ["f"], jacobian=paraboloid_jacobian
+            )
+
+        plan = ExecutionPlan([[component()]], {"y": np.array([0.5])})
+        chain = MDAFactory().create("MDAChain", disciplines=[component()])
+        chain.default_input_data["y"] = np.array([0.5])
+        for problem in (plan, chain):
+            with self.subTest(problem=type(problem).__name__):
+                grads = LocalEvaluator(problem).evaluate_gradient({"x": 3.0}, ["f"])
+                self.assertEqual(list(grads["f"]), ["x"])
+                np.testing.assert_allclose(grads["f"]["x"], [4.0])
+
+    def test_evaluate_many_runs_batches_in_one_pass(self):
+        calls = []
+
+        def paraboloid(x, y):
+            calls.append(np.shape(x))
+            return (x - 1.0) ** 2 + y
+
+        plan = ExecutionPlan(
+            [[ToolComponent("P", paraboloid, ["x", "y"], ["f"], vectorized=True)]],
+            {"y": np.array([0.5])},
+        )
+        evaluator = LocalEvaluator(plan)
+        results = evaluator.evaluate_many([{"x": 1.0}, {"x": 3.0, "y": 0.0}], ["f"])
+        self.assertEqual(results, [{"f": 0.5}, {"f": 4.0}])
+        self.assertEqual(calls, [(2,)])
+        self.assertEqual(evaluator.evaluate_many([], ["f"]), [])
+
+    def test_evaluate_many_reports_failing_points(self):
+        def checked(x):
+            if x < 0:
+                raise ValueError("x must be positive")
+            return x
+
+        plan = ExecutionPlan([[ToolComponent("C", checked, ["x"], ["f"])]])
+        evaluator = LocalEvaluator(plan)
+        outcomes = evaluator.evaluate_many(
+            [{"x": 1.0}, {"x": -1.0}], ["f"], return_exceptions=True
+        )
+        self.assertEqual(outcomes[0], {"f": 1.0})
+        self.assertIsInstance(outcomes[1], ValueError)
+        with self.assertRaises(ValueError):
+            evaluator.evaluate_many([{"x": -1.0}], ["f"])
+
+        # Problems without batch support are evaluated point by point.
+        self.assertEqual(
+            LocalEvaluator(self.mock_prob).evaluate_many(
+                [{"x": 0.5, "y": 0.5, "c": 0.0}], ["f_xy"]
+            ),
+            [
+                LocalEvaluator(self.mock_prob).evaluate(
+                    {"x": 0.5, "y": 0.5, "c": 0.0}, ["f_xy"]
+                )
+            ],
+        )
+
 
 class TestRemoteEvaluator(unittest.TestCase):
     def test_happy_path(self):
@@ -245,6 +314,85 @@ class TestRemoteEvaluator(unittest.TestCase):
                         {}, ["f_xy"]
                     )
 
+    def test_evaluate_many_uses_batch_endpoint(self):
+        mock_client = MagicMock()
+        mock_client.post.side_effect = [
+            MagicMock(
+                json=MagicMock(
+                    return_value={
+                        "results": [
+                            {"results": {"f_xy": 1.0}},
+                            {"error": "Unknown input", "status_code": 400},
+                        ]
+                    }
+                )
+            ),
+            MagicMock(
+                json=MagicMock(
+                    return_value={
+                        "results": [{"error": "Execution failed", "status_code": 500}]
+                    }
+                )
+            ),
+        ]
+
+        evaluator = RemoteEvaluator("http://fake-url", client=mock_client, batch_size=2)
+        points = [{"x": 0.1}, {"x": 0.2}, {"x": 0.3}]
+        outcomes = evaluator.evaluate_many(points, ["f_xy"], return_exceptions=True)
+
+        self.assertEqual(mock_client.post.call_count, 2)
+        mock_client.post.assert_any_call(
+            "http://fake-url/evaluate/batch",
+            json={"points": points[:2], "objectives": ["f_xy"]},
+        )
+        self.assertEqual(outcomes[0], {"f_xy": 1.0})
+        self.assertIsInstance(outcomes[1], RemoteEvaluationContractError)
+        self.assertIsInstance(outcomes[2], RemoteEvaluationTransportError)
+
+        mock_client.post.side_effect = None
+        mock_client.post.return_value = MagicMock(
+            json=MagicMock(
+                return_value={"results": [{"error": "bad", "status_code": 422}]}
+            )
+        )
+        with self.assertRaises(RemoteEvaluationContractError):
+            evaluator.evaluate_many([{"x": 0.1}], ["f_xy"])
+
+    def test_evaluate_many_falls_back_without_batch_endpoint(self):
+        request = httpx.Request("POST", "http://fake-url/evaluate/batch")
+
+        def fake_post(url, json):
+            if url.endswith("/batch"):
+                return MagicMock(
+                    raise_for_status=MagicMock(
+                        side_effect=httpx.HTTPStatusError(
+                            "not found",
+                            request=request,
+                            response=httpx.Response(404, request=request),
+                        )
+                    )
+                )
+            return MagicMock(
+                json=MagicMock(return_value={"results": {"f_xy": json["inputs"]["x"]}})
+            )
+
+        mock_client = MagicMock(post=MagicMock(side_effect=fake_post))
+        evaluator = RemoteEvaluator("http://fake-url", client=mock_client)
+
+        outcomes = evaluator.evaluate_many(
+            [{"x": float(i)} for i in range(5)], ["f_xy"]
+        )
+        self.assertEqual([o["f_xy"] for o in outcomes], [0.0, 1.0, 2.0, 3.0, 4.0])
+
+        # The missing endpoint is remembered and not probed again
+        mock_client.post.reset_mock()
+        evaluator.evaluate_many([{"x": 1.0}], ["f_xy"])
+        mock_client.post.assert_called_once_with(
+            "http://fake-url/evaluate",
+            json={"inputs": {"x": 1.0}, "objectives": ["f_xy"]},
+        )
+        self.assertEqual(evaluator.evaluate_many([], ["f_xy"]), [])
+
     @patch("mdo_framework.optimization.optimizer.httpx.Client")
     def test_close_only_closes_owned_client(self, mock_httpx_client):
         owned_client = MagicMock()
@@ -0,0 +1,303 @@
+"""
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this
+file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import threading
+import unittest
+
+import numpy as np
+
+from mdo_framework.core.components import ToolComponent
+from mdo_framework.core.plan import MDA_SOLVERS, CoupledCluster, ExecutionPlan
+
+
+def _wide_plan(aero, struct, max_workers):
+    """Two independent tools fed by design variables, then a combining tool."""
+    return ExecutionPlan(
+        [
+            [
+                ToolComponent("Aero", aero, inputs=["x"], outputs=["drag"]),
+                ToolComponent("Struct", struct, inputs=["x"], outputs=["mass"]),
+            ],
+            [
+                ToolComponent(
+                    "Perf",
+                    lambda drag, mass: drag + mass,
+                    inputs=["drag", "mass"],
+                    outputs=["range"],
+                )
+            ],
+        ],
+        {"x": np.array([2.0])},
+        max_workers=max_workers,
+    )
+
+
+def _coupled_tools():
+    """a = x + 0.5 b and b = 0.5 a, so that a = 4 x / 3."""
+    return [
+        ToolComponent("T1", lambda x, b: x + 0.5 * b, inputs=["x", "b"], outputs=["a"]),
+        ToolComponent("T2", lambda a: 0.5 * a, inputs=["a"], outputs=["b"]),
+    ]
+
+
+def _coupled_tools_with_jacobians():
+    return [
+        ToolComponent(
+            "T1",
+            lambda x, b: x + 0.5 * b,
+            inputs=["x", "b"],
+            outputs=["a"],
+            jacobian=lambda x, b: {"x": 1.0, "b": 0.5},
+        ),
+        ToolComponent(
+            "T2",
+            lambda a: 0.5 * a,
+            inputs=["a"],
+            outputs=["b"],
+            jacobian=lambda a: {"a": 0.5},
+        ),
+    ]
+
+
+class TestExecutionPlan(unittest.TestCase):
+    def test_sequential_execution(self):
+        plan = _wide_plan(lambda x: 2 * x, lambda x: x**2, max_workers=1)
+        self.assertEqual(plan.input_names, ["x"])
+        self.assertEqual(plan.output_names, ["drag", "mass", "range"])
+
+        out = plan.execute()
+        self.assertAlmostEqual(out["range"][0], 8.0)
+        out = plan.execute({"x": np.array([3.0])})
+        self.assertAlmostEqual(out["range"][0], 15.0)
+        self.assertIsNone(plan._executor)
+
+    def test_independent_tools_run_concurrently(self):
+        # Each tool waits for the other one: this only completes if both run
+        # at the same time.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def aero(x):
+            barrier.wait()
+            return 2 * x
+
+        def struct(x):
+            barrier.wait()
+            return x**2
+
+        plan = _wide_plan(aero, struct, max_workers=2)
+        try:
+            out = plan.execute({"x": np.array([3.0])})
+            self.assertAlmostEqual(out["drag"][0], 6.0)
+            self.assertAlmostEqual(out["mass"][0], 9.0)
+            self.assertAlmostEqual(out["range"][0], 15.0)
+        finally:
+            plan.cleanup()
+        self.assertIsNone(plan._executor)
+
+    def test_tool_errors_propagate(self):
+        def failing(x):
+            raise ValueError("diverged")
+
+        plan = _wide_plan(failing, lambda x: x, max_workers=2)
+        try:
+            with self.assertRaisesRegex(ValueError, "diverged"):
+                plan.execute()
+        finally:
+            plan.cleanup()
+
+    def test_execute_batch(self):
+        calls = []
+
+        def aero(x):
+            calls.append(np.shape(x))
+            return 2.0 * x
+
+        plan = ExecutionPlan(
+            [
+                [ToolComponent("Aero", aero, ["x"], ["drag"], vectorized=True)],
+                [
+                    ToolComponent(
+                        "Perf", lambda drag, m: drag + m, ["drag", "m"], ["range"]
+                    )
+                ],
+            ],
+            {"x": np.array([1.0]), "m": np.array([0.5])},
+        )
+        out = plan.execute_batch(
+            [{"x": np.array([1.0])}, {"x": np.array([2.0]), "m": np.array([1.0])}, {}]
+        )
+        np.testing.assert_allclose(out["drag"], [2.0, 4.0, 2.0])
+        np.testing.assert_allclose(out["range"], [2.5, 5.0, 2.5])
+        self.assertEqual(calls, [(3,)])
+        self.assertEqual(plan.execute_batch([]), {})
+
+    def test_linearize_chains_tool_and_cluster_derivatives(self):
+        square = ToolComponent(
+            "Square",
+            lambda u: u**2,
+            inputs=["u"],
+            outputs=["x"],
+            jacobian=lambda u: {"u": 2.0 * u},
+        )
+        scale = ToolComponent(
+            "Scale",
+            lambda a, u: a * u,
+            inputs=["a", "u"],
+            outputs=["f"],
+            jacobian=lambda a, u: {"a": u, "u": a},
+        )
+        cluster = CoupledCluster(
+            _coupled_tools_with_jacobians(), solver="newton", tolerance=1e-12
+        )
+        plan = ExecutionPlan([[square], [cluster], [scale]], {"u": np.array([3.0])})
+
+        # x = u^2, a = 4 x / 3 and f = a u = 4 u^3 / 3, so df/du = 4 u^2.
+        jac = plan.linearize(output_names=["f", "a"])
+        self.assertEqual(list(jac), ["f", "a"])
+        self.assertAlmostEqual(jac["f"]["u"][0, 0], 36.0, places=8)
+        self.assertAlmostEqual(jac["a"]["u"][0, 0], 8.0, places=8)
+
+        jac = plan.linearize({"u": np.array([1.0])}, ["u"], ["x"])
+        self.assertEqual(jac["x"]["u"].tolist(), [[2.0]])
+
+    def test_linearize_vector_outputs(self):
+        spread = ToolComponent(
+            "Spread",
+            lambda x: np.array([x, 2.0 * x]),
+            inputs=["x"],
+            outputs=["v"],
+            jacobian=lambda x: {"x": [1.0, 2.0]},
+        )
+        total = ToolComponent(
+            "Total",
+            lambda v: np.sum(v),
+            inputs=["v"],
+            outputs=["s"],
+            jacobian=lambda v: {"v": np.ones(len(v))},
+        )
+        plan = ExecutionPlan([[spread], [total]], {"x": np.array([1.5])})
+        jac = plan.linearize(output_names=["v", "s"])
+        self.assertEqual(jac["v"]["x"].tolist(), [[1.0], [2.0]])
+        self.assertEqual(jac["s"]["x"].tolist(), [[3.0]])
+
+
+class TestCoupledCluster(unittest.TestCase):
+    def test_solvers_converge(self):
+        for solver in MDA_SOLVERS:
+            with self.subTest(solver=solver):
+                cluster = CoupledCluster(
+                    _coupled_tools(), solver=solver, tolerance=1e-10, max_iter=50
+                )
+                self.assertEqual(cluster.input_names, ["x"])
+                self.assertEqual(cluster.output_names, ["a", "b"])
+                out = cluster.compute_outputs({"x": np.array([3.0])})
+                self.assertAlmostEqual(out["a"][0], 4.0, places=6)
+                self.assertAlmostEqual(out["b"][0], 2.0, places=6)
+
+                stats = cluster.convergence
+                self.assertEqual(stats["solver"], solver)
+                self.assertTrue(stats["converged"])
+                self.assertLessEqual(stats["residual"], 1e-10)
+                self.assertGreater(stats["iterations"], 0)
+                self.assertLessEqual(stats["iterations"], 50)
+
+    def test_newton_uses_analytical_jacobians(self):
+        tools = _coupled_tools_with_jacobians()
+        cluster = CoupledCluster(tools, solver="newton", tolerance=1e-12)
+        out = cluster.compute_outputs({"x": np.array([3.0])})
+        self.assertAlmostEqual(out["a"][0], 4.0, places=10)
+        # A linear system is solved by a single exact Newton step.
+        self.assertLessEqual(cluster.convergence["iterations"], 2)
+
+        jac = cluster.compute_jacobian({"x": np.array([3.0])})
+        self.assertAlmostEqual(jac["a"]["x"][0, 0], 4.0 / 3.0, places=10)
+        self.assertAlmostEqual(jac["b"]["x"][0, 0], 2.0 / 3.0, places=10)
+
+    def test_iteration_limit_is_reported(self):
+        cluster = CoupledCluster(_coupled_tools(), tolerance=1e-12, max_iter=2)
+        cluster.compute_outputs({"x": np.array([3.0])})
+        self.assertEqual(cluster.convergence["iterations"], 2)
+        self.assertFalse(cluster.convergence["converged"])
+
+    def test_warm_start_reuses_last_converged_state(self):
+        cold = CoupledCluster(_coupled_tools(), tolerance=1e-8)
+        warm = CoupledCluster(_coupled_tools(), tolerance=1e-8, warm_start=True)
+        for cluster in (cold, warm):
+            cluster.compute_outputs({"x": np.array([3.0])})
+            self.assertFalse(cluster.convergence["warm_started"])
+
+        cold_out = cold.compute_outputs({"x": np.array([3.01])})
+        warm_out = warm.compute_outputs({"x": np.array([3.01])})
+        self.assertAlmostEqual(warm_out["a"][0], cold_out["a"][0], places=6)
+        self.assertTrue(warm.convergence["warm_started"])
+        self.assertLess(warm.convergence["iterations"], cold.convergence["iterations"])
+
+        # Explicit coupling values still override the warm start state.
+        warm.compute_outputs({"x": np.array([3.0]), "b": np.array([0.0])})
+        self.assertFalse(warm.convergence["warm_started"])
+
+    def test_warm_start_falls_back_on_divergence(self):
+        unstable = {"on": False}
+
+        def t2(a):
+            # Blows up for the coupling values near the previous solution.
+            return float("nan") if unstable["on"] and a > 3.4 else 0.5 * a
+
+        cluster = CoupledCluster(
+            [_coupled_tools()[0], ToolComponent("T2", t2, inputs=["a"], outputs=["b"])],
+            tolerance=1e-8,
+            max_iter=50,
+            warm_start=True,
+        )
+        cluster.compute_outputs({"x": np.array([3.0])})
+        unstable["on"] = True
+
+        out = cluster.compute_outputs({"x": np.array([2.5])})
+        self.assertAlmostEqual(out["a"][0], 10.0 / 3.0, places=6)
+        stats = cluster.convergence
+        self.assertTrue(stats["restarted"])
+        self.assertFalse(stats["warm_started"])
+        self.assertTrue(stats["converged"])
+        # The discarded warm attempt is not counted in the cold solve.
+        self.assertGreater(stats["warm_iterations"], 0)
+        unstable["on"] = False
+        cold = CoupledCluster(_coupled_tools(), tolerance=1e-8, max_iter=50)
+        cold.compute_outputs({"x": np.array([2.5])})
+        self.assertEqual(stats["iterations"], cold.convergence["iterations"])
+
+        # The restarted solution seeds the next evaluation.
+        cluster.compute_outputs({"x": np.array([2.5])})
+        self.assertTrue(cluster.convergence["warm_started"])
+        self.assertFalse(cluster.convergence["restarted"])
+        self.assertEqual(cluster.convergence["warm_iterations"], 0)
+
+    def test_batch_runs_point_by_point(self):
+        cluster = CoupledCluster(_coupled_tools(), tolerance=1e-8, warm_start=True)
+        out = cluster.compute_batch({"x": np.array([3.0, 3.0, 6.0])}, 3)
+        np.testing.assert_allclose(out["a"], [4.0, 4.0, 8.0], atol=1e-6)
+        # The second point started from the solution of the first.
+        self.assertTrue(cluster.convergence["warm_started"])
+
+    def test_invalid_settings(self):
+        with self.assertRaisesRegex(ValueError, "Unknown MDA solver"):
+            CoupledCluster(_coupled_tools(), solver="broyden")
+        with self.assertRaises(ValueError):
+            CoupledCluster(_coupled_tools(), max_iter=0)
+
+    def test_plan_reports_cluster_convergence(self):
+        cluster = CoupledCluster(_coupled_tools())
+        post = ToolComponent("Post", lambda a: a + 1.0, inputs=["a"], outputs=["f"])
+        plan = ExecutionPlan([[cluster], [post]], {"x": np.array([3.0])})
+        self.assertEqual(plan.convergence, {})
+
+        out = plan.execute()
+        self.assertAlmostEqual(out["f"][0], 5.0, places=4)
+        self.assertEqual(list(plan.convergence), ["T1+T2"])
+        self.assertTrue(plan.convergence["T1+T2"]["converged"])
+
+
+if __name__ == "__main__":
+    unittest.main()
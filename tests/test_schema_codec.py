@@ -0,0 +1,97 @@
+"""
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this
+file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import json
+import unittest
+
+from mdo_framework.core.schema_codec import (
+    COMPACT_SCHEMA_VERSION,
+    decode_schema,
+    encode_compact_schema,
+    is_compact_schema,
+)
+from mdo_framework.core.topology import TopologicalAnalyzer
+
+SCHEMA = {
+    "tools": [
+        {"name": "Aero", "fidelity": "high", "inputs": ["span"], "outputs": ["lift"]},
+        {
+            "name": "Struct",
+            "fidelity": "low",
+            "cacheable": True,
+            "inputs": ["span", "lift"],
+            "outputs": ["mass"],
+        },
+    ],
+    "variables": [
+        {"name": "span", "value": 10.0, "lower": 5.0, "upper": 15.0},
+        {"name": "lift"},
+        {"name": "mass", "param_type": "continuous"},
+    ],
+}
+
+
+class TestSchemaCodec(unittest.TestCase):
+    def test_round_trip(self):
+        compact = encode_compact_schema(SCHEMA)
+        self.assertTrue(is_compact_schema(compact))
+        self.assertFalse(is_compact_schema(SCHEMA))
+        self.assertEqual(compact["version"], COMPACT_SCHEMA_VERSION)
+        self.assertEqual(compact["tools"]["inputs"], [[0], [0, 1]])
+        self.assertEqual(decode_schema(compact), SCHEMA)
+        # Plain schemas pass through
+        self.assertIs(decode_schema(SCHEMA), SCHEMA)
+
+    def test_compact_schema_is_smaller(self):
+        schema = {
+            "tools": [
+                {
+                    "name": f"T{i}",
+                    "fidelity": "high",
+                    "inputs": [f"x{i}"],
+                    "outputs": [f"y{i}"],
+                }
+                for i in range(100)
+            ],
+            "variables": [
+                {
+                    "name": f"{kind}{i}",
+                    "param_type": "continuous",
+                    "value_type": "float",
+                }
+                for kind in "xy"
+                for i in range(100)
+            ],
+        }
+        compact = encode_compact_schema(schema)
+        self.assertEqual(decode_schema(compact), schema)
+        self.assertLess(len(json.dumps(compact)), len(json.dumps(schema)) / 2)
+
+    def test_edges_to_undeclared_variables(self):
+        schema = {
+            "tools": [{"name": "T", "inputs": ["a"], "outputs": ["b"]}],
+            "variables": [],
+        }
+        compact = encode_compact_schema(schema)
+        self.assertEqual(compact["names"], ["a", "b"])
+        self.assertEqual(decode_schema(compact), schema)
+
+    def test_invalid_compact_schema(self):
+        compact = encode_compact_schema(SCHEMA)
+        with self.assertRaises(ValueError):
+            decode_schema({**compact, "version": COMPACT_SCHEMA_VERSION + 1})
+        with self.assertRaises(ValueError):
+            decode_schema({**compact, "names": []})
+
+    def test_analyzer_consumes_compact_schema(self):
+        analyzer = TopologicalAnalyzer(encode_compact_schema(SCHEMA))
+        design_vars, tools = analyzer.resolve_dependencies(["mass"])
+        self.assertEqual(design_vars, ["span"])
+        self.assertEqual([t["name"] for t in tools], ["Struct", "Aero"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,7 @@ file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 # ruff: noqa: E402
 import unittest
+from collections import OrderedDict
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -28,6 +29,7 @@ from mdo_framework.optimization.optimizer import (
     OptimizationConfigurationError,
     RemoteEvaluationTransportError,
 )
+from services.execution.main import InstancePool
 from services.execution.main import app as execution_app
 from services.graph.main import app as graph_app
 from services.optimization.main import app as optimization_app
@@ -38,6 +40,11 @@ class TestGraphService(unittest.TestCase):
         self.client = TestClient(graph_app)
         self.mock_gm = mock_gm_instance  # The instance created at module level
 
+    def _serve_schema(self, schema):
+        from mdo_framework.db.graph_manager import schema_digest
+
+        self.mock_gm.get_schema_snapshot.return_value = (schema, schema_digest(schema))
+
     def test_create_variable(self):
         # The endpoint calls gm.add_variable
         response = self.client.post("/variables", json={"name": "x", "value": 1.0})
@@ -53,11 +60,29 @@ class TestGraphService(unittest.TestCase):
         )
 
     def test_get_schema(self):
-        self.mock_gm.get_graph_schema.return_value = {"tools": [], "variables": []}
+        self._serve_schema({"tools": [], "variables": []})
         response = self.client.get("/schema")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"tools": [], "variables": []})
 
+    def test_get_schema_etag_revalidation(self):
+        from mdo_framework.db.graph_manager import schema_digest
+
+        schema = {"tools": [], "variables": [{"name": "x", "value": 1.0}]}
+        self._serve_schema(schema)
+        etag = self.client.get("/schema").headers["ETag"]
+        self.assertEqual(etag, f'"{schema_digest(schema)}"')
+
+        for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            response = self.client.get("/schema", headers={"If-None-Match": header})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.headers["ETag"], etag)
+            self.assertEqual(response.content, b"")
+
+        response = self.client.get("/schema", headers={"If-None-Match": '"stale"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), schema)
+
     def test_clear_graph(self):
         response = self.client.post("/clear")
         self.assertEqual(response.status_code, 200)
@@ -94,12 +119,219 @@ class TestGraphService(unittest.TestCase):
         self.assertEqual(response.json()["type"], "output")
         self.mock_gm.connect_tool_to_output.assert_called_with("ToolA", "varY")
 
+    def test_get_schema_compact_negotiation(self):
+        from mdo_framework.core.schema_codec import (
+            COMPACT_SCHEMA_MEDIA_TYPE,
+            decode_schema,
+        )
+
+        schema = {
+            "tools": [
+                {"name": "T", "fidelity": "high", "inputs": ["x"], "outputs": []}
+            ],
+            "variables": [{"name": "x", "value": 1.0}],
+        }
+        self._serve_schema(schema)
+
+        plain = self.client.get("/schema", headers={"Accept": "application/json"})
+        self.assertEqual(plain.headers["content-type"], "application/json")
+        compact = self.client.get(
+            "/schema",
+            headers={"Accept": f"{COMPACT_SCHEMA_MEDIA_TYPE}, application/json;q=0.9"},
+        )
+        self.assertEqual(compact.headers["content-type"], COMPACT_SCHEMA_MEDIA_TYPE)
+        self.assertEqual(compact.headers["vary"], "Accept")
+        self.assertEqual(decode_schema(compact.json()), schema)
+        # Each representation has its own tag
+        self.assertNotEqual(compact.headers["ETag"], plain.headers["ETag"])
+
+        response = self.client.get(
+            "/schema",
+            headers={
+                "Accept": COMPACT_SCHEMA_MEDIA_TYPE,
+                "If-None-Match": compact.headers["ETag"],
+            },
+        )
+        self.assertEqual(response.status_code, 304)
+
+        # JSON stays the answer when preferred or when compact is refused
+        for accept in (
+            f"{COMPACT_SCHEMA_MEDIA_TYPE};q=0.5, application/json",
+            f"{COMPACT_SCHEMA_MEDIA_TYPE};q=0",
+        ):
+            response = self.client.get("/schema", headers={"Accept": accept})
+            self.assertEqual(response.json(), schema)
+
+    def test_import_schema(self):
+        self.mock_gm.import_schema.return_value = {
+            "variables": 2,
+            "tools": 1,
+            "inputs": 1,
+            "outputs": 1,
+        }
+        response = self.client.post(
+            "/schema/import",
+            json={
+                "variables": [{"name": "x", "value": 1.0}, {"name": "y"}],
+                "tools": [{"name": "ToolA", "inputs": ["x"], "outputs": ["y"]}],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "status": "imported",
+                "variables": 2,
+                "tools": 1,
+                "inputs": 1,
+                "outputs": 1,
+            },
+        )
+        schema = self.mock_gm.import_schema.call_args[0][0]
+        self.assertEqual(schema["tools"][0]["inputs"], ["x"])
+        self.assertEqual(schema["variables"][0]["value"], 1.0)
+
+        response = self.client.post("/schema/import", json={"tools": [{"inputs": []}]})
+        self.assertEqual(response.status_code, 422)
+
+    def test_named_graphs(self):
+        from services.graph.main import _graph_context
+
+        MockGraphManager.reset_mock()
+        self._serve_schema({"tools": [], "variables": []})
+        version = _graph_context("team_a").events.version
+        default_version = _graph_context("mdo_graph").events.version
+
+        response = self.client.post("/graphs/team_a/tools", json={"name": "ToolA"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get("/schema", headers={"X-Graph-Name": "team_b"})
+        self.assertEqual(response.status_code, 200)
+        names = [c.kwargs["graph_name"] for c in MockGraphManager.call_args_list]
+        self.assertIn("team_a", names)
+        self.assertIn("team_b", names)
+
+        # Events are published to the edited graph only
+        self.assertEqual(_graph_context("team_a").events.version, version + 1)
+        self.assertEqual(_graph_context("mdo_graph").events.version, default_version)
+
+        response = self.client.get("/graphs/bad%20name/schema")
+        self.assertEqual(response.status_code, 400)
+
+    def test_named_graphs_evict_idle_graphs(self):
+        import asyncio
+
+        from fastapi import HTTPException
+
+        from services.graph import main
+
+        async def run():
+            with (
+                patch.object(main, "_graphs", OrderedDict()),
+                patch.object(main, "GRAPH_MAX_GRAPHS", 2),
+            ):
+                default = main._graph_context("mdo_graph")
+                busy = main.get_graph_context("team_a")
+                team_a = next(busy)
+                team_b = main._graph_context("team_b")
+                stream = team_b.events.stream(keepalive=10)
+                await anext(stream)
+
+                # The default graph is pinned and both named graphs are busy
+                with self.assertRaises(HTTPException) as ctx:
+                    main._graph_context("team_c")
+                self.assertEqual(ctx.exception.status_code, 503)
+
+                # Once its request is done, team_a is evicted
+                next(busy, None)
+                self.assertEqual(team_a.in_flight, 0)
+                main._graph_context("team_c")
+                self.assertEqual(list(main._graphs), ["mdo_graph", "team_b", "team_c"])
+                self.assertIs(main._graph_context("mdo_graph"), default)
+
+                # team_b is idle once its subscriber leaves; evicting it
+                # closes its broker
+                await stream.aclose()
+                main._graph_context("team_d")
+                self.assertEqual(list(main._graphs), ["team_c", "mdo_graph", "team_d"])
+                later = [event async for event in team_b.events.stream(keepalive=10)]
+                self.assertEqual(len(later), 1)
+
+        asyncio.run(run())
+
+    def test_schema_event_broker_close(self):
+        import asyncio
+
+        from services.graph.events import SchemaEventBroker
+
+        async def run():
+            broker = SchemaEventBroker()
+            stream = broker.stream(keepalive=10)
+            await anext(stream)
+            await asyncio.to_thread(broker.close)
+            self.assertEqual([event async for event in stream], [])
+            self.assertEqual(len(broker), 0)
+            # Later subscribers only get their hello
+            later = [event async for event in broker.stream(keepalive=10)]
+            self.assertEqual(len(later), 1)
+
+        asyncio.run(run())
+
+    def test_mutations_publish_schema_events(self):
+        from mdo_framework.db.client import DEFAULT_GRAPH_NAME
+        from services.graph.main import _graph_context
+
+        self._serve_schema({"tools": [], "variables": []})
+        schema_events = _graph_context(DEFAULT_GRAPH_NAME).events
+        version = schema_events.version
+        self.client.post("/tools", json={"name": "ToolA"})
+        self.client.post("/variables", json={"name": "varX"})
+        self.client.post(
+            "/connections/input", json={"source": "varX", "target": "ToolA"}
+        )
+        self.client.post(
+            "/connections/output", json={"source": "ToolA", "target": "varY"}
+        )
+        self.client.post("/clear")
+        self.assertEqual(schema_events.version, version + 5)
+        self.client.get("/schema")
+        self.assertEqual(schema_events.version, version + 5)
+
+    def test_schema_event_stream(self):
+        import asyncio
+
+        from services.graph.events import SchemaEventBroker
+
+        async def run():
+            broker = SchemaEventBroker(max_queued=1)
+            broker.publish("tool")
+            stream = broker.stream(keepalive=0.01)
+            hello = await anext(stream)
+            self.assertEqual(len(broker), 1)
+            self.assertEqual(await anext(stream), ": keepalive\n\n")
+            # Mutations happen in threadpool workers.
+            await asyncio.to_thread(broker.publish, "variable")
+            await asyncio.to_thread(broker.publish, "clear")
+            changed = await anext(stream)
+            await stream.aclose()
+            self.assertEqual(len(broker), 0)
+            return hello, changed
+
+        hello, changed = asyncio.run(run())
+        self.assertEqual(hello, 'event: hello\ndata: {"version": 1}\n\n')
+        # A lagging subscriber only keeps the latest change.
+        self.assertEqual(
+            changed,
+            'event: schema-changed\ndata: {"version": 3, "reason": "clear"}\n\n',
+        )
+
 
 class TestExecutionService(unittest.TestCase):
     def setUp(self):
         # Force a hard wipe of cached state properties before each test
         execution_app.state.schema_provider = None
         execution_app.state.problem_pool = None
+        execution_app.state.evaluation_cache = None
+        execution_app.state.single_flight = None
 
         self.client = TestClient(execution_app)
 
@@ -218,6 +450,437 @@ class TestExecutionService(unittest.TestCase):
             )
             self.assertEqual(response.status_code, 422)
 
+    def test_evaluate_batch(self):
+        from services.execution.main import TOOL_REGISTRY, ProblemPool, SchemaProvider
+
+        with patch.dict(execution_app.state.__dict__, {}):
+            mock_client = AsyncMock()
+            mock_resp = MagicMock()
+            mock_resp.status_code = 200
+            mock_resp.json.return_value = {
+                "tools": [
+                    {"name": "Paraboloid", "inputs": ["x", "y"], "outputs": ["f_xy"]},
+                ],
+                "variables": [{"name": "x"}, {"name": "y"}],
+            }
+            mock_client.get.return_value = mock_resp
+            execution_app.state.schema_provider = SchemaProvider(mock_client)
+            execution_app.state.problem_pool = ProblemPool(TOOL_REGISTRY, size=2)
+
+            payload = {
+                "points": [
+                    {"x": 3.0, "y": -4.0},
+                    {"x": 0.0, "y": 0.0},
+                    {"x": 1.0, "y": 1.0},
+                ],
+                "objectives": ["f_xy"],
+            }
+            response = self.client.post("/evaluate/batch", json=payload)
+            self.assertEqual(response.status_code, 200)
+            results = response.json()["results"]
+            self.assertEqual(
+                [r["results"]["f_xy"] for r in results], [-15.0, 22.0, 27.0]
+            )
+            # Schema is fetched once for the whole batch
+            self.assertEqual(mock_client.get.call_count, 1)
+
+            # Unknown inputs in any point reject the whole batch
+            response = self.client.post(
+                "/evaluate/batch",
+                json={"points": [{"x": 1.0}, {"z": 1.0}], "objectives": ["f_xy"]},
+            )
+            self.assertEqual(response.status_code, 422)
+            self.assertIn("Unknown inputs", response.json()["detail"])
+
+    def test_evaluate_reports_mda_convergence(self):
+        from services.execution.main import ProblemPool, SchemaProvider
+
+        registry = {
+            "T1": lambda x, b: x + 0.5 * b,
+            "T2": lambda a: 0.5 * a,
+        }
+        with patch.dict(execution_app.state.__dict__, {}):
+            mock_client = AsyncMock()
+            mock_resp = MagicMock()
+            mock_resp.json.return_value = {
+                "tools": [
+                    {"name": "T1", "inputs": ["x", "b"], "outputs": ["a"]},
+                    {"name": "T2", "inputs": ["a"], "outputs": ["b"]},
+                ],
+                "variables": [{"name": "x"}, {"name": "a"}, {"name": "b"}],
+            }
+            mock_client.get.return_value = mock_resp
+            execution_app.state.schema_provider = SchemaProvider(mock_client)
+            execution_app.state.problem_pool = ProblemPool(registry, size=1)
+
+            response = self.client.post(
+                "/evaluate", json={"inputs": {"x": 3.0}, "objectives": ["a"]}
+            )
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertAlmostEqual(body["results"]["a"], 4.0, places=4)
+            stats = body["convergence"]["T1+T2"]
+            self.assertEqual(stats["solver"], "gauss_seidel")
+            self.assertTrue(stats["converged"])
+
+            response = self.client.post(
+                "/evaluate/batch",
+                json={"points": [{"x": 3.0}, {"x": 6.0}], "objectives": ["a"]},
+            )
+            self.assertEqual(response.status_code, 200)
+            for outcome in response.json()["results"]:
+                self.assertIn("T1+T2", outcome["convergence"])
+
+    def test_evaluate_batch_vectorized(self):
+        from services.execution.cache import EvaluationCache, MemoryCacheBackend
+        from services.execution.main import ProblemPool, SchemaProvider
+
+        calls = []
+
+        def paraboloid(x, y):
+            calls.append(np.shape(x))
+            if np.any(np.asarray(x) < 0):
+                raise ValueError("x must be positive")
+            return (x - 3.0) ** 2 + x * y + (y + 4.0) ** 2 - 3.0
+
+        with patch.dict(execution_app.state.__dict__, {}):
+            mock_client = AsyncMock()
+            mock_resp = MagicMock()
+            mock_resp.json.return_value = {
+                "tools": [
+                    {
+                        "name": "Paraboloid",
+                        "inputs": ["x", "y"],
+                        "outputs": ["f_xy"],
+                        "vectorized": True,
+                    },
+                ],
+                "variables": [{"name": "x"}, {"name": "y"}],
+            }
+            mock_client.get.return_value = mock_resp
+            execution_app.state.schema_provider = SchemaProvider(mock_client)
+            execution_app.state.problem_pool = ProblemPool(
+                {"Paraboloid": paraboloid}, size=1
+            )
+            execution_app.state.evaluation_cache = EvaluationCache(MemoryCacheBackend())
+
+            points = [
+                {"x": 3.0, "y": -4.0},
+                {"x": 0.0, "y": 0.0},
+                {"x": 3.0, "y": -4.0},
+            ]
+            response = self.client.post(
+                "/evaluate/batch", json={"points": points, "objectives": ["f_xy"]}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                [r["results"]["f_xy"] for r in response.json()["results"]],
+                [-15.0, 22.0, -15.0],
+            )
+            # Duplicate points run once, in a single vectorized call.
+            self.assertEqual(calls, [(2,)])
+
+            # Cached points are not run again.
+            points.append({"x": 1.0, "y": 1.0})
+            response = self.client.post(
+                "/evaluate/batch", json={"points": points, "objectives": ["f_xy"]}
+            )
+            self.assertEqual(response.json()["results"][3]["results"]["f_xy"], 27.0)
+            self.assertEqual(calls[1:], [(1,)])
+
+            # A failing pass falls back to per-point evaluation.
+            calls.clear()
+            response = self.client.post(
+                "/evaluate/batch",
+                json={
+                    "points": [{"x": -1.0, "y": 0.0}, {"x": 2.0, "y": 0.0}],
+                    "objectives": ["f_xy"],
+                },
+            )
+            failed, succeeded = response.json()["results"]
+            self.assertEqual(failed["status_code"], 400)
+            self.assertEqual(succeeded["results"]["f_xy"], 14.0)
+            self.assertEqual(calls, [(2,), (1,), (1,)])
+
+    def test_evaluate_batch_reports_point_errors(self):
+        from services.execution.main import (
+            TOOL_REGISTRY,
+            ProblemPool,
+            SchemaProvider,
+            execute_problem,
+        )
+
+        def flaky_execute(prob, inputs, objectives):
+            if inputs["x"] < 0:
+                raise ValueError("x must be positive")
+            return execute_problem(prob, inputs, objectives)
+
+        with patch.dict(execution_app.state.__dict__, {}):
+            mock_client = AsyncMock()
+            mock_resp = MagicMock()
+            mock_resp.json.return_value = {
+                "tools": [
+                    {"name": "Paraboloid", "inputs": ["x", "y"], "outputs": ["f_xy"]},
+                ],
+                "variables": [{"name": "x"}, {"name": "y"}],
+            }
+            mock_client.get.return_value = mock_resp
+            execution_app.state.schema_provider = SchemaProvider(mock_client)
+            execution_app.state.problem_pool = ProblemPool(TOOL_REGISTRY, size=1)
+
+            with patch(
+                "services.execution.main.execute_problem", side_effect=flaky_execute
+            ):
+                response = self.client.post(
+                    "/evaluate/batch",
+                    json={
+                        "points": [{"x": -1.0, "y": 0.0}, {"x": 3.0, "y": -4.0}],
+                        "objectives": ["f_xy"],
+                    },
+                )
+            self.assertEqual(response.status_code, 200)
+            failed, succeeded = response.json()["results"]
+            self.assertEqual(failed["status_code"], 400)
+            self.assertEqual(failed["error"], "x must be positive")
+            self.assertEqual(succeeded["results"]["f_xy"], -15.0)
+
+    def test_evaluate_reuses_cached_results(self):
+        from services.execution.cache import (
+            EvaluationCache,
+            MemoryCacheBackend,
+            SingleFlight,
+        )
+        from services.execution.main import (
+            TOOL_REGISTRY,
+            ProblemPool,
+            SchemaProvider,
+            execute_problem,
+        )
+
+        with patch.dict(execution_app.state.__dict__, {}):
+            mock_client = AsyncMock()
+            mock_resp = MagicMock()
+            mock_resp.json.return_value = {
+                "tools": [
+                    {"name": "Paraboloid", "inputs": ["x", "y"], "outputs": ["f_xy"]},
+                ],
+                "variables": [{"name": "x"}, {"name": "y"}],
+            }
+            mock_client.get.return_value = mock_resp
+            execution_app.state.schema_provider = SchemaProvider(mock_client)
+            execution_app.state.problem_pool = ProblemPool(TOOL_REGISTRY, size=1)
+            execution_app.state.evaluation_cache = EvaluationCache(MemoryCacheBackend())
+
+            payload = {"inputs": {"x": 3.0, "y": -4.0}, "objectives": ["f_xy"]}
+            with patch(
+                "services.execution.main.execute_problem", side_effect=execute_problem
+            ) as mock_execute:
+                first = self.client.post("/evaluate", json=payload)
+                second = self.client.post("/evaluate", json=payload)
+                batch = self.client.post(
+                    "/evaluate/batch",
+                    json={
+                        "points": [{"y": -4.0, "x": 3.0}, {"x": 0.0, "y": 0.0}],
+                        "objectives": ["f_xy"],
+                    },
+                )
+
+            self.assertEqual(first.json(), second.json())
+            self.assertEqual(
+                [r["results"]["f_xy"] for r in batch.json()["results"]],
+                [-15.0, 22.0],
+            )
+            # Only the first point and the new batch point were computed
+            self.assertEqual(mock_execute.call_count, 2)
+
+            stats = self.client.get("/cache/stats").json()
+            self.assertEqual(stats["hits"], 2)
+            self.assertEqual(stats["misses"], 2)
+            self.assertEqual(stats["entries"], 2)
+
+            execution_app.state.evaluation_cache = None
+            self.assertEqual(self.client.get("/cache/stats").json(), {"backend": None})
+
+            execution_app.state.single_flight = SingleFlight()
+            self.assertEqual(
+                self.client.get("/cache/stats").json(),
+                {"backend": None, "coalesced": 0, "in_flight": 0},
+            )
+
+    def test_evaluate_coalesces_concurrent_duplicates(self):
+        import asyncio
+
+        from services.execution.cache import SingleFlight
+        from services.execution.main import (
+            TOOL_REGISTRY,
+            ProblemPool,
+            SchemaEnvelope,
+            evaluate_on_pool,
+            execute_problem,
+        )
+
+        envelope = SchemaEnvelope(
+            {
+                "tools": [
+                    {"name": "Paraboloid", "inputs": ["x", "y"], "outputs": ["f_xy"]},
+                ],
+                "variables": [{"name": "x"}, {"name": "y"}],
+            }
+        )
+
+        async def run():
+            pool = ProblemPool(TOOL_REGISTRY, size=2)
+            flights = SingleFlight()
+            points = [{"x": 3.0, "y": -4.0}] * 4 + [{"x": 0.0, "y": 0.0}]
+            try:
+                return flights, await asyncio.gather(
+                    *(
+                        evaluate_on_pool(pool, envelope, p, ["f_xy"], flights=flights)
+                        for p in points
+                    )
+                )
+            finally:
+                await pool.teardown()
+
+        with patch(
+            "services.execution.main.execute_problem", side_effect=execute_problem
+        ) as mock_execute:
+            flights, results = asyncio.run(run())
+
+        self.assertEqual(
+            [r["f_xy"] for r in results], [-15.0, -15.0, -15.0, -15.0, 22.0]
+        )
+        # Callers get their own copies of the shared result.
+        self.assertIsNot(results[0], results[1])
+        self.assertEqual(mock_execute.call_count, 2)
+        self.assertEqual(flights.coalesced, 3)
+
+    def test_evaluate_named_graphs(self):
+        import asyncio
+
+        from services.execution.main import (
+            TOOL_REGISTRY,
+            ProblemPool,
+            SchemaProvider,
+            _graph_context,
+        )
+
+        with patch.dict(execution_app.state.__dict__, {}):
+            mock_client = AsyncMock()
+            mock_resp = MagicMock(status_code=200, headers={})
+            mock_resp.json.return_value = {
+                "tools": [
+                    {"name": "Paraboloid", "inputs": ["x", "y"], "outputs": ["f_xy"]},
+                ],
+                "variables": [{"name": "x"}, {"name": "y"}],
+            }
+            mock_client.get.return_value = mock_resp
+            default_pool = ProblemPool(TOOL_REGISTRY, size=1)
+            execution_app.state.schema_provider = SchemaProvider(mock_client)
+            execution_app.state.problem_pool = default_pool
+            execution_app.state.graphs = OrderedDict()
+            execution_app.state.graph_tasks = []
+
+            payload = {"inputs": {"x": 3.0, "y": -4.0}, "objectives": ["f_xy"]}
+            with (
+                patch("services.execution.main.SCHEMA_EVENTS", False),
+                patch("services.execution.main.POOL_SIZE", 1),
+            ):
+                response = self.client.post("/graphs/team_a/evaluate", json=payload)
+                self.assertEqual(response.json()["results"]["f_xy"], -15.0)
+                response = self.client.post(
+                    "/evaluate", json=payload, headers={"X-Graph-Name": "team_a"}
+                )
+                self.assertEqual(response.json()["results"]["f_xy"], -15.0)
+
+            self.assertEqual(list(execution_app.state.graphs), ["team_a"])
+            context = execution_app.state.graphs["team_a"]
+            self.assertEqual(context.schema_provider.graph_name, "team_a")
+            self.assertIsNot(context.problem_pool, default_pool)
+            self.assertEqual(len(context.problem_pool.pools), 1)
+            self.assertEqual(len(default_pool.pools), 0)
+            self.assertEqual(context.in_flight, 0)
+            self.assertTrue(
+                mock_client.get.call_args.args[0].endswith("/graphs/team_a/schema")
+            )
+            # The background pre-warm task of the new graph
+            self.assertEqual(len(context.tasks), 1)
+            self.assertEqual(execution_app.state.graph_tasks, [])
+
+            request = MagicMock()
+            request.app.state = execution_app.state
+            context = asyncio.run(_graph_context(request, "mdo_graph"))
+            self.assertIs(context.schema_provider, execution_app.state.schema_provider)
+            self.assertIs(context.problem_pool, default_pool)
+
+    def test_named_graphs_evict_least_recently_used_idle_graph(self):
+        import asyncio
+
+        from fastapi import HTTPException
+
+        from services.execution.main import (
+            SchemaProvider,
+            _graph_context,
+            get_graph_context,
+        )
+
+        request = MagicMock()
+        request.app.state.schema_provider = SchemaProvider(AsyncMock())
+        request.app.state.graphs = OrderedDict()
+
+        async def run_test():
+            hold = get_graph_context(request, "team_a")
+            team_a = await anext(hold)
+            team_b = await _graph_context(request, "team_b")
+            await _graph_context(request, "team_a")
+            self.assertEqual(list(request.app.state.graphs), ["team_b", "team_a"])
+
+            # team_a is busy, so the idle team_b makes room for team_c
+            await _graph_context(request, "team_c")
+            self.assertEqual(list(request.app.state.graphs), ["team_a", "team_c"])
+            self.assertEqual(len(team_b.tasks), 2)
+            self.assertTrue(all(t.cancelled() for t in team_b.tasks))
+            self.assertTrue(
+                all(t.done() for t in team_b.problem_pool._background_tasks)
+            )
+
+            # Every remaining graph is busy
+            hold_c = get_graph_context(request, "team_c")
+            await anext(hold_c)
+            with self.assertRaises(HTTPException) as ctx:
+                await _graph_context(request, "team_d")
+            self.assertEqual(ctx.exception.status_code, 503)
+
+            # Once team_a's request is done it is evicted in turn
+            await anext(hold, None)
+            self.assertEqual(team_a.in_flight, 0)
+            await _graph_context(request, "team_d")
+            self.assertEqual(list(request.app.state.graphs), ["team_c", "team_d"])
+            await anext(hold_c, None)
+
+            for context in request.app.state.graphs.values():
+                await context.close()
+
+        with (
+            patch("services.execution.main.SCHEMA_EVENTS", True),
+            patch("services.execution.main.MAX_GRAPHS", 2),
+            patch("services.execution.main.prewarm_pool", AsyncMock()),
+            patch.object(SchemaProvider, "watch", lambda _, cb: asyncio.sleep(3600)),
+        ):
+            asyncio.run(run_test())
+
+    def test_evaluate_batch_payload_limits(self):
+        response = self.client.post(
+            "/evaluate/batch", json={"points": [], "objectives": ["f_xy"]}
+        )
+        self.assertEqual(response.status_code, 422)
+
+        response = self.client.post(
+            "/evaluate/batch",
+            json={"points": [{"x": 1.0}, {}], "objectives": ["f_xy"]},
+        )
+        self.assertEqual(response.status_code, 422)
+
     def test_evaluate_payload_limits(self):
         # inputs > 100
         large_inputs = {f"var_{i}": 1.0 for i in range(101)}
@@ -358,6 +1021,121 @@ class TestExecutionService(unittest.TestCase):
             asyncio.run(provider.get_schema())
         self.assertEqual(context.exception.status_code, 503)
 
+    def test_schema_provider_revalidates_with_etag(self):
+        import asyncio
+
+        from services.execution.main import SCHEMA_ACCEPT, SchemaProvider
+
+        schema = {"tools": [], "variables": [{"name": "x"}]}
+        ok = MagicMock(status_code=200, headers={"ETag": '"v1"'})
+        ok.json.return_value = schema
+        not_modified = MagicMock(status_code=304, headers={"ETag": '"v1"'})
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = [ok, not_modified]
+        provider = SchemaProvider(mock_client)
+
+        async def run():
+            first = await provider.get_schema()
+            provider.expiry = 0.0
+            second = await provider.get_schema()
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertIs(first, second)
+        self.assertEqual(provider.etag, '"v1"')
+        self.assertGreater(provider.expiry, 0.0)
+        first_call, second_call = mock_client.get.call_args_list
+        self.assertNotIn("If-None-Match", first_call.kwargs["headers"])
+        self.assertEqual(second_call.kwargs["headers"]["If-None-Match"], '"v1"')
+        self.assertEqual(first_call.kwargs["headers"]["Accept"], SCHEMA_ACCEPT)
+        # The 304 body is never parsed.
+        not_modified.json.assert_not_called()
+
+    def test_schema_provider_refreshes_on_schema_events(self):
+        import asyncio
+        from contextlib import asynccontextmanager
+
+        from services.execution.main import SchemaProvider
+
+        schemas = [
+            {"tools": [], "variables": [{"name": "x"}]},
+            {"tools": [], "variables": [{"name": "x"}]},
+            {"tools": [], "variables": [{"name": "x"}, {"name": "y"}]},
+        ]
+        responses = []
+        for schema in schemas:
+            resp = MagicMock(status_code=200, headers={})
+            resp.json.return_value = schema
+            responses.append(resp)
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = responses
+
+        lines = [
+            "event: hello",
+            'data: {"version": 0}',
+            "",
+            ": keepalive",
+            "",
+            "event: schema-changed",
+            'data: {"version": 1, "reason": "tool"}',
+            "",
+            "event: schema-changed",
+            'data: {"version": 2, "reason": "variable"}',
+            "",
+        ]
+
+        async def aiter_lines():
+            for line in lines:
+                yield line
+
+        @asynccontextmanager
+        async def stream(method, url, **kwargs):
+            self.assertTrue(url.endswith("/schema/events"))
+            resp = MagicMock()
+            resp.aiter_lines = aiter_lines
+            yield resp
+
+        mock_client.stream = stream
+        provider = SchemaProvider(mock_client)
+        changes = []
+
+        async def on_change(envelope):
+            changes.append(envelope.known_vars)
+
+        asyncio.run(provider.listen(on_change))
+        # Every event refetched the schema; only real changes were reported.
+        self.assertEqual(mock_client.get.call_count, 3)
+        self.assertEqual(changes, [{"x"}, {"x", "y"}])
+        self.assertGreater(provider.expiry, 0.0)
+
+    def test_schema_provider_watch_reconnects(self):
+        import asyncio
+
+        from services.execution.main import SchemaProvider
+
+        provider = SchemaProvider(AsyncMock())
+        calls = 0
+
+        async def listen(on_change=None):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise httpx.ConnectError("down")
+            if calls == 2:
+                return
+            raise asyncio.CancelledError
+
+        async def run():
+            with (
+                patch.object(provider, "listen", side_effect=listen),
+                patch("services.execution.main.asyncio.sleep", new=AsyncMock()),
+            ):
+                await provider.watch()
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(run())
+        self.assertEqual(calls, 3)
+
     def test_schema_provider_json_errors(self):
         from services.execution.main import SchemaProvider
 
@@ -431,6 +1209,74 @@ class TestExecutionService(unittest.TestCase):
         )
         self.assertIn("obj1", env.known_objectives)
 
+    def test_schema_envelope_pruned(self):
+        from services.execution.main import SchemaEnvelope
+
+        env = SchemaEnvelope(
+            {
+                "tools": [
+                    {"name": "Paraboloid", "inputs": ["x", "y"], "outputs": ["f_xy"]},
+                    {"name": "Drag", "inputs": ["z"], "outputs": ["cd"]},
+                    {"name": "Range", "inputs": ["cd", "x"], "outputs": ["r"]},
+                ],
+                "variables": [{"name": "x"}, {"name": "y"}, {"name": "z"}],
+            }
+        )
+
+        sub = env.pruned(["f_xy"])
+        self.assertEqual([t["name"] for t in sub.data["tools"]], ["Paraboloid"])
+        self.assertEqual(sub.known_vars, {"x", "y"})
+        self.assertEqual(sub.source_hash, env.hash)
+        self.assertNotEqual(sub.hash, env.hash)
+        self.assertIs(env.pruned(["f_xy"]), sub)
+
+        # Upstream tools are kept, in schema order, whatever the objective order
+        both = env.pruned(["r", "f_xy"])
+        self.assertEqual(
+            [t["name"] for t in both.data["tools"]], ["Paraboloid", "Drag", "Range"]
+        )
+        self.assertIs(env.pruned(["f_xy", "r"]), both)
+        self.assertEqual(env.pruned(["r", "f_xy"]).hash, env.hash)
+
+    def test_evaluate_builds_pruned_problem(self):
+        from services.execution.main import TOOL_REGISTRY, ProblemPool, SchemaProvider
+
+        with patch.dict(execution_app.state.__dict__, {}):
+            mock_client = AsyncMock()
+            mock_resp = MagicMock()
+            # "Unregistered" has no implementation: building the full schema
+            # would fail, so a successful call proves the problem was pruned.
+            mock_resp.json.return_value = {
+                "tools": [
+                    {"name": "Paraboloid", "inputs": ["x", "y"], "outputs": ["f_xy"]},
+                    {"name": "Unregistered", "inputs": ["z"], "outputs": ["g"]},
+                ],
+                "variables": [{"name": "x"}, {"name": "y"}, {"name": "z"}],
+            }
+            mock_client.get.return_value = mock_resp
+            pool = ProblemPool(TOOL_REGISTRY, size=1)
+            execution_app.state.schema_provider = SchemaProvider(mock_client)
+            execution_app.state.problem_pool = pool
+
+            response = self.client.post(
+                "/evaluate",
+                json={
+                    "inputs": {"x": 3.0, "y": -4.0, "z": 1.0},
+                    "objectives": ["f_xy"],
+                },
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["results"]["f_xy"], -15.0)
+            self.assertEqual(len(pool.pools), 1)
+
+            response = self.client.post(
+                "/evaluate",
+                json={"inputs": {"z": 1.0}, "objectives": ["g"]},
+            )
+            self.assertEqual(response.status_code, 500)
+            # The failed sub-schema build leaves the working pool in place
+            self.assertEqual(len(pool.pools), 1)
+
     def test_to_float_integer(self):
         from services.execution.main import to_float
 
@@ -560,7 +1406,9 @@ class TestProblemPool(unittest.TestCase):
         async def run_test():
             # Add a mock instance to the pool
             mock_inst = MagicMock()
-            await self.pool.pool.put(mock_inst)
+            queue = InstancePool()
+            await queue.put(mock_inst)
+            self.pool.pools["hash"] = queue
 
             # create a placeholder task in the background set
             async def dummy_task():
@@ -572,7 +1420,8 @@ class TestProblemPool(unittest.TestCase):
             await self.pool.teardown()
 
             # Pool should be empty, cleanup should have been called in thread
-            self.assertTrue(self.pool.pool.empty())
+            self.assertTrue(queue.empty())
+            self.assertEqual(len(self.pool.pools), 0)
             # Background task should be cancelled
             self.assertTrue(t.cancelled())
 
@@ -591,10 +1440,10 @@ class TestProblemPool(unittest.TestCase):
                 "variables": [{"name": "x"}, {"name": "y"}],
             },
         )
-        self.pool.current_hash = envelope.hash
 
         async def run_test():
             mock_inst = MagicMock()
+            self.pool.pools[envelope.hash] = InstancePool()
 
             # Mock the to_thread call inside _replenish_one so we don't actually hang building a real problem
             with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_thread:
@@ -606,8 +1455,8 @@ class TestProblemPool(unittest.TestCase):
                 # Wait briefly for the task to finish spinning up and populating the pool
                 await asyncio.sleep(0.1)
 
-                self.assertFalse(self.pool.pool.empty())
-                new_inst = await self.pool.pool.get()
+                self.assertFalse(self.pool.pools[envelope.hash].empty())
+                new_inst = await self.pool.pools[envelope.hash].get()
                 self.assertIsNotNone(new_inst)
 
                 # cleanup of mock_inst was sent to thread
@@ -634,7 +1483,9 @@ class TestProblemPool(unittest.TestCase):
             with self.assertRaises(HTTPException) as context:
                 await self.pool.get_instance(envelope)
             self.assertEqual(context.exception.status_code, 500)
-            self.assertIsNone(self.pool.current_hash)  # hash reset
+            # Nothing is kept, so the next request tries again
+            self.assertEqual(len(self.pool.pools), 0)
+            self.assertEqual(self.pool._builds, {})
 
         asyncio.run(run_test())
 
@@ -657,22 +1508,279 @@ class TestProblemPool(unittest.TestCase):
         async def run_test():
             # Simply patch the get_instance logic to simulate a timeout directly
             # since all lower level starvation combinations are hanging the pytest event loop.
-            original_get = self.pool.pool.get
+            queue = InstancePool()
 
             async def instant_timeout():
                 raise TimeoutError("Starvation Timeout")
 
-            self.pool.pool.get = instant_timeout
+            queue.get = instant_timeout
 
             # Pretend pool is built so we skip the build logic block
-            self.pool.current_hash = envelope.hash
+            self.pool.pools[envelope.hash] = queue
 
-            try:
+            with self.assertRaises(HTTPException) as context:
+                await self.pool.get_instance(envelope)
+            self.assertEqual(context.exception.status_code, 503)
+
+        asyncio.run(run_test())
+
+    def test_problem_pool_keeps_one_pool_per_subgraph(self):
+        import asyncio
+
+        from services.execution.main import SchemaEnvelope
+
+        full = SchemaEnvelope(
+            {
+                "tools": [
+                    {"name": "A", "inputs": ["x"], "outputs": ["a"]},
+                    {"name": "B", "inputs": ["x"], "outputs": ["b"]},
+                    {"name": "C", "inputs": ["x"], "outputs": ["c"]},
+                ],
+                "variables": [{"name": "x"}],
+            },
+        )
+        self.pool.max_subgraphs = 2
+        built = []
+
+        def fake_build(schema, registry, donor=None):
+            built.append([t["name"] for t in schema["tools"]])
+            return MagicMock()
+
+        async def run_test():
+            with patch("services.execution.main.build_and_init", fake_build):
+                for objective in ("a", "b", "a", "c"):
+                    inst, inst_hash = await self.pool.get_instance(
+                        full.pruned([objective])
+                    )
+                    await self.pool.release_instance(inst, inst_hash)
+
+            # Two instances per sub-schema; "a" is reused from its pool
+            self.assertEqual(built, [["A"], ["A"], ["B"], ["B"], ["C"], ["C"]])
+            # "b" was the least recently used pool when "c" was added
+            self.assertEqual(
+                list(self.pool.pools),
+                [full.pruned(["a"]).hash, full.pruned(["c"]).hash],
+            )
+
+        asyncio.run(run_test())
+
+    def test_problem_pool_blue_green_rebuild(self):
+        import asyncio
+        import threading
+
+        from mdo_framework.core.translator import tool_components
+        from services.execution.main import (
+            ProblemPool,
+            SchemaEnvelope,
+            build_and_init,
+        )
+
+        tool_a = {"name": "A", "inputs": ["x"], "outputs": ["a"]}
+        tool_b = {"name": "B", "inputs": ["a"], "outputs": ["b"]}
+        v1 = SchemaEnvelope({"tools": [tool_a], "variables": [{"name": "x"}]})
+        v2 = SchemaEnvelope({"tools": [tool_a, tool_b], "variables": [{"name": "x"}]})
+        pool = ProblemPool({"A": lambda x: 2 * x, "B": lambda a: a + 1}, size=3)
+
+        gate = threading.Event()
+        donors = []
+
+        def gated_build(schema, registry, donor=None):
+            gate.wait(5)
+            donors.append(donor)
+            return build_and_init(schema, registry, donor)
+
+        async def run_test():
+            inst, inst_hash = await pool.get_instance(v1)
+            await pool.release_instance(inst, inst_hash)
+
+            with patch("services.execution.main.build_and_init", gated_build):
+                # The v2 pool is still building: v1 keeps serving.
+                inst, inst_hash = await pool.get_instance(v2)
+                self.assertEqual(inst_hash, v1.hash)
+                build = pool._builds[v2.hash]
+
+                gate.set()
+                await build
+
+            # The stale instance is dropped once the new pool is swapped in.
+            await pool.release_instance(inst, inst_hash)
+            self.assertEqual(list(pool.pools), [v2.hash])
+
+            # One idle v1 instance was donated, one kept serving during the build.
+            donated = [d for d in donors if d is not None]
+            self.assertEqual(len(donated), 1)
+            new_instances = [pool.pools[v2.hash].get_nowait() for _ in range(3)]
+            reused = [
+                tool_components(i)["A"] is tool_components(donated[0])["A"]
+                for i in new_instances
+            ]
+            self.assertEqual(sum(reused), 1)
+            out = new_instances[0].execute({"x": np.array([2.0])})
+            self.assertAlmostEqual(out["b"][0], 5.0)
+
+        asyncio.run(run_test())
+
+    def test_problem_pool_keeps_shared_pool_until_unreferenced(self):
+        import asyncio
+        import threading
+
+        from services.execution.main import ProblemPool, SchemaEnvelope
+
+        def schema(inputs):
+            return {
+                "tools": [{"name": "A", "inputs": inputs, "outputs": ["a", "c"]}],
+                "variables": [{"name": "x"}, {"name": "y"}],
+            }
+
+        v1 = SchemaEnvelope(schema(["x"]))
+        v2 = SchemaEnvelope(schema(["x", "y"]))
+        # Both objective sets prune to the same schema, so they share a pool.
+        self.assertEqual(v1.pruned(["a"]).hash, v1.pruned(["c"]).hash)
+        pool = ProblemPool({"A": MagicMock()}, size=2)
+        gate = threading.Event()
+
+        def gated_build(schema, registry, donor=None):
+            gate.wait(5)
+            return MagicMock()
+
+        async def run_test():
+            with patch("services.execution.main.build_and_init", gated_build):
+                gate.set()
+                for objective in ("a", "c"):
+                    inst, inst_hash = await pool.get_instance(v1.pruned([objective]))
+                    await pool.release_instance(inst, inst_hash)
+                gate.clear()
+
+                old_hash = v1.pruned(["a"]).hash
+                new_hash = v2.pruned(["a"]).hash
+                inst, inst_hash = await pool.get_instance(v2.pruned(["a"]))
+                self.assertEqual(inst_hash, old_hash)
+                await pool.release_instance(inst, inst_hash)
+                build = pool._builds[new_hash]
+                gate.set()
+                await build
+
+                # "c" has not moved to the new pool yet: the old one stays.
+                self.assertEqual(set(pool.pools), {old_hash, new_hash})
+                inst, inst_hash = await pool.get_instance(v1.pruned(["c"]))
+                self.assertEqual(inst_hash, old_hash)
+                await pool.release_instance(inst, inst_hash)
+
+                # Once it has, nothing references the old pool anymore.
+                inst, inst_hash = await pool.get_instance(v2.pruned(["c"]))
+                self.assertEqual(inst_hash, new_hash)
+                await pool.release_instance(inst, inst_hash)
+                self.assertEqual(list(pool.pools), [new_hash])
+
+        asyncio.run(run_test())
+
+    def test_instance_pool_lifo_and_reap(self):
+        import asyncio
+
+        async def run_test():
+            queue = InstancePool()
+            with patch(
+                "services.execution.main.time.monotonic", side_effect=[0.0, 1.0, 2.0]
+            ):
+                for inst in ("a", "b", "c"):
+                    await queue.put(inst)
+            queue.size = 3
+
+            # The most recently released instance is handed out first
+            self.assertEqual(queue.get_nowait(), "c")
+            await queue.put("c")
+
+            with patch("services.execution.main.time.monotonic", return_value=10.5):
+                # "a" and "b" idled for more than 9s, but one instance is kept
+                self.assertEqual(queue.reap(9.0, keep=2), ["a"])
+            self.assertEqual(queue.size, 2)
+            self.assertEqual(queue.qsize(), 2)
+
+        asyncio.run(run_test())
+
+    def test_problem_pool_grows_and_shrinks(self):
+        import asyncio
+
+        from fastapi import HTTPException
+
+        from services.execution.main import TOOL_REGISTRY, ProblemPool, SchemaEnvelope
+
+        envelope = SchemaEnvelope(
+            {
+                "tools": [
+                    {"name": "Paraboloid", "inputs": ["x", "y"], "outputs": ["f_xy"]},
+                ],
+                "variables": [{"name": "x"}, {"name": "y"}],
+            },
+        )
+        pool = ProblemPool(TOOL_REGISTRY, size=1, max_size=2, grow_after=0.01)
+
+        async def run_test():
+            with patch("services.execution.main.POOL_ACQUIRE_TIMEOUT", 0.5):
+                first, first_hash = await pool.get_instance(envelope)
+                # The only instance is busy: the pool grows instead of failing
+                second, second_hash = await pool.get_instance(envelope)
+                self.assertIsNot(first, second)
+                self.assertEqual(pool.pools[envelope.hash].size, 2)
+
+                # At max_size the pool stops growing
                 with self.assertRaises(HTTPException) as context:
-                    await self.pool.get_instance(envelope)
+                    await pool.get_instance(envelope)
                 self.assertEqual(context.exception.status_code, 503)
-            finally:
-                self.pool.pool.get = original_get
+
+            await pool.release_instance(first, first_hash)
+            await pool.release_instance(second, second_hash)
+
+            # Idle instances are reaped down to the minimum size
+            pool.idle_timeout = 0.0
+            await pool.reap_idle()
+            self.assertEqual(pool.pools[envelope.hash].size, 1)
+            self.assertEqual(pool.pools[envelope.hash].qsize(), 1)
+
+        asyncio.run(run_test())
+
+    def test_problem_pool_prewarmed_full_schema_stands_in(self):
+        import asyncio
+
+        from fastapi import HTTPException
+
+        from services.execution.main import SchemaEnvelope, prewarm_pool
+
+        full = SchemaEnvelope(
+            {
+                "tools": [
+                    {"name": "Paraboloid", "inputs": ["x", "y"], "outputs": ["f_xy"]},
+                    {"name": "Paraboloid2", "inputs": ["x", "y"], "outputs": ["g"]},
+                ],
+                "variables": [{"name": "x"}, {"name": "y"}],
+            },
+        )
+        registry = {
+            "Paraboloid": self.registry["Paraboloid"],
+            "Paraboloid2": self.registry["Paraboloid"],
+        }
+        self.pool.registry = registry
+        schema_p = MagicMock()
+        schema_p.get_schema = AsyncMock(return_value=full)
+
+        async def run_test():
+            await prewarm_pool(schema_p, self.pool)
+            self.assertEqual(list(self.pool.pools), [full.hash])
+
+            pruned = full.pruned(["f_xy"])
+            # The pruned pool is not built yet: the full schema serves meanwhile
+            inst, inst_hash = await self.pool.get_instance(pruned)
+            self.assertEqual(inst_hash, full.hash)
+            await self.pool.release_instance(inst, inst_hash)
+
+            await self.pool._builds[pruned.hash]
+            inst, inst_hash = await self.pool.get_instance(pruned)
+            self.assertEqual(inst_hash, pruned.hash)
+            self.assertEqual(set(self.pool.pools), {full.hash, pruned.hash})
+
+            # Pre-warm failures are logged, not raised
+            schema_p.get_schema.side_effect = HTTPException(status_code=503)
+            await prewarm_pool(schema_p, self.pool)
 
         asyncio.run(run_test())
 
@@ -680,14 +1788,14 @@ class TestProblemPool(unittest.TestCase):
         import asyncio
 
         async def run_test():
-            self.pool.current_hash = "active_hash"
+            self.pool.pools["active_hash"] = InstancePool()
             mock_inst = MagicMock()
 
             await self.pool.release_instance(mock_inst, "stale_hash")
-            self.assertTrue(self.pool.pool.empty())
+            self.assertTrue(self.pool.pools["active_hash"].empty())
 
             await self.pool.release_instance(mock_inst, "active_hash")
-            self.assertFalse(self.pool.pool.empty())
+            self.assertFalse(self.pool.pools["active_hash"].empty())
 
         asyncio.run(run_test())
 
@@ -695,8 +1803,10 @@ class TestProblemPool(unittest.TestCase):
         import asyncio
 
         async def run_test():
-            self.pool.pool.get_nowait = MagicMock(side_effect=asyncio.QueueEmpty)
-            self.pool.pool.empty = MagicMock(return_value=False)
+            queue = InstancePool()
+            queue.get_nowait = MagicMock(side_effect=asyncio.QueueEmpty)
+            queue.empty = MagicMock(return_value=False)
+            self.pool.pools["hash"] = queue
 
             # This should cleanly break instead of crashing
             await self.pool.teardown()
@@ -729,6 +1839,35 @@ class TestOptimizationService(unittest.TestCase):
 
         self.client = TestClient(optimization_app)
 
+    @patch("services.optimization.main.RemoteEvaluator")
+    def test_optimize_named_graph(self, mock_evaluator):
+        response = self.client.post(
+            "/graphs/team_a/optimize", json={"objectives": [{"name": "f_xy"}]}
+        )
+        # The empty schema defines no objective
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(
+            self.mock_client.get.call_args.args[0].endswith("/graphs/team_a/schema")
+        )
+
+        response = self.client.post(
+            "/optimize",
+            json={"objectives": [{"name": "f_xy"}]},
+            headers={"X-Graph-Name": "team b"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid graph name", response.json()["detail"])
+
+    def test_graph_scoped_url(self):
+        from services.graph_selection import graph_scoped_url
+
+        self.assertEqual(
+            graph_scoped_url("http://g:8001", "mdo_graph"), "http://g:8001"
+        )
+        self.assertEqual(
+            graph_scoped_url("http://g:8001/", "team_a"), "http://g:8001/graphs/team_a"
+        )
+
     @patch("mdo_framework.optimization.optimizer.BayesianOptimizer.optimize")
     @patch("mdo_framework.core.topology.TopologicalAnalyzer.resolve_dependencies")
     def test_optimize(self, mock_resolve, mock_optimize):
@@ -1022,6 +2161,22 @@ class TestOptimizationService(unittest.TestCase):
 
 
 class TestOptimizationServiceExtra(unittest.IsolatedAsyncioTestCase):
+    async def test_get_analyzer_reuses_analyzer_per_etag(self):
+        from services.optimization import main as optimization_main
+
+        schema = {"tools": [], "variables": [{"name": "x"}]}
+        with patch.object(optimization_main, "_analyzers", OrderedDict()):
+            first = optimization_main.get_analyzer(schema, "g", '"tag"')
+            self.assertIs(optimization_main.get_analyzer(schema, "g", '"tag"'), first)
+            self.assertIsNot(
+                optimization_main.get_analyzer(schema, "h", '"tag"'), first
+            )
+            # Responses without an ETag are never cached.
+            self.assertIsNot(optimization_main.get_analyzer(schema, "g"), first)
+            with patch.object(optimization_main, "ANALYZER_CACHE_SIZE", 1):
+                optimization_main.get_analyzer(schema, "g", '"other"')
+                self.assertEqual(list(optimization_main._analyzers), [("g", '"other"')])
+
     async def test_to_jsonable_all_branches(self):
         from services.optimization.main import to_jsonable
 
@@ -71,6 +71,128 @@ class TestTopologicalAnalyzer(unittest.TestCase):
         with self.assertRaises(ValueError):
             analyzer.resolve_dependencies(["missing_out"])
 
+    def test_condensation(self):
+        schema = {
+            "variables": [],
+            "tools": [
+                {"name": "Post", "inputs": ["a", "s"], "outputs": ["f"]},
+                {"name": "T2", "inputs": ["a"], "outputs": ["b"]},
+                {"name": "T1", "inputs": ["p", "b"], "outputs": ["a"]},
+                {"name": "Self", "inputs": ["p", "s"], "outputs": ["s"]},
+                {"name": "Pre", "inputs": ["x"], "outputs": ["p"]},
+            ],
+        }
+        analyzer = TopologicalAnalyzer(schema)
+        levels = analyzer.condensation()
+        self.assertEqual(levels, [[["Pre"]], [["T2", "T1"], ["Self"]], [["Post"]]])
+        self.assertEqual(
+            analyzer.strongly_connected_components(),
+            [["Pre"], ["T2", "T1"], ["Self"], ["Post"]],
+        )
+        self.assertEqual(
+            [analyzer.is_coupled(c) for level in levels for c in level],
+            [False, True, True, False],
+        )
+
+    def test_condensation_deep_cycle(self):
+        depth = 5000
+        schema = {
+            "variables": [],
+            "tools": [
+                {
+                    "name": f"T{i}",
+                    "inputs": [f"v{i}"],
+                    "outputs": [f"v{(i + 1) % depth}"],
+                }
+                for i in range(depth)
+            ],
+        }
+        components = TopologicalAnalyzer(schema).strongly_connected_components()
+        self.assertEqual(len(components), 1)
+        self.assertEqual(len(components[0]), depth)
+
+    def test_resolve_deep_chain(self):
+        depth = 5000  # deeper than the default recursion limit
+        schema = {
+            "variables": [{"name": f"v{i}"} for i in range(depth + 1)],
+            "tools": [
+                {"name": f"T{i}", "inputs": [f"v{i}"], "outputs": [f"v{i + 1}"]}
+                for i in range(depth)
+            ],
+        }
+        design_vars, req_tools = TopologicalAnalyzer(schema).resolve_dependencies(
+            [f"v{depth}"]
+        )
+        self.assertEqual(design_vars, ["v0"])
+        self.assertEqual(len(req_tools), depth)
+        self.assertEqual(req_tools[0]["name"], f"T{depth - 1}")
+
+    def test_resolve_multiple_targets_matches_shared_traversal(self):
+        schema = {
+            "variables": [],
+            "tools": [
+                {"name": "A", "inputs": ["x"], "outputs": ["a"]},
+                {"name": "B", "inputs": ["a", "y"], "outputs": ["b"]},
+                {"name": "C", "inputs": ["b", "a"], "outputs": ["c"]},
+                {"name": "Loop1", "inputs": ["l2", "x"], "outputs": ["l1"]},
+                {"name": "Loop2", "inputs": ["l1", "c"], "outputs": ["l2"]},
+            ],
+        }
+        targets = ["c", "l2", "b"]
+        fresh = TopologicalAnalyzer(schema).resolve_dependencies(targets)
+        self.assertEqual(fresh[0], ["x", "y"])
+        self.assertEqual(
+            [t["name"] for t in fresh[1]], ["C", "B", "A", "Loop2", "Loop1"]
+        )
+
+        # Merging memoized closures gives the same order.
+        analyzer = TopologicalAnalyzer(schema)
+        for target in targets:
+            analyzer.upstream_closure(target)
+        self.assertEqual(analyzer.resolve_dependencies(targets), fresh)
+
+    def test_upstream_closure_is_memoized(self):
+        analyzer = TopologicalAnalyzer(self.schema)
+        closure = analyzer.upstream_closure("out1")
+        self.assertEqual(closure, (("Tool2", "Tool1"), ("x", "y")))
+        self.assertIs(analyzer.upstream_closure("out1"), closure)
+        with self.assertRaises(ValueError):
+            analyzer.upstream_closure("missing_out")
+
+    def test_incremental_updates(self):
+        analyzer = TopologicalAnalyzer(self.schema)
+        out1 = analyzer.upstream_closure("out1")
+        unused = analyzer.upstream_closure("unused_in")
+
+        # A new source for an input only invalidates the closures reaching it.
+        analyzer.add_variable({"name": "w", "param_type": "continuous"})
+        analyzer.add_tool({"name": "Pre", "inputs": ["w"], "outputs": ["y"]})
+        self.assertIs(analyzer.upstream_closure("unused_in"), unused)
+        design_vars, req_tools = analyzer.resolve_dependencies(["out1"])
+        self.assertEqual(design_vars, ["x", "w"])
+        self.assertEqual([t["name"] for t in req_tools], ["Tool2", "Tool1", "Pre"])
+        self.assertIsNot(analyzer.upstream_closure("out1"), out1)
+
+        analyzer.connect_input("unused_in", "Tool2")
+        self.assertEqual(
+            analyzer.resolve_dependencies(["out1"])[0], ["x", "w", "unused_in"]
+        )
+        analyzer.connect_output("UnusedTool", "unused_in")
+        self.assertEqual(analyzer.upstream_closure("unused_in")[0], ("UnusedTool",))
+
+        # The schema given to the constructor is left untouched.
+        self.assertEqual(self.schema["tools"][1]["inputs"], ["z"])
+        self.assertEqual(len(self.schema["tools"]), 3)
+        # UnusedTool now consumes its own output.
+        components = [c for level in analyzer.condensation() for c in level]
+        coupled = [c for c in components if analyzer.is_coupled(c)]
+        self.assertEqual(coupled, [["UnusedTool"]])
+
+        with self.assertRaises(ValueError):
+            analyzer.connect_input("x", "MissingTool")
+        with self.assertRaises(ValueError):
+            analyzer.add_tool({"name": "Pre"})
+
 
 if __name__ == "__main__":
     unittest.main()
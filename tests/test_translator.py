@@ -6,7 +6,16 @@ file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import unittest
 
-from mdo_framework.core.translator import GraphProblemBuilder
+import numpy as np
+
+from mdo_framework.core.components import ToolComponent
+from mdo_framework.core.plan import CoupledCluster, ExecutionPlan
+from mdo_framework.core.translator import (
+    DEFAULT_TOOL_CACHE_SIZE,
+    GraphProblemBuilder,
+    cluster_mda_options,
+    tool_components,
+)
 
 
 class TestTranslator(unittest.TestCase):
@@ -43,13 +52,224 @@ class TestTranslator(unittest.TestCase):
 
         tool_registry = {"ToolA": tool_func}
 
-        mda = builder.build_problem(tool_registry)
+        mda = builder.build_problem(tool_registry, compile_plan=False)
 
         self.assertEqual(mda.name, "MDAChain")
 
         # In GEMSEO, default inputs extracted from schema are stored in builder.default_inputs
         self.assertEqual(builder.default_inputs["x"], 1.0)
 
+    def test_build_problem_cacheable_tools(self):
+        schema = {
+            "tools": [
+                {"name": "ToolA", "inputs": ["x"], "outputs": ["y"]},
+                {"name": "ToolB", "inputs": ["y"], "outputs": ["z"], "cacheable": True},
+                {
+                    "name": "ToolC",
+                    "inputs": ["z"],
+                    "outputs": ["w"],
+                    "cacheable": True,
+                    "cache_size": 8,
+                },
+            ],
+            "variables": [{"name": "x", "value": 1.0}],
+        }
+        registry = {
+            "ToolA": lambda x: x,
+            "ToolB": lambda y: y,
+            "ToolC": lambda z: z,
+        }
+
+        mda = GraphProblemBuilder(schema).build_problem(registry)
+        sizes = {
+            d.name: d.cache_size
+            for d in mda.disciplines
+            if isinstance(d, ToolComponent)
+        }
+        self.assertEqual(
+            sizes, {"ToolA": 0, "ToolB": DEFAULT_TOOL_CACHE_SIZE, "ToolC": 8}
+        )
+
+    def test_build_problem_compiles_acyclic_graphs(self):
+        schema = {
+            "tools": [
+                # Declared downstream-first to exercise the ordering.
+                {"name": "Square", "inputs": ["y"], "outputs": ["z"]},
+                {"name": "Shift", "inputs": ["x", "offset"], "outputs": ["y"]},
+            ],
+            "variables": [
+                {"name": "x", "value": 1.0},
+                {"name": "offset", "value": 2.0},
+                {"name": "y"},
+                {"name": "z"},
+            ],
+        }
+        registry = {
+            "Square": lambda y: y**2,
+            "Shift": lambda x, offset: x + offset,
+        }
+
+        plan = GraphProblemBuilder(schema).build_problem(registry)
+        self.assertIsInstance(plan, ExecutionPlan)
+        self.assertEqual([d.name for d in plan.disciplines], ["Shift", "Square"])
+        self.assertEqual(plan.input_names, ["x", "offset"])
+
+        out = plan.execute({"x": np.array([2.0])})
+        self.assertAlmostEqual(out["y"][0], 4.0)
+        self.assertAlmostEqual(out["z"][0], 16.0)
+
+        # The compiled plan matches the MDA it replaces.
+        mda = GraphProblemBuilder(schema).build_problem(registry, compile_plan=False)
+        mda_out = mda.execute({"x": np.array([2.0])})
+        self.assertAlmostEqual(mda_out["z"][0], out["z"][0])
+
+    def test_build_problem_reuses_unchanged_components(self):
+        def double(x):
+            return 2 * x
+
+        def shift(y):
+            return y + 1
+
+        registry = {"Double": double, "Shift": shift}
+        old_schema = {
+            "tools": [
+                {"name": "Double", "inputs": ["x"], "outputs": ["y"]},
+                {"name": "Shift", "inputs": ["y"], "outputs": ["z"]},
+            ],
+            "variables": [],
+        }
+        new_schema = {
+            "tools": [
+                {"name": "Double", "inputs": ["x"], "outputs": ["y"]},
+                {"name": "Shift", "inputs": ["y"], "outputs": ["z"], "cacheable": True},
+            ],
+            "variables": [],
+        }
+
+        old = tool_components(GraphProblemBuilder(old_schema).build_problem(registry))
+        problem = GraphProblemBuilder(new_schema).build_problem(registry, reuse=old)
+        new = tool_components(problem)
+
+        self.assertIs(new["Double"], old["Double"])
+        # The metadata of "Shift" changed, so it is rebuilt.
+        self.assertIsNot(new["Shift"], old["Shift"])
+        self.assertEqual(new["Shift"].cache_size, DEFAULT_TOOL_CACHE_SIZE)
+
+    def test_build_problem_coupled_tools_use_mda(self):
+        schema = {
+            "tools": [
+                {"name": "T1", "inputs": ["x", "b"], "outputs": ["a"]},
+                {"name": "T2", "inputs": ["a"], "outputs": ["b"]},
+            ],
+            "variables": [{"name": "x", "value": 1.0}, {"name": "a"}, {"name": "b"}],
+        }
+        registry = {"T1": lambda x, b: x + 0.5 * b, "T2": lambda a: 0.5 * a}
+
+        mda = GraphProblemBuilder(schema).build_problem(registry, compile_plan=False)
+        self.assertEqual(mda.name, "MDAChain")
+
+    def test_build_problem_rejects_duplicate_producers(self):
+        schema = {
+            "tools": [
+                {"name": "Low", "inputs": ["x"], "outputs": ["f"]},
+                {"name": "High", "inputs": ["x"], "outputs": ["f"]},
+            ],
+            "variables": [{"name": "x", "value": 1.0}],
+        }
+        registry = {"Low": lambda x: x, "High": lambda x: 2 * x}
+        builder = GraphProblemBuilder(schema)
+
+        with self.assertRaisesRegex(ValueError, "'f' is an output of several tools"):
+            builder.build_problem(registry)
+        self.assertEqual(
+            builder.build_problem(registry, compile_plan=False).name, "MDAChain"
+        )
+
+    def test_build_problem_confines_mda_to_coupled_clusters(self):
+        schema = {
+            "tools": [
+                {"name": "Post", "inputs": ["a"], "outputs": ["f"]},
+                {"name": "T1", "inputs": ["p", "b"], "outputs": ["a"]},
+                {"name": "T2", "inputs": ["a"], "outputs": ["b"]},
+                {"name": "Pre", "inputs": ["x"], "outputs": ["p"]},
+            ],
+            "variables": [{"name": "x", "value": 1.0}, {"name": "b", "value": 0.5}],
+        }
+        calls = []
+
+        def post(a):
+            calls.append("Post")
+            return a + 1.0
+
+        registry = {
+            "Post": post,
+            "T1": lambda p, b: p + 0.5 * b,
+            "T2": lambda a: 0.5 * a,
+            "Pre": lambda x: 2.0 * x,
+        }
+
+        plan = GraphProblemBuilder(schema).build_problem(registry)
+        self.assertIsInstance(plan, ExecutionPlan)
+        cluster = plan.levels[1][0]
+        self.assertIsInstance(cluster, CoupledCluster)
+        self.assertEqual([d.name for d in cluster.disciplines], ["T1", "T2"])
+        self.assertEqual(cluster.input_names, ["p"])
+        self.assertEqual(
+            [entry.name for level in plan.levels for entry in level],
+            ["Pre", "T1+T2", "Post"],
+        )
+        self.assertEqual(set(tool_components(plan)), {"Pre", "T1", "T2", "Post"})
+
+        # a = p + 0.25 a, with p = 2 x
+        out = plan.execute({"x": np.array([3.0])})
+        self.assertAlmostEqual(out["a"][0], 8.0, places=4)
+        self.assertAlmostEqual(out["f"][0], 9.0, places=4)
+        self.assertEqual(calls, ["Post"])
+
+    def test_cluster_mda_options(self):
+        tools = [
+            {"name": "T1", "mda_tolerance": "1e-8", "mda_warm_start": "true"},
+            {"name": "T2", "mda_solver": "newton", "mda_tolerance": 1e-3},
+        ]
+        options = cluster_mda_options(tools, {"solver": "jacobi", "max_iter": 7})
+        self.assertEqual(
+            options,
+            {"solver": "newton", "max_iter": 7, "tolerance": 1e-8, "warm_start": True},
+        )
+        self.assertEqual(cluster_mda_options([{"name": "T"}]), {})
+
+    def test_build_problem_tunes_cluster_mda(self):
+        schema = {
+            "tools": [
+                {"name": "T1", "inputs": ["x", "b"], "outputs": ["a"]},
+                {
+                    "name": "T2",
+                    "inputs": ["a"],
+                    "outputs": ["b"],
+                    "mda_solver": "newton",
+                    "mda_max_iter": 5,
+                },
+            ],
+            "variables": [{"name": "x", "value": 3.0}],
+        }
+        registry = {"T1": lambda x, b: x + 0.5 * b, "T2": lambda a: 0.5 * a}
+
+        plan = GraphProblemBuilder(schema).build_problem(
+            registry, mda_options={"solver": "jacobi", "tolerance": 1e-9}
+        )
+        (cluster,) = plan.clusters
+        self.assertEqual(cluster.solver, "newton")
+        self.assertEqual(cluster.mda.settings.max_mda_iter, 5)
+        self.assertEqual(cluster.mda.settings.tolerance, 1e-9)
+
+        out = plan.execute()
+        self.assertAlmostEqual(out["a"][0], 4.0, places=6)
+        self.assertEqual(plan.convergence["T1+T2"]["solver"], "newton")
+
+        schema["tools"][1]["mda_solver"] = "unknown"
+        with self.assertRaises(ValueError):
+            GraphProblemBuilder(schema).build_problem(registry)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,164 @@
+"""
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this
+file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import os
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from services.execution import main as execution_main
+from services.execution.workers import ProcessProblem
+
+
+def double(x):
+    return 2.0 * x
+
+
+def half_sum(x, b):
+    return 0.5 * (x + b)
+
+
+def halve(a):
+    return 0.5 * a
+
+
+def worker_pid(x):
+    return float(os.getpid())
+
+
+def failing(x):
+    raise ValueError("bad input")
+
+
+def _schema(tool="Double", value=1.0):
+    return {
+        "tools": [{"name": tool, "inputs": ["x"], "outputs": ["y"]}],
+        "variables": [{"name": "x", "value": value}, {"name": "y"}],
+    }
+
+
+REGISTRY = {"Double": double, "Pid": worker_pid, "Failing": failing}
+# Forked workers skip re-importing GEMSEO; the service default is "spawn".
+START_METHOD = "fork"
+
+
+class TestProcessProblem(unittest.TestCase):
+    def setUp(self):
+        self.problem = ProcessProblem(_schema(), REGISTRY, start_method=START_METHOD)
+        self.addCleanup(self.problem.cleanup)
+
+    def test_execute_in_worker_process(self):
+        out = self.problem.execute({"x": np.array([3.0])})
+        self.assertAlmostEqual(float(out["y"][0]), 6.0)
+        self.assertIn("x", out)
+
+        # Defaults come from the schema and only requested values come back.
+        out = self.problem.execute(output_names=["y", "missing"])
+        self.assertEqual(list(out), ["y"])
+        self.assertAlmostEqual(float(out["y"][0]), 2.0)
+
+    def test_tool_errors_cross_the_process_boundary(self):
+        problem = ProcessProblem(
+            _schema("Failing"), REGISTRY, start_method=START_METHOD
+        )
+        self.addCleanup(problem.cleanup)
+        with self.assertRaisesRegex(ValueError, "bad input"):
+            problem.execute({"x": np.array([1.0])})
+        # The worker keeps serving after a failed evaluation.
+        with self.assertRaises(ValueError):
+            problem.execute({"x": np.array([2.0])})
+
+    def test_build_error_is_raised(self):
+        with self.assertRaises(ValueError):
+            ProcessProblem(_schema("Unknown"), REGISTRY, start_method=START_METHOD)
+
+    def test_rebuild_reuses_worker_process(self):
+        pid_problem = ProcessProblem(
+            _schema("Pid"), REGISTRY, start_method=START_METHOD
+        )
+        pid = float(pid_problem.execute(output_names=["y"])["y"][0])
+        self.assertNotEqual(pid, os.getpid())
+
+        rebuilt = ProcessProblem.rebuild_from(pid_problem, _schema("Pid", 5.0))
+        self.addCleanup(rebuilt.cleanup)
+        self.assertEqual(float(rebuilt.execute(output_names=["y"])["y"][0]), pid)
+
+        # The donor is detached: cleaning it up leaves the worker running.
+        pid_problem.cleanup()
+        self.assertEqual(float(rebuilt.execute(output_names=["y"])["y"][0]), pid)
+        with self.assertRaisesRegex(RuntimeError, "released"):
+            pid_problem.execute()
+
+    def test_failed_rebuild_keeps_donor(self):
+        with self.assertRaises(ValueError):
+            ProcessProblem.rebuild_from(self.problem, _schema("Unknown"))
+        out = self.problem.execute({"x": np.array([4.0])}, ["y"])
+        self.assertAlmostEqual(float(out["y"][0]), 8.0)
+
+    def test_convergence_crosses_the_process_boundary(self):
+        schema = {
+            "tools": [
+                {"name": "Half", "inputs": ["x", "b"], "outputs": ["a"]},
+                {"name": "Halve", "inputs": ["a"], "outputs": ["b"]},
+            ],
+            "variables": [{"name": "x", "value": 1.0}],
+        }
+        problem = ProcessProblem(
+            schema,
+            {"Half": half_sum, "Halve": halve},
+            start_method=START_METHOD,
+            mda_options={"solver": "jacobi"},
+        )
+        self.addCleanup(problem.cleanup)
+        self.assertEqual(problem.convergence, {})
+        out = problem.execute(output_names=["a"])
+        self.assertAlmostEqual(float(out["a"][0]), 2.0 / 3.0, places=5)
+        stats = problem.convergence["Half+Halve"]
+        self.assertEqual(stats["solver"], "jacobi")
+        self.assertGreater(stats["iterations"], 0)
+
+    def test_execute_batch_in_worker_process(self):
+        out = self.problem.execute_batch(
+            [{"x": np.array([1.0])}, {"x": np.array([2.5])}, {}], ["y", "missing"]
+        )
+        self.assertEqual(list(out), ["y"])
+        np.testing.assert_allclose(out["y"], [2.0, 5.0, 2.0])
+
+    def test_dead_worker_raises_runtime_error(self):
+        self.problem._process.terminate()
+        self.problem._process.join()
+        with self.assertRaises(RuntimeError):
+            self.problem.execute()
+
+
+class TestProcessBackend(unittest.TestCase):
+    def test_build_and_execute_with_process_backend(self):
+        with (
+            patch.object(execution_main, "EXECUTION_BACKEND", "process"),
+            patch.object(execution_main, "EXECUTION_START_METHOD", START_METHOD),
+        ):
+            prob = execution_main.build_and_init(_schema(), REGISTRY)
+            self.addCleanup(prob.cleanup)
+            self.assertIsInstance(prob, ProcessProblem)
+            results = execution_main.execute_problem(prob, {"x": 2.5}, ["y"])
+            self.assertAlmostEqual(execution_main.to_float(results["y"]), 5.0)
+
+            results = execution_main.execute_problem_batch(
+                prob, [{"x": 1.0}, {"x": 2.0}], ["y"]
+            )
+            self.assertEqual(
+                [execution_main.to_float(r["y"]) for r in results], [2.0, 4.0]
+            )
+
+            rebuilt = execution_main.build_and_init(_schema(), REGISTRY, donor=prob)
+            self.addCleanup(rebuilt.cleanup)
+            self.assertIsInstance(rebuilt, ProcessProblem)
+            self.assertIsNone(prob._process)
+
+
+if __name__ == "__main__":
+    unittest.main()